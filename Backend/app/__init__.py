@@ -1,16 +1,29 @@
 from flask import Flask # type: ignore
 from config import Config
-from app.extensions import init_extensions, mongo_client
+from app.extensions import init_extensions
 from authlib.integrations.flask_client import OAuth # type: ignore
 from flask_swagger_ui import get_swaggerui_blueprint # type: ignore
+from app.database.cli import register_cli
+from app.container import init_container
+from app.logging_config import init_logging
+from app.utils.json_provider import FastJSONProvider
+from app.utils.model_utils import trusted_model_utils
+import logging
+
+logger = logging.getLogger(__name__)
 
 oauth = OAuth()
 
 def create_app():
     
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     app.config.from_object(Config)
+    init_logging(app)
     init_extensions(app)
+    init_container(app)
+    if app.debug:
+        trusted_model_utils.reconfigure(drift_sample_rate=app.config.get("MODEL_DRIFT_SAMPLE_RATE", 0.0))
     oauth.init_app(app)
     oauth.register(
     name='google',
@@ -28,6 +41,10 @@ def create_app():
     app.register_blueprint(admin_bp, url_prefix='/api/admin')
     app.register_blueprint(teacher_bp, url_prefix='/api/teacher')
     # app.register_blueprint(student_bp, url_prefix='/api/student')
+    register_cli(app)
+    if app.config.get("MONGO_AUTO_INDEX", True):
+        _bootstrap_indexes()
+        _bootstrap_derived_collections()
     app.register_blueprint(
         get_swaggerui_blueprint(
             '/api/docs',
@@ -36,6 +53,26 @@ def create_app():
         ),
         url_prefix='/api/docs'
     )
-    for rule in app.url_map.iter_rules():
-        print(f"{rule} -> methods: {rule.methods}")
-    return app
\ No newline at end of file
+    return app
+
+
+def _bootstrap_indexes() -> None:
+    from app.database.db import get_db
+    from app.database.indexes import ensure_indexes
+    try:
+        ensure_indexes(get_db())
+    except Exception as e:
+        logger.error("Index bootstrap failed; run `flask indexes apply` once MongoDB is reachable: %s", e)
+
+
+def _bootstrap_derived_collections() -> None:
+    """Backfill collections derived from ``users`` when they have never been built."""
+    from app.database.db import get_db
+    from app.repositories.user_search_repository import UserSearchIndex
+    from app.repositories.user_stats_repository import UserStatsRepository
+    try:
+        db = get_db()
+        UserSearchIndex(db).rebuild_if_empty()
+        UserStatsRepository(db).rebuild_if_empty()
+    except Exception as e:
+        logger.error("Derived collection backfill failed; run `flask users reindex-search` and `flask users rebuild-stats`: %s", e)
@@ -1,22 +1,29 @@
 from flask import request
 from . import admin_bp
-from app.auth.jwt_utils import role_required
-from app.services.user_service import get_user_service
+from app.auth.jwt_utils import role_required, verified_token_cache, token_revocations
+from app.container import get_container
 from app.enums.roles import Role
+from app.enums.status import EnrollmentStatus
 from app.error.exceptions import BadRequestError, NotFoundError , ValidationError  # type: ignore
 from app.utils.response_utils import Response  # type: ignore 
 from app.schemas.user_schema import UserCreateSchema, UserResponseSchema, UserPatchSchema, UserPatchUserDetailSchema, UserDetailResponseSchema
-from app.database.db import  get_db
+from app.extensions import mongo
+from app.utils.cache import analytics_cache
+from app.utils.projection import parse_fields
+from app.models.user import UserModel
+from app.services.user_import_service import detect_format
+from app.repositories.enrollment_repository import summarize_enrollments
 import logging
-from flask import send_from_directory , g # type: ignore
+from flask import send_from_directory , g, current_app # type: ignore
 from  functools import wraps
+from typing import Dict, List, Optional, Tuple
 import os
 logger = logging.getLogger(__name__)
 
 def with_user_service(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
-        g.user_service = get_user_service(get_db())
+        g.user_service = get_container().user_service
         return func(*args, **kwargs)
     return wrapper
 
@@ -30,21 +37,88 @@ def parse_json_body() -> dict:
         )
     return data
 
+def parse_page_args(args, default_size: int = 50) -> Tuple[int, Optional[str]]:
+    """``page_size`` (1-100) and ``cursor`` query parameters of keyset-paginated endpoints."""
+    try:
+        page_size = int(args.get('page_size', default_size))
+    except ValueError:
+        page_size = 0
+    if not 0 < page_size <= 100:
+        raise ValidationError(message="Page size must be between 1 and 100.", user_message="Invalid page size.")
+    return page_size, args.get('cursor') or None
+
+# Query-string parsing shared with the ASGI read endpoints (app.asgi).
+def parse_growth_range(args) -> Tuple[str, str]:
+    start_date = args.get('start_date')
+    end_date = args.get('end_date')
+    if not start_date or not end_date:
+        raise BadRequestError(
+            message="Missing start_date or end_date query parameters",
+            user_message="Please provide both 'start_date' and 'end_date' as query parameters.",
+            details={"missing": [k for k in ['start_date', 'end_date'] if not args.get(k)]}
+        )
+    return start_date, end_date
+
+
+def parse_comparison_periods(args) -> Dict[str, str]:
+    missing_current = [k for k in ['current_start_date', 'current_end_date'] if not args.get(k)]
+    missing_previous = [k for k in ['previous_start_date', 'previous_end_date'] if not args.get(k)]
+
+    if missing_current:
+        raise BadRequestError(
+            message="Missing current period date query parameters",
+            user_message=f"Please provide {', '.join(missing_current)} as query parameters.",
+            details={"missing": missing_current}
+        )
+    if missing_previous:
+        raise BadRequestError(
+            message="Missing previous period date query parameters",
+            user_message=f"Please provide {', '.join(missing_previous)} as query parameters.",
+            details={"missing": missing_previous}
+        )
+    return {
+        key: args.get(key)
+        for key in ('current_start_date', 'current_end_date', 'previous_start_date', 'previous_end_date')
+    }
+
+
+MAX_STATS_PERIODS = 36
+
+
+def parse_periods(args) -> List[Tuple[str, str]]:
+    raw_periods = args.getlist('period')
+    if not raw_periods:
+        raise BadRequestError(
+            message="Missing period query parameters",
+            user_message="Please provide at least one 'period' as start_date:end_date.",
+            details={"missing": ["period"]}
+        )
+    if len(raw_periods) > MAX_STATS_PERIODS:
+        raise ValidationError(message=f"At most {MAX_STATS_PERIODS} periods are allowed.", user_message="Too many periods requested.")
+    periods = []
+    for raw in raw_periods:
+        start_date, sep, end_date = raw.partition(':')
+        if not sep or not start_date or not end_date:
+            raise ValidationError(message=f"Invalid period '{raw}'; expected start_date:end_date.", user_message="Invalid period format.")
+        periods.append((start_date, end_date))
+    return periods
+
+
 @admin_bp.route('/', methods=['GET'])
 @with_user_service
 @role_required([Role.ADMIN.value])
 def get_all_users():
     """
     Fetch all users (Admin only).
+    Optional ``fields=username,email`` limits the returned (and fetched) fields.
     """
-    users = g.user_service.user_repo.find_all_users()
-    if not users:
-        return Response.success_response(data=[], message="No users found")
-    user_data = [
-        user.model_dump(exclude={"password"}, by_alias=True)
-        for user in users
-    ]
-    return Response.success_response(data=user_data, message="Users fetched successfully")
+    fields = parse_fields(request.args.get('fields'), UserModel)
+    users = g.user_service.user_repo.iter_all_users(current_app.config.get("STREAM_BATCH_SIZE", 500), fields)
+    return Response.stream_response(
+        (user.model_dump(include=fields, exclude={"password"}, by_alias=True) for user in users),
+        message="Users fetched successfully",
+        empty_message="No users found"
+    )
 
 
 
@@ -63,6 +137,21 @@ def create_user():
         status_code=201
     )
 
+@admin_bp.route('/users/import', methods=['POST'])
+@role_required([Role.ADMIN.value])
+def import_users():
+    """
+    Bulk-create users from a CSV or JSON Lines body (Admin only).
+    The body is streamed and written in batches; the response lists the rows that failed.
+    """
+    fmt = detect_format(request.content_type, request.args.get('format'))
+    report = get_container().user_import_service.import_stream(request.stream, fmt)
+    return Response.success_response(
+        report,
+        message=f"Imported {report['inserted']} of {report['total']} users",
+        status_code=201 if report["inserted"] else 200
+    )
+
 @admin_bp.route('/users/<_id>', methods=['PATCH'])
 @with_user_service
 @role_required([Role.ADMIN.value])
@@ -168,14 +257,7 @@ def get_user_growth_stats():
     """
     Get user growth statistics (Admin only).
     """
-    start_date = request.args.get('start_date')
-    end_date = request.args.get('end_date')
-    if not start_date or not end_date:
-        raise BadRequestError(
-            message="Missing start_date or end_date query parameters",
-            user_message="Please provide both 'start_date' and 'end_date' as query parameters.",
-            details={"missing": [k for k in ['start_date', 'end_date'] if not request.args.get(k)]}
-        )
+    start_date, end_date = parse_growth_range(request.args)
     stats = g.user_service.user_repo.find_user_growth_stats(start_date=start_date, end_date=end_date)
     return Response.success_response(stats, message="User growth statistics fetched successfully")
 
@@ -187,35 +269,27 @@ def get_user_growth_stats_by_role():
     """
     Get user growth statistics by role (Admin only).
     """
-    current_start_date = request.args.get('current_start_date')
-    current_end_date = request.args.get('current_end_date')
-    previous_start_date = request.args.get('previous_start_date')
-    previous_end_date = request.args.get('previous_end_date')
-
-    missing_current = [k for k in ['current_start_date', 'current_end_date'] if not request.args.get(k)]
-    missing_previous = [k for k in ['previous_start_date', 'previous_end_date'] if not request.args.get(k)]
+    stats = g.user_service.user_repo.find_users_growth_stats_by_role_with_comparison(**parse_comparison_periods(request.args))
+    return Response.success_response(stats, message="User growth statistics fetched successfully")
 
-    if missing_current:
-        raise BadRequestError(
-            message="Missing current period date query parameters",
-            user_message=f"Please provide {', '.join(missing_current)} as query parameters.",
-            details={"missing": missing_current}
-        )
-    if missing_previous:
-        raise BadRequestError(
-            message="Missing previous period date query parameters",
-            user_message=f"Please provide {', '.join(missing_previous)} as query parameters.",
-            details={"missing": missing_previous}
-        )
 
-    stats = g.user_service.user_repo.find_users_growth_stats_by_role_with_comparison(
-        current_start_date=current_start_date,
-        current_end_date=current_end_date,
-        previous_start_date=previous_start_date,
-        previous_end_date=previous_end_date,
+@admin_bp.route('/users/counts-by-role-periods', methods=['GET'])
+@role_required([Role.ADMIN.value])
+@with_user_service
+def get_user_counts_by_role_periods():
+    """
+    Count new users per role for several periods at once (Admin only).
+    Repeat ``period=YYYY-MM-DD:YYYY-MM-DD`` once per period.
+    """
+    periods = parse_periods(request.args)
+    try:
+        counts = g.user_service.user_repo.find_user_counts_by_role_for_periods(periods)
+    except ValueError as e:
+        raise ValidationError(message=f"Invalid date in period: {e}", user_message="Dates must use the YYYY-MM-DD format.")
+    return Response.success_response(
+        {"periods": [{"start_date": s, "end_date": e} for s, e in periods], "roles": counts},
+        message="User counts by role fetched successfully"
     )
-    return Response.success_response(stats, message="User growth statistics fetched successfully")
-
 
 
 @admin_bp.route('/users/detail/<_id>', methods=['GET'])
@@ -265,23 +339,106 @@ def search_user():
     data = parse_json_body()
     
     query = data.get('query', '').strip()
+    cursor = data.get('cursor')
     page = data.get('page', 1)
     page_size = data.get('page_size', 10)
     
-    # Optional: Validate page and page_size are positive integers
-    if not (isinstance(page, int) and page > 0):
-        raise ValidationError(message="Page must be a positive integer.", user_message="Invalid page number.")
+    # Offset paging is gone: deeper pages are reached through the cursor only.
+    if page != 1:
+        raise ValidationError(message="Offset pagination is not supported; pass 'cursor' from the previous page.", user_message="Invalid page number.")
+    if cursor is not None and not (isinstance(cursor, str) and cursor):
+        raise ValidationError(message="Cursor must be a non-empty string.", user_message="Invalid pagination cursor.")
     if not (isinstance(page_size, int) and 0 < page_size <= 100):
         raise ValidationError(message="Page size must be between 1 and 100.", user_message="Invalid page size.")
 
-    users = g.user_service.user_repo.search_user(query, page, page_size)
+    result = g.user_service.user_repo.search_user(query, page_size, cursor)
     users_serialized = [
-        user.model_dump(mode="json", by_alias=True, exclude_none=True) for user in users
+        user.model_dump(mode="json", by_alias=True, exclude_none=True) for user in result["users"]
     ]
     
-    return Response.success_response(users_serialized, message="Users fetched successfully")
+    return Response.success_response(
+        users_serialized,
+        message="Users fetched successfully",
+        metadata={"next_cursor": result["next_cursor"], "page_size": page_size}
+    )
+
+
 
 
+@admin_bp.route('/enrollments', methods=['POST'])
+@role_required([Role.ADMIN.value])
+def bulk_enroll():
+    """
+    Enroll ``student_ids`` in every class of ``class_ids`` (Admin only).
+    Classes never exceed ``max_students``; ``data.results`` has one status per student/class pair.
+    """
+    data = parse_json_body()
+    results = get_container().classes_service.enroll_students(data.get("student_ids"), data.get("class_ids"))
+    summary = summarize_enrollments(results)
+    return Response.success_response(
+        {"results": results, "summary": summary},
+        message=f"Enrolled {summary.get(EnrollmentStatus.ENROLLED.value, 0)} of {len(results)} requested enrollments"
+    )
+
+
+@admin_bp.route('/enrollments/remove', methods=['POST'])
+@role_required([Role.ADMIN.value])
+def bulk_unenroll():
+    """
+    Remove ``student_ids`` from every class of ``class_ids`` (Admin only).
+    """
+    data = parse_json_body()
+    results = get_container().classes_service.unenroll_students(data.get("student_ids"), data.get("class_ids"))
+    summary = summarize_enrollments(results)
+    return Response.success_response(
+        {"results": results, "summary": summary},
+        message=f"Removed {summary.get(EnrollmentStatus.UNENROLLED.value, 0)} of {len(results)} requested enrollments"
+    )
+
+
+@admin_bp.route('/classes/<class_id>/students', methods=['GET'])
+@role_required([Role.ADMIN.value])
+def get_class_roster(class_id):
+    """Students enrolled in a class, ``page_size`` at a time (Admin only)."""
+    page_size, cursor = parse_page_args(request.args)
+    page = get_container().classes_service.find_class_roster(class_id, page_size, cursor)
+    return Response.success_response(
+        page["students"],
+        message="Class roster fetched successfully",
+        metadata={"next_cursor": page["next_cursor"], "page_size": page_size}
+    )
+
+
+@admin_bp.route('/students/<student_id>/classes', methods=['GET'])
+@role_required([Role.ADMIN.value])
+def get_student_schedule(student_id):
+    """Classes a student is enrolled in, ``page_size`` at a time (Admin only)."""
+    page_size, cursor = parse_page_args(request.args)
+    page = get_container().classes_service.find_student_schedule(student_id, page_size, cursor)
+    return Response.success_response(
+        [item.model_dump(mode="json", by_alias=True, exclude_none=True) for item in page["classes"]],
+        message="Student schedule fetched successfully",
+        metadata={"next_cursor": page["next_cursor"], "page_size": page_size}
+    )
+
+
+@admin_bp.route('/system/pool-stats', methods=['GET'])
+@role_required([Role.ADMIN.value])
+def get_pool_stats():
+    """MongoDB connection pool statistics for this worker process (Admin only)."""
+    return Response.success_response(mongo.pool_stats(), message="Pool statistics fetched successfully")
+
+
+@admin_bp.route('/system/cache-stats', methods=['GET'])
+@role_required([Role.ADMIN.value])
+def get_cache_stats():
+    """Analytics and verified-token cache counters for this worker process (Admin only)."""
+    stats = {
+        "analytics": analytics_cache.stats(),
+        "verified_tokens": verified_token_cache.stats(),
+        "revoked_tokens": token_revocations.stats(),
+    }
+    return Response.success_response(stats, message="Cache statistics fetched successfully")
 
 
 @admin_bp.route('/openapi.yaml', methods=['GET'])
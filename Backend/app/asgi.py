@@ -0,0 +1,349 @@
+"""ASGI entrypoint: read-heavy GET endpoints on an event loop, everything else through Flask.
+
+The routes in ``ASYNC_ROUTES`` are served by coroutines over ``AsyncMongoClient``,
+so one worker can hold many in-flight reads. Any other request goes to the
+regular Flask app through ``ConcurrentWsgiToAsgi``. Both paths use the same
+models, pipelines, query parsing, auth checks, error handlers and
+``after_request`` hooks (CORS, request IDs), so responses are identical.
+
+Run with ``uvicorn asgi:app`` from ``Backend/``.
+"""
+import asyncio
+import logging
+import re
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Pattern, Tuple, Union
+from urllib.parse import parse_qsl
+from asgiref.sync import sync_to_async  # type: ignore
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance  # type: ignore
+from flask import Flask, current_app, g  # type: ignore
+from werkzeug.datastructures import Headers, MIMEAccept, MultiDict  # type: ignore
+from werkzeug.http import parse_accept_header  # type: ignore
+from app.admin.routes import parse_comparison_periods, parse_growth_range, parse_periods
+from app.auth.jwt_utils import authorize, token_revocations
+from app.enums.roles import Role
+from app.error.exceptions import ValidationError
+from app.extensions import async_mongo
+from app.logging_config import REQUEST_ID_HEADER, request_id_var, resolve_request_id
+from app.models.classes import ClassesModel
+from app.models.user import UserModel
+from app.repositories.async_teacher_repository import AsyncTeacherRepository
+from app.repositories.async_user_repository import AsyncUserRepository
+from app.utils.json_provider import dumps_bytes
+from app.utils.projection import parse_fields
+from app.utils.response_utils import JSON_MIMETYPE, NDJSON_MIMETYPE, STREAM_CHUNK_BYTES
+
+logger = logging.getLogger(__name__)
+
+_EMPTY = object()
+
+
+class _ThreadPoolWsgiInstance(WsgiToAsgiInstance):
+    # asgiref runs every WSGI call on one shared thread by default (thread_sensitive=True),
+    # which would serialize all Flask requests of the worker.
+
+    def _run_wsgi_app(self, body: bytes) -> None:
+        """Run the WSGI app in a pool thread, so ``start_response`` is called on that thread too."""
+        environ = self.build_environ(self.scope, body)
+        bytes_sent = 0
+        output = self.wsgi_application(environ, self.start_response)
+        try:
+            for chunk in output:
+                if not self.response_started:
+                    self.response_started = True
+                    self.sync_send(self.response_start)
+                # Never send more than a declared Content-Length.
+                if self.response_content_length is not None:
+                    chunk = chunk[:self.response_content_length - bytes_sent]
+                self.sync_send({"type": "http.response.body", "body": chunk, "more_body": True})
+                bytes_sent += len(chunk)
+                if bytes_sent == self.response_content_length:
+                    break
+        finally:
+            if hasattr(output, "close"):
+                output.close()
+        if not self.response_started:
+            self.response_started = True
+            self.sync_send(self.response_start)
+        self.sync_send({"type": "http.response.body"})
+
+    run_wsgi_app = sync_to_async(_run_wsgi_app, thread_sensitive=False)
+
+
+class ConcurrentWsgiToAsgi(WsgiToAsgi):
+    """``WsgiToAsgi`` that runs each WSGI request on the loop's thread pool."""
+
+    async def __call__(self, scope, receive, send):
+        await _ThreadPoolWsgiInstance(self.wsgi_application)(scope, receive, send)
+
+
+class AsyncRequest:
+    __slots__ = ("method", "path", "query_string", "args", "headers", "path_params", "claims", "request_id")
+
+    def __init__(self, scope: Dict[str, Any], path_params: Dict[str, str]):
+        self.method = scope["method"]
+        self.path = scope["path"]
+        self.query_string = scope.get("query_string", b"")
+        self.args = MultiDict(parse_qsl(self.query_string.decode("latin-1"), keep_blank_values=True))
+        self.headers = Headers([(k.decode("latin-1"), v.decode("latin-1")) for k, v in scope.get("headers", [])])
+        self.path_params = path_params
+        self.claims: Dict[str, Any] = {}
+        self.request_id = resolve_request_id(self.headers.get(REQUEST_ID_HEADER))
+
+    def wants_ndjson(self) -> bool:
+        accept = parse_accept_header(self.headers.get("Accept"), MIMEAccept)
+        return accept.quality(NDJSON_MIMETYPE) > accept.quality(JSON_MIMETYPE)
+
+
+class AsyncResponse:
+    __slots__ = ("status", "body", "mimetype", "headers")
+
+    def __init__(self, body: Union[bytes, AsyncIterator[bytes]], status: int = 200, mimetype: str = JSON_MIMETYPE, headers: Optional[Iterable[Tuple[str, str]]] = None):
+        self.status = status
+        self.body = body
+        self.mimetype = mimetype
+        self.headers = Headers(headers or [])
+
+
+def success(data: Any, message: str = "", status: int = 200) -> AsyncResponse:
+    """Same envelope as ``Response.success_response``."""
+    return AsyncResponse(dumps_bytes({"success": True, "message": message, "data": data}) + b"\n", status)
+
+
+async def _buffered(parts: AsyncIterator[bytes], chunk_bytes: int = STREAM_CHUNK_BYTES) -> AsyncIterator[bytes]:
+    buffer: List[bytes] = []
+    size = 0
+    async for part in parts:
+        buffer.append(part)
+        size += len(part)
+        if size >= chunk_bytes:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+async def stream(request: AsyncRequest, items: AsyncIterator[Any], message: str = "", empty_message: Optional[str] = None) -> AsyncResponse:
+    """Async ``Response.stream_response``: same envelope/NDJSON output, first item fetched up front."""
+    first = await anext(items, _EMPTY)
+    if first is _EMPTY and empty_message:
+        message = empty_message
+
+    async def rest() -> AsyncIterator[Any]:
+        if first is not _EMPTY:
+            yield first
+            async for item in items:
+                yield item
+
+    if request.wants_ndjson():
+        async def parts() -> AsyncIterator[bytes]:
+            async for item in rest():
+                yield dumps_bytes(item) + b"\n"
+        mimetype = NDJSON_MIMETYPE
+    else:
+        async def parts() -> AsyncIterator[bytes]:
+            yield b'{"success": true, "message": ' + dumps_bytes(message) + b', "data": ['
+            separator = b""
+            async for item in rest():
+                yield separator + dumps_bytes(item)
+                separator = b","
+            yield b"]}"
+        mimetype = JSON_MIMETYPE
+    return AsyncResponse(_buffered(parts()), mimetype=mimetype, headers=[("X-Accel-Buffering", "no")])
+
+
+def _batch_size() -> int:
+    return current_app.config.get("STREAM_BATCH_SIZE", 500)
+
+
+# --- handlers: async twins of the Flask views of the same path ---------------------------
+
+async def admin_list_users(request: AsyncRequest) -> AsyncResponse:
+    fields = parse_fields(request.args.get("fields"), UserModel)
+    users = AsyncUserRepository(async_mongo.get_db()).iter_all_users(_batch_size(), fields)
+
+    async def dumped() -> AsyncIterator[Dict[str, Any]]:
+        async for user in users:
+            yield user.model_dump(include=fields, exclude={"password"}, by_alias=True)
+
+    return await stream(request, dumped(), message="Users fetched successfully", empty_message="No users found")
+
+
+async def admin_count_users_by_role(request: AsyncRequest) -> AsyncResponse:
+    counts = await AsyncUserRepository(async_mongo.get_db()).count_users_by_role()
+    return success(counts, message="User counts by role fetched successfully")
+
+
+async def admin_user_growth_stats(request: AsyncRequest) -> AsyncResponse:
+    start_date, end_date = parse_growth_range(request.args)
+    stats = await AsyncUserRepository(async_mongo.get_db()).find_user_growth_stats(start_date=start_date, end_date=end_date)
+    return success(stats, message="User growth statistics fetched successfully")
+
+
+async def admin_user_growth_stats_by_role(request: AsyncRequest) -> AsyncResponse:
+    periods = parse_comparison_periods(request.args)
+    stats = await AsyncUserRepository(async_mongo.get_db()).find_users_growth_stats_by_role_with_comparison(**periods)
+    return success(stats, message="User growth statistics fetched successfully")
+
+
+async def admin_user_counts_by_role_periods(request: AsyncRequest) -> AsyncResponse:
+    periods = parse_periods(request.args)
+    try:
+        counts = await AsyncUserRepository(async_mongo.get_db()).find_user_counts_by_role_for_periods(periods)
+    except ValueError as e:
+        raise ValidationError(message=f"Invalid date in period: {e}", user_message="Dates must use the YYYY-MM-DD format.")
+    return success(
+        {"periods": [{"start_date": s, "end_date": e} for s, e in periods], "roles": counts},
+        message="User counts by role fetched successfully",
+    )
+
+
+async def admin_user_detail(request: AsyncRequest) -> AsyncResponse:
+    user = await AsyncUserRepository(async_mongo.get_db()).find_user_detail(request.path_params["_id"])
+    return success(user, message="User details fetched successfully")
+
+
+async def teacher_profile(request: AsyncRequest) -> AsyncResponse:
+    teacher = await AsyncTeacherRepository(async_mongo.get_db()).get_teacher_by_id(request.claims.get("id"))
+    return success(teacher.model_dump(), message="Teacher profile fetched")
+
+
+async def teacher_list_classes(request: AsyncRequest) -> AsyncResponse:
+    fields = parse_fields(request.args.get("fields"), ClassesModel)
+    classes = AsyncTeacherRepository(async_mongo.get_db()).iter_all_classes(_batch_size(), fields)
+
+    async def dumped() -> AsyncIterator[Dict[str, Any]]:
+        async for item in classes:
+            yield item.model_dump(mode="json", by_alias=True, exclude_none=True, include=fields)
+
+    return await stream(request, dumped(), message="Classes fetched")
+
+
+async def teacher_class_by_id(request: AsyncRequest) -> AsyncResponse:
+    result = await AsyncTeacherRepository(async_mongo.get_db()).find_classes_by_id(request.path_params["_id"])
+    return success(result.model_dump(mode="json"), message="Class fetched")
+
+
+Handler = Callable[[AsyncRequest], Awaitable[AsyncResponse]]
+ADMIN = [Role.ADMIN.value]
+TEACHER = [Role.TEACHER.value]
+
+# (path pattern, allowed roles or None for public, handler); GET only.
+ASYNC_ROUTES: List[Tuple[str, Optional[List[str]], Handler]] = [
+    (r"/api/admin/", ADMIN, admin_list_users),
+    (r"/api/admin/users/count-by-role", ADMIN, admin_count_users_by_role),
+    (r"/api/admin/users/growth-stats", ADMIN, admin_user_growth_stats),
+    (r"/api/admin/users/growth-stats-by-role", ADMIN, admin_user_growth_stats_by_role),
+    (r"/api/admin/users/counts-by-role-periods", ADMIN, admin_user_counts_by_role_periods),
+    (r"/api/admin/users/detail/(?P<_id>[^/]+)", ADMIN, admin_user_detail),
+    (r"/api/teacher/", TEACHER, teacher_profile),
+    (r"/api/teacher/classes", TEACHER, teacher_list_classes),
+    (r"/api/teacher/classes/(?P<_id>[^/]+)", None, teacher_class_by_id),
+]
+
+
+class AsyncReadApp:
+    """ASGI app: ``ASYNC_ROUTES`` on the event loop, the rest through the Flask app."""
+
+    def __init__(self, flask_app: Flask, routes: Iterable[Tuple[str, Optional[List[str]], Handler]] = ASYNC_ROUTES):
+        self.flask_app = flask_app
+        self.fallback = ConcurrentWsgiToAsgi(flask_app)
+        self.routes: List[Tuple[Pattern[str], Optional[List[str]], Handler]] = [
+            (re.compile(pattern + r"\Z"), roles, handler) for pattern, roles, handler in routes
+        ]
+
+    def match(self, method: str, path: str) -> Optional[Tuple[Optional[List[str]], Handler, Dict[str, str]]]:
+        if method != "GET":
+            return None
+        for pattern, roles, handler in self.routes:
+            found = pattern.match(path)
+            if found:
+                return roles, handler, found.groupdict()
+        return None
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        matched = self.match(scope.get("method", ""), scope.get("path", "")) if scope["type"] == "http" else None
+        if matched is None:
+            await self.fallback(scope, receive, send)
+            return
+        roles, handler, path_params = matched
+        request = AsyncRequest(scope, path_params)
+        request_id_var.set(request.request_id)
+        with self.flask_app.app_context():
+            response = await self._respond(request, roles, handler)
+            await self._send(send, request, response)
+
+    async def _respond(self, request: AsyncRequest, roles: Optional[List[str]], handler: Handler) -> AsyncResponse:
+        try:
+            if roles is not None:
+                if token_revocations.refresh_due():
+                    await asyncio.to_thread(token_revocations.maybe_refresh)
+                claims, denied = authorize(request.headers.get("Authorization"), roles)
+                if denied:
+                    return AsyncResponse(dumps_bytes({"msg": denied[0]}) + b"\n", denied[1])
+                request.claims = claims
+            return await handler(request)
+        except Exception as e:
+            return self._error_response(request, e)
+
+    def _request_context(self, request: AsyncRequest):
+        return self.flask_app.test_request_context(
+            request.path,
+            method=request.method,
+            headers=list(request.headers.items()),
+            query_string=request.query_string.decode("latin-1"),
+        )
+
+    def _error_response(self, request: AsyncRequest, error: Exception) -> AsyncResponse:
+        """Render ``error`` with the Flask app's own error handlers."""
+        with self._request_context(request):
+            g.request_id = request.request_id
+            flask_response = self.flask_app.make_response(self.flask_app.handle_user_exception(error))
+            body = flask_response.get_data()
+        return AsyncResponse(body, flask_response.status_code, flask_response.mimetype)
+
+    def _finalize_headers(self, request: AsyncRequest, response: AsyncResponse) -> Headers:
+        """Headers after the Flask ``after_request`` hooks (CORS, request ID, ...)."""
+        with self._request_context(request):
+            g.request_id = request.request_id
+            flask_response = self.flask_app.response_class(status=response.status, mimetype=response.mimetype)
+            flask_response.headers.extend(response.headers)
+            flask_response = self.flask_app.process_response(flask_response)
+        headers = Headers(flask_response.headers)
+        headers.remove("Content-Length")
+        if isinstance(response.body, bytes):
+            headers["Content-Length"] = str(len(response.body))
+        return headers
+
+    async def _send(self, send, request: AsyncRequest, response: AsyncResponse) -> None:
+        headers = self._finalize_headers(request, response)
+        await send({
+            "type": "http.response.start",
+            "status": response.status,
+            "headers": [(key.lower().encode("latin-1"), value.encode("latin-1")) for key, value in headers.items()],
+        })
+        if isinstance(response.body, bytes):
+            await send({"type": "http.response.body", "body": response.body})
+            return
+        async for chunk in response.body:
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await async_mongo.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+def create_asgi_app(flask_app: Optional[Flask] = None) -> AsyncReadApp:
+    if flask_app is None:
+        from app import create_app
+        flask_app = create_app()
+    return AsyncReadApp(flask_app)
@@ -1,48 +1,75 @@
 import jwt  # type: ignore
+import uuid
 from datetime import datetime, timedelta, timezone
 from config import Config
 from functools import wraps
+from typing import Any, Dict, Iterable, Optional, Tuple
 from flask import request, jsonify, g  # type: ignore
+from app.auth.token_cache import VerifiedTokenCache
+from app.auth.revocation import TokenRevocationList, token_id
 
 
 SECRET_KEY = Config.SECRET_KEY
 ALGORITHM = "HS256"
 
+verified_token_cache = VerifiedTokenCache(Config.TOKEN_CACHE_MAX_ENTRIES)
+token_revocations = TokenRevocationList(
+    poll_interval=Config.TOKEN_REVOCATION_POLL_INTERVAL,
+    poll_overlap=Config.TOKEN_REVOCATION_POLL_OVERLAP,
+)
+
 
 def create_access_token(data: dict, expire_delta: timedelta = timedelta(hours=1)):
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + expire_delta
     to_encode.update({"exp": expire})
+    to_encode.setdefault("jti", uuid.uuid4().hex)
 
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+def decode_access_token(token: str) -> dict:
+    """Verify ``token`` and return its claims, skipping the HMAC check for recently verified tokens."""
+    claims = verified_token_cache.get(token)
+    if claims is None:
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        verified_token_cache.put(token, claims)
+    return claims
+
+
+def authorize(auth_header: Optional[str], allowed_roles: Iterable[str]) -> Tuple[Optional[Dict[str, Any]], Optional[Tuple[str, int]]]:
+    """Check a ``Bearer`` header: ``(claims, None)`` when allowed, else ``(None, (message, status))``.
+    Shared by ``role_required`` and the ASGI read endpoints."""
+    if not auth_header or not auth_header.startswith("Bearer "):
+        return None, ("Missing or invalid token", 401)
+    token = auth_header.split(" ")[1]
+    try:
+        payload = decode_access_token(token)
+    except jwt.ExpiredSignatureError:
+        return None, ("Token expired", 401)
+    except jwt.InvalidTokenError:
+        return None, ("Invalid token", 401)
+    if token_revocations.is_revoked(token_id(token, payload)):
+        return None, ("Token revoked", 401)
+    role = payload.get("role")
+    if not role or role not in allowed_roles:
+        return None, ("Access denied: role not allowed", 403)
+    return payload, None
+
+
 def role_required(allowed_roles: list[str]):
     def decorator(f):
         @wraps(f)
         def wrapper(*args, **kwargs):
-            auth_header = request.headers.get("Authorization")
-            if not auth_header or not auth_header.startswith("Bearer "):
-                return jsonify({"msg": "Missing or invalid token"}), 401       
-            token = auth_header.split(" ")[1]
-            try:
-                payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-                role = payload.get("role")
-                user_id = payload.get("id")
-                if not role or role not in allowed_roles:
-                    return jsonify({"msg": "Access denied: role not allowed"}), 403
-                g.user = {
-                    "id": user_id,
-                    "role": role,
-                    "username": payload.get("username")
-                }
-
-            except jwt.ExpiredSignatureError:
-                return jsonify({"msg": "Token expired"}), 401
-            except jwt.InvalidTokenError as e:
-                return jsonify({"msg": "Invalid token"}), 401
-
+            payload, denied = authorize(request.headers.get("Authorization"), allowed_roles)
+            if denied:
+                return jsonify({"msg": denied[0]}), denied[1]
+            g.user = {
+                "id": payload.get("id"),
+                "role": payload.get("role"),
+                "username": payload.get("username")
+            }
             return f(*args, **kwargs)
         return wrapper
     return decorator
\ No newline at end of file
@@ -0,0 +1,170 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, List, Optional, Sequence
+from werkzeug.security import generate_password_hash, check_password_hash  # type: ignore
+from app.error.exceptions import RateLimitError, ErrorSeverity, ErrorCategory
+
+logger = logging.getLogger(__name__)
+
+
+def _hash_batch(passwords: Sequence[str], method: str, salt_length: int) -> List[str]:
+    return [generate_password_hash(password, method=method, salt_length=salt_length) for password in passwords]
+
+
+def _default_mp_context() -> str:
+    # Never fork a threaded gunicorn worker: children would inherit locks held by
+    # other threads (pymongo, logging). forkserver/spawn start from a clean process.
+    methods = multiprocessing.get_all_start_methods()
+    return "forkserver" if "forkserver" in methods else "spawn"
+
+
+class PasswordHasher:
+    """Hashes and verifies passwords off the request thread on a bounded process pool.
+
+    ``max_pending`` caps in-flight operations per worker process; a caller waits up
+    to ``queue_timeout`` seconds for a slot and then gets a 503 instead of tying
+    up the worker. ``workers=0`` runs the KDF inline (tests, CLI), still capped.
+    """
+
+    def __init__(
+        self,
+        method: str = "scrypt",
+        salt_length: int = 16,
+        workers: int = 2,
+        max_pending: int = 8,
+        queue_timeout: float = 5.0,
+        mp_context: Optional[str] = None,
+    ):
+        self.method = method
+        self.salt_length = salt_length
+        self.workers = workers
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+        self._mp_context = mp_context or _default_mp_context()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pid = os.getpid()
+        self._hash_prefix: Optional[str] = None
+
+    @property
+    def hash_prefix(self) -> str:
+        """``method:params`` prefix new hashes get, e.g. ``scrypt:32768:8:1``."""
+        if self._hash_prefix is None:
+            self._hash_prefix = generate_password_hash("", method=self.method, salt_length=1).split("$", 1)[0]
+        return self._hash_prefix
+
+    def _reset_after_fork(self) -> None:
+        # The parent's pool and slot counts mean nothing in a forked worker.
+        if self._pid != os.getpid():
+            self._lock = threading.Lock()
+            self._slots = threading.BoundedSemaphore(self.max_pending)
+            self._pool = None
+            self._pid = os.getpid()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context(self._mp_context),
+                    )
+        return self._pool
+
+    def _acquire(self, blocking: bool = True) -> bool:
+        if not blocking:
+            return self._slots.acquire(blocking=False)
+        if self._slots.acquire(timeout=self.queue_timeout):
+            return True
+        raise RateLimitError(
+            message="Password hashing capacity exhausted",
+            limit=self.max_pending,
+            user_message="The server is busy. Please try again in a moment.",
+            status_code=503,
+            severity=ErrorSeverity.MEDIUM,
+            category=ErrorCategory.SYSTEM,
+        )
+
+    def _submit(self, fn: Callable, *args, blocking: bool = True) -> Optional[Future]:
+        self._reset_after_fork()
+        if not self._acquire(blocking):
+            return None
+        try:
+            if self.workers <= 0:
+                future: Future = Future()
+                try:
+                    future.set_result(fn(*args))
+                except Exception as e:
+                    future.set_exception(e)
+            else:
+                future = self._get_pool().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        slots = self._slots
+        future.add_done_callback(lambda _: slots.release())
+        return future
+
+    def hash(self, password: str) -> str:
+        return self._submit(_hash_batch, [password], self.method, self.salt_length).result()[0]
+
+    def hash_many(self, passwords: Sequence[str]) -> List[str]:
+        """Hash a batch split across the pool; each slice takes one slot."""
+        if not passwords:
+            return []
+        slices = max(1, min(self.workers, self.max_pending))
+        size = -(-len(passwords) // slices)
+        futures = [
+            self._submit(_hash_batch, passwords[i:i + size], self.method, self.salt_length)
+            for i in range(0, len(passwords), size)
+        ]
+        return [hashed for future in futures for hashed in future.result()]
+
+    def verify(self, pwhash: Optional[str], password: str) -> bool:
+        if not pwhash or not password:
+            return False
+        return self._submit(check_password_hash, pwhash, password).result()
+
+    def needs_rehash(self, pwhash: str) -> bool:
+        return pwhash.split("$", 1)[0] != self.hash_prefix
+
+    def rehash_in_background(self, password: str, on_hashed: Callable[[str], None]) -> bool:
+        """Hash with the current parameters and hand the result to ``on_hashed``.
+
+        Skipped (returns False) when no slot is free; the next login retries.
+        """
+        future = self._submit(_hash_batch, [password], self.method, self.salt_length, blocking=False)
+        if future is None:
+            return False
+
+        def _done(done: Future) -> None:
+            try:
+                on_hashed(done.result()[0])
+            except Exception:
+                logger.exception("Background password rehash failed")
+
+        future.add_done_callback(_done)
+        return True
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None and self._pid == os.getpid():
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+def build_password_hasher(config) -> PasswordHasher:
+    return PasswordHasher(
+        method=config.get("PASSWORD_HASH_METHOD", "scrypt"),
+        salt_length=config.get("PASSWORD_HASH_SALT_LENGTH", 16),
+        workers=config.get("PASSWORD_HASH_WORKERS", 2),
+        max_pending=config.get("PASSWORD_HASH_MAX_PENDING", 8),
+        queue_timeout=config.get("PASSWORD_HASH_QUEUE_TIMEOUT", 5.0),
+    )
+
+
+default_password_hasher = PasswordHasher(workers=0)
@@ -0,0 +1,118 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional
+from pymongo.collection import Collection  # type: ignore
+from app.models.revoked_token import RevokedTokenModel
+
+logger = logging.getLogger(__name__)
+
+
+def token_id(token: str, claims: Dict[str, Any]) -> str:
+    """The revocation key: ``jti`` when the token has one, else a digest of the token."""
+    return claims.get("jti") or hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _default_collection() -> Collection:
+    from app.database.db import get_db
+    return get_db()[RevokedTokenModel._collection_name]
+
+
+class TokenRevocationList:
+    """Per-worker mirror of ``revoked_tokens`` so ``role_required`` checks revocation in memory.
+
+    At most one request thread every ``poll_interval`` seconds fetches the rows
+    revoked since the last high-water mark. The query overlaps by ``poll_overlap``
+    seconds to absorb clock skew between workers. A revocation made in this worker
+    applies immediately. Other workers see it within one poll interval. When a
+    poll fails, the last known mirror stays in use and the next request retries.
+    """
+
+    def __init__(
+        self,
+        collection_provider: Callable[[], Collection] = _default_collection,
+        poll_interval: float = 5.0,
+        poll_overlap: float = 5.0,
+    ):
+        self._collection_provider = collection_provider
+        self.poll_interval = poll_interval
+        self.poll_overlap = poll_overlap
+        self._revoked: Dict[str, float] = {}
+        self._high_water: Optional[datetime] = None
+        self._next_poll = 0.0
+        self._poll_lock = threading.Lock()
+        self.polls = 0
+        self.poll_failures = 0
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def _reset_after_fork(self) -> None:
+        self._poll_lock = threading.Lock()
+        self._next_poll = 0.0
+
+    def revoke(self, jti: str, expires_at: datetime, user_id: Optional[str] = None) -> None:
+        now = datetime.now(timezone.utc)
+        self._collection_provider().update_one(
+            {"jti": jti},
+            {"$setOnInsert": {"jti": jti, "user_id": user_id, "expires_at": expires_at, "revoked_at": now}},
+            upsert=True,
+        )
+        self._revoked[jti] = expires_at.timestamp()
+
+    def is_revoked(self, jti: str) -> bool:
+        self.maybe_refresh()
+        expires_at = self._revoked.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def refresh_due(self) -> bool:
+        """True when the next ``is_revoked`` would poll; async callers poll off the event loop first."""
+        return time.monotonic() >= self._next_poll
+
+    def maybe_refresh(self) -> None:
+        if time.monotonic() < self._next_poll:
+            return
+        if not self._poll_lock.acquire(blocking=False):
+            return
+        try:
+            if time.monotonic() >= self._next_poll:
+                self.refresh()
+        except Exception:
+            self.poll_failures += 1
+            logger.warning("Token revocation poll failed; serving the last known denylist", exc_info=True)
+        finally:
+            self._next_poll = time.monotonic() + self.poll_interval
+            self._poll_lock.release()
+
+    def refresh(self) -> int:
+        """Pull revocations newer than the high-water mark and drop locally expired ones."""
+        query: Dict[str, Any] = {}
+        if self._high_water is not None:
+            query["revoked_at"] = {"$gte": self._high_water - timedelta(seconds=self.poll_overlap)}
+        cursor = self._collection_provider().find(query, {"jti": 1, "expires_at": 1, "revoked_at": 1}).sort("revoked_at", 1)
+        added = 0
+        for doc in cursor:
+            expires_at = doc["expires_at"]
+            if expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            if doc["jti"] not in self._revoked:
+                added += 1
+            self._revoked[doc["jti"]] = expires_at.timestamp()
+            revoked_at = doc["revoked_at"]
+            if self._high_water is None or revoked_at > self._high_water:
+                self._high_water = revoked_at
+        now = time.time()
+        for jti in [jti for jti, expires_at in list(self._revoked.items()) if expires_at <= now]:
+            self._revoked.pop(jti, None)
+        self.polls += 1
+        return added
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._revoked),
+            "high_water": self._high_water.isoformat() if self._high_water else None,
+            "polls": self.polls,
+            "poll_failures": self.poll_failures,
+        }
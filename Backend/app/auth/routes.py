@@ -1,17 +1,18 @@
 from typing import Optional
 from flask import request, url_for  # type: ignore
 from pydantic.type_adapter import R
-from werkzeug.security import check_password_hash  # type: ignore
 from datetime import timedelta
 from app.enums.roles import Role
 from app.models.user import UserModel 
 from . import auth_bp
 from app import oauth
-from app.services.user_service import get_user_service
-from app.auth.jwt_utils import create_access_token
+from app.container import get_container
+from app.auth.jwt_utils import create_access_token, decode_access_token, token_revocations
+from app.auth.revocation import token_id
+from datetime import datetime, timezone
+import jwt  # type: ignore
 from app.repositories.user_repository import UserRepositoryImpl
 from app.utils.response_utils import Response  # type: ignore
-from app.database.db import get_db
 import logging
 from app.error.exceptions import NotFoundError , UnauthorizedError, ErrorSeverity, ErrorCategory, BadRequestError, AppTypeError
 
@@ -49,7 +50,7 @@ def google_login_callback():
     if not email:
         return Response.error_response("Google login failed, no email found", status_code=400)
 
-    user_service = get_user_service(get_db())
+    user_service = get_container().user_service
     user = user_service.user_repo.find_user_by_email(email)
 
     if user:
@@ -85,7 +86,7 @@ def register():
     if not data:
         return Response.error_response("Invalid JSON body", status_code=400)
 
-    user_service = get_user_service(get_db())
+    user_service = get_container().user_service
     result = user_service.create_user(data)
     user = result.get("user")
     access_token = create_access_token(
@@ -106,9 +107,8 @@ def login():
     if  not password:
         raise BadRequestError(message="Password is required")
 
-    user_service = get_user_service(get_db())
-    print("user_service", user_service)
-    user = user_service.user_repo.find_user_by_username(username)
+    user_service = get_container().user_service
+    user = user_service.authenticate(username, password)
     access_token = create_access_token(
         data=build_jwt_payload(user),
         expire_delta=timedelta(hours=1)
@@ -123,5 +123,20 @@ def login():
 
 @auth_bp.route('/logout', methods=['POST'])
 def logout():
-    """Logout user (no server state for JWT)."""
+    """Logout user by revoking the bearer token until it expires."""
+    auth_header = request.headers.get("Authorization")
+    if not auth_header or not auth_header.startswith("Bearer "):
+        raise UnauthorizedError(message="Missing or invalid token")
+    token = auth_header.split(" ")[1]
+    try:
+        claims = decode_access_token(token)
+    except jwt.ExpiredSignatureError:
+        return Response.success_response(message="Successfully logged out")
+    except jwt.InvalidTokenError:
+        raise UnauthorizedError(message="Invalid token")
+    token_revocations.revoke(
+        token_id(token, claims),
+        datetime.fromtimestamp(claims["exp"], tz=timezone.utc),
+        user_id=claims.get("id"),
+    )
     return Response.success_response(message="Successfully logged out")
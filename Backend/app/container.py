@@ -0,0 +1,158 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator
+from flask import current_app, has_app_context  # type: ignore
+
+Factory = Callable[["ServiceContainer"], Any]
+
+
+class ServiceContainer:
+    """Application-scoped registry of lazily built singleton services.
+
+    Factories run at most once per process (double-checked under a lock) and the
+    instances are shared by every request thread. Instances are dropped after
+    ``fork()`` so workers never reuse objects bound to the parent's MongoClient.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._factories: Dict[str, Factory] = {}
+        self._instances: Dict[str, Any] = {}
+        self._overrides: Dict[str, Any] = {}
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def register(self, name: str, factory: Factory) -> None:
+        with self._lock:
+            self._factories[name] = factory
+            self._instances.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        if name in self._overrides:
+            return self._overrides[name]
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                factory = self._factories.get(name)
+                if factory is None:
+                    raise KeyError(f"No service registered under '{name}'")
+                instance = factory(self)
+                self._instances[name] = instance
+        return instance
+
+    @contextmanager
+    def override(self, name: str, instance: Any) -> Iterator[Any]:
+        """Swap a service for the duration of a ``with`` block (tests)."""
+        with self._lock:
+            previous = self._overrides.get(name)
+            self._overrides[name] = instance
+        try:
+            yield instance
+        finally:
+            with self._lock:
+                if previous is None:
+                    self._overrides.pop(name, None)
+                else:
+                    self._overrides[name] = previous
+
+    def reset(self) -> None:
+        with self._lock:
+            self._instances.clear()
+
+    def _reset_after_fork(self) -> None:
+        self._lock = threading.RLock()
+        self._instances.clear()
+
+    @property
+    def user_repo(self):
+        return self.get("user_repo")
+
+    @property
+    def user_service(self):
+        return self.get("user_service")
+
+    @property
+    def user_import_service(self):
+        return self.get("user_import_service")
+
+    @property
+    def classes_service(self):
+        return self.get("classes_service")
+
+    @property
+    def feedback_service(self):
+        return self.get("feedback_service")
+
+    @property
+    def teacher_service(self):
+        return self.get("teacher_service")
+
+    @property
+    def student_service(self):
+        return self.get("student_service")
+
+
+def _config() -> Dict[str, Any]:
+    return current_app.config if has_app_context() else {}
+
+
+def build_container() -> ServiceContainer:
+    from app.database.db import get_db
+    from app.repositories.user_repository import UserRepositoryImpl
+    from app.repositories.user_search_repository import UserSearchIndex
+    from app.repositories.user_stats_repository import UserStatsRepository
+    from app.auth.password_hasher import build_password_hasher
+    from app.services.user_service import MongoUserService
+    from app.services.user_import_service import UserImportService
+    from app.services.classes_service import MongoClassesService
+    from app.services.feedback_service import MongoFeedbackService
+    from app.services.teacher_service import MongoTeacherService
+    from app.services.student_service import MongoStudentService
+
+    container = ServiceContainer()
+    container.register("db", lambda c: get_db())
+    container.register("user_search_index", lambda c: UserSearchIndex(c.get("db")))
+    container.register("user_stats", lambda c: UserStatsRepository(c.get("db")))
+    container.register("user_repo", lambda c: UserRepositoryImpl(c.get("db"), c.get("user_search_index"), c.get("user_stats")))
+    container.register("password_hasher", lambda c: build_password_hasher(_config()))
+    container.register("user_service", lambda c: MongoUserService(
+        c.get("db"), c.user_repo, search_index=c.get("user_search_index"), password_hasher=c.get("password_hasher")
+    ))
+    container.register("user_import_service", lambda c: UserImportService(
+        c.get("db"),
+        c.get("user_search_index"),
+        c.get("user_stats"),
+        password_hasher=c.get("password_hasher"),
+        chunk_size=_config().get("USER_IMPORT_CHUNK_SIZE", 1000),
+        max_errors=_config().get("USER_IMPORT_MAX_ERRORS", 1000),
+    ))
+    container.register("classes_service", lambda c: MongoClassesService(
+        c.get("db"), max_bulk_items=_config().get("ENROLLMENT_BULK_MAX_ITEMS", 5000)
+    ))
+    container.register("feedback_service", lambda c: MongoFeedbackService(c.get("db")))
+    container.register("teacher_service", lambda c: MongoTeacherService(
+        c.get("db"),
+        classes_service=c.classes_service,
+        user_service=c.user_service,
+        feedback_service=c.feedback_service,
+    ))
+    container.register("student_service", lambda c: MongoStudentService(
+        c.get("db"),
+        user_service=c.user_service,
+        classes_service=c.classes_service,
+    ))
+    return container
+
+
+def init_container(app) -> ServiceContainer:
+    container = build_container()
+    app.extensions["container"] = container
+    return container
+
+
+def get_container() -> ServiceContainer:
+    return current_app.extensions["container"]
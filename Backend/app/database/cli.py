@@ -0,0 +1,100 @@
+import json
+import click  # type: ignore
+from flask.cli import AppGroup  # type: ignore
+from app.database.indexes import ensure_indexes, diff_indexes
+
+indexes_cli = AppGroup("indexes", help="Manage the MongoDB indexes declared on the models.")
+users_cli = AppGroup("users", help="Maintenance tasks for user data.")
+classes_cli = AppGroup("classes", help="Maintenance tasks for class data.")
+
+
+@indexes_cli.command("apply")
+def apply_indexes_command():
+    """Create every declared index (idempotent)."""
+    from app.database.db import get_db
+    created = ensure_indexes(get_db())
+    for collection_name, names in created.items():
+        click.echo(f"{collection_name}: {', '.join(names)}")
+
+
+@indexes_cli.command("diff")
+@click.option("--json", "as_json", is_flag=True, help="Print the diff as JSON.")
+def diff_indexes_command(as_json: bool):
+    """Compare declared indexes with the live ones. Exits 1 when they drift."""
+    from app.database.db import get_db
+    diffs = diff_indexes(get_db())
+    if as_json:
+        click.echo(json.dumps([diff.to_dict() for diff in diffs], indent=2))
+    else:
+        for diff in diffs:
+            if diff.in_sync:
+                click.echo(f"{diff.collection}: in sync")
+                continue
+            click.echo(f"{diff.collection}:")
+            for name in diff.missing:
+                click.echo(f"  + {name} (missing)")
+            for name in diff.mismatched:
+                click.echo(f"  ~ {name} (definition differs)")
+            for name in diff.extra:
+                click.echo(f"  - {name} (not declared)")
+    if not all(diff.in_sync for diff in diffs):
+        raise SystemExit(1)
+
+
+@users_cli.command("reindex-search")
+@click.option("--batch-size", default=1000, show_default=True, type=int)
+def reindex_search_command(batch_size: int):
+    """Rebuild the user search index from the users collection."""
+    from app.database.db import get_db
+    from app.repositories.user_search_repository import UserSearchIndex
+    total = UserSearchIndex(get_db()).rebuild(batch_size=batch_size)
+    click.echo(f"Indexed {total} users")
+
+
+@users_cli.command("rebuild-stats")
+def rebuild_stats_command():
+    """Recompute the user_stats_daily rollup from the users collection."""
+    from app.database.db import get_db
+    from app.repositories.user_stats_repository import UserStatsRepository
+    total = UserStatsRepository(get_db()).rebuild()
+    click.echo(f"Rollup holds {total} (date, role) rows")
+
+
+@users_cli.command("import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "fmt", type=click.Choice(["csv", "jsonl"]), default=None, help="Defaults to the file extension.")
+def import_users_command(path: str, fmt: str):
+    """Bulk-create users from a CSV or JSON Lines file."""
+    from app.container import get_container
+    from app.services.user_import_service import detect_format
+    fmt = detect_format(None, fmt or ("csv" if path.lower().endswith(".csv") else "jsonl"))
+    with open(path, "rb") as stream:
+        report = get_container().user_import_service.import_stream(stream, fmt)
+    click.echo(f"Imported {report['inserted']} of {report['total']} users")
+    for error in report["errors"]:
+        click.echo(f"  row {error['row']}: {error['error']}", err=True)
+    if report["errors_truncated"]:
+        click.echo("  (more errors omitted)", err=True)
+    if report["failed"]:
+        raise SystemExit(1)
+
+
+@classes_cli.command("migrate-enrollments")
+@click.option("--batch-size", default=1000, show_default=True, type=int)
+def migrate_enrollments_command(batch_size: int):
+    """Move embedded students_enrolled / student_info.class_ids arrays into the enrollments collection."""
+    from app.database.db import get_db
+    from app.models.enrollment import EnrollmentModel
+    from app.repositories.enrollment_repository import EnrollmentRepository
+    # The unique (class_id, student_id) index is what makes re-runs skip existing rows.
+    ensure_indexes(get_db(), [EnrollmentModel])
+    report = EnrollmentRepository(get_db()).migrate_embedded(batch_size=batch_size)
+    click.echo(f"Inserted {report['inserted']} enrollments; counted {report['classes']} classes")
+    if report["skipped"]:
+        click.echo(f"  skipped {report['skipped']} entries with invalid IDs", err=True)
+
+
+def register_cli(app) -> None:
+    app.cli.add_command(indexes_cli)
+    app.cli.add_command(users_cli)
+    app.cli.add_command(classes_cli)
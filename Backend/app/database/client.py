@@ -0,0 +1,220 @@
+import asyncio
+import os
+import threading
+from typing import Any, Dict, Optional
+from pymongo import AsyncMongoClient, MongoClient, monitoring  # type: ignore
+from pymongo.asynchronous.database import AsyncDatabase  # type: ignore
+from pymongo.database import Database  # type: ignore
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Counts connection pool events for the client it is attached to."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[str, int] = {
+            "connections_created": 0,
+            "connections_closed": 0,
+            "checked_out": 0,
+            "checked_in": 0,
+            "checkout_failed": 0,
+            "pools_cleared": 0,
+        }
+
+    def _inc(self, key: str) -> None:
+        with self._lock:
+            self.counters[key] += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self.counters)
+        stats["open_connections"] = stats["connections_created"] - stats["connections_closed"]
+        stats["in_use"] = stats["checked_out"] - stats["checked_in"]
+        return stats
+
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_closed(self, event): pass
+    def connection_ready(self, event): pass
+    def connection_check_out_started(self, event): pass
+
+    def pool_cleared(self, event):
+        self._inc("pools_cleared")
+
+    def connection_created(self, event):
+        self._inc("connections_created")
+
+    def connection_closed(self, event):
+        self._inc("connections_closed")
+
+    def connection_check_out_failed(self, event):
+        self._inc("checkout_failed")
+
+    def connection_checked_out(self, event):
+        self._inc("checked_out")
+
+    def connection_checked_in(self, event):
+        self._inc("checked_in")
+
+
+# Config attribute -> MongoClient keyword
+_CLIENT_OPTIONS = {
+    "MONGO_MAX_POOL_SIZE": "maxPoolSize",
+    "MONGO_MIN_POOL_SIZE": "minPoolSize",
+    "MONGO_MAX_IDLE_TIME_MS": "maxIdleTimeMS",
+    "MONGO_MAX_CONNECTING": "maxConnecting",
+    "MONGO_WAIT_QUEUE_TIMEOUT_MS": "waitQueueTimeoutMS",
+    "MONGO_CONNECT_TIMEOUT_MS": "connectTimeoutMS",
+    "MONGO_SOCKET_TIMEOUT_MS": "socketTimeoutMS",
+    "MONGO_SERVER_SELECTION_TIMEOUT_MS": "serverSelectionTimeoutMS",
+    "MONGO_COMPRESSORS": "compressors",
+}
+
+
+class MongoClientManager:
+    """Owns one MongoClient per process.
+
+    The client is created lazily and with ``connect=False`` so nothing touches the
+    network at import time. A client inherited through ``fork()`` (gunicorn
+    ``--preload``) is discarded in the child and rebuilt on first use, because
+    pymongo clients are not fork-safe.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._client: Optional[MongoClient] = None
+        self._pid: Optional[int] = None
+        self._listener: Optional[PoolStatsListener] = None
+        self._uri: Optional[str] = None
+        self._db_name: Optional[str] = None
+        self._options: Dict[str, Any] = {}
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    @property
+    def initialized(self) -> bool:
+        return self._uri is not None
+
+    def init_app(self, app) -> None:
+        self._uri = app.config["DATABASE_URI"]
+        self._db_name = app.config.get("MONGO_DB_NAME")
+        self._options = {
+            kwarg: app.config[key]
+            for key, kwarg in _CLIENT_OPTIONS.items()
+            if app.config.get(key) not in (None, "")
+        }
+        app.extensions["mongo"] = self
+
+    def _reset_after_fork(self) -> None:
+        # Drop the parent's client without closing it: its sockets belong to the parent.
+        self._lock = threading.Lock()
+        self._client = None
+        self._pid = None
+        self._listener = None
+
+    @property
+    def client(self) -> MongoClient:
+        pid = os.getpid()
+        if self._client is not None and self._pid == pid:
+            return self._client
+        with self._lock:
+            if self._client is None or self._pid != pid:
+                if not self.initialized:
+                    raise RuntimeError("MongoClient not initialized. Did you forget to call init_extensions(app)?")
+                self._listener = PoolStatsListener()
+                self._client = MongoClient(
+                    self._uri,
+                    connect=False,
+                    event_listeners=[self._listener],
+                    **self._options,
+                )
+                self._pid = pid
+                logger.debug("Created MongoClient for pid %s", pid)
+        return self._client
+
+    def get_db(self, name: Optional[str] = None) -> Database:
+        return self.client[name or self._db_name]
+
+    def pool_stats(self) -> Dict[str, Any]:
+        listener = self._listener
+        return {
+            "pid": os.getpid(),
+            "client_created": self._client is not None and self._pid == os.getpid(),
+            "options": dict(self._options),
+            "counters": listener.snapshot() if listener else {},
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None and self._pid == os.getpid():
+                self._client.close()
+            self._client = None
+            self._pid = None
+            self._listener = None
+
+
+class AsyncMongoClientManager:
+    """Owns one ``AsyncMongoClient`` per event loop for the ASGI read path.
+
+    Configured from the same settings as ``MongoClientManager``. An async client
+    is bound to the loop it first runs on, so a client built on another loop (or
+    inherited through ``fork()``) is replaced instead of reused.
+    """
+
+    def __init__(self):
+        self._client: Optional[AsyncMongoClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pid: Optional[int] = None
+        self._listener: Optional[PoolStatsListener] = None
+        self._uri: Optional[str] = None
+        self._db_name: Optional[str] = None
+        self._options: Dict[str, Any] = {}
+
+    @property
+    def initialized(self) -> bool:
+        return self._uri is not None
+
+    def init_app(self, app) -> None:
+        self._uri = app.config["DATABASE_URI"]
+        self._db_name = app.config.get("MONGO_DB_NAME")
+        self._options = {
+            kwarg: app.config[key]
+            for key, kwarg in _CLIENT_OPTIONS.items()
+            if app.config.get(key) not in (None, "")
+        }
+        app.extensions["async_mongo"] = self
+
+    @property
+    def client(self) -> AsyncMongoClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop or self._pid != os.getpid():
+            if not self.initialized:
+                raise RuntimeError("AsyncMongoClient not initialized. Did you forget to call init_extensions(app)?")
+            self._listener = PoolStatsListener()
+            self._client = AsyncMongoClient(self._uri, connect=False, event_listeners=[self._listener], **self._options)
+            self._loop = loop
+            self._pid = os.getpid()
+            logger.debug("Created AsyncMongoClient for pid %s", self._pid)
+        return self._client
+
+    def get_db(self, name: Optional[str] = None) -> AsyncDatabase:
+        return self.client[name or self._db_name]
+
+    def pool_stats(self) -> Dict[str, Any]:
+        listener = self._listener
+        return {
+            "pid": os.getpid(),
+            "client_created": self._client is not None and self._pid == os.getpid(),
+            "options": dict(self._options),
+            "counters": listener.snapshot() if listener else {},
+        }
+
+    async def close(self) -> None:
+        client, self._client, self._loop = self._client, None, None
+        if client is not None and self._pid == os.getpid():
+            await client.close()
+        self._pid = None
+        self._listener = None
@@ -1,9 +1,9 @@
-from app.extensions import mongo_client
+from typing import Optional
+from pymongo.database import Database # type: ignore
+from app.extensions import mongo
 
 import logging
 
-def get_db(name="TesTingDB"):
-    if mongo_client is None:
-        raise RuntimeError("MongoClient not initialized. Did you forget to call init_extensions(app)?")
-    logging.debug(f"Accessing MongoDB database: {name}")
-    return mongo_client[name]
\ No newline at end of file
+def get_db(name: Optional[str] = None) -> Database:
+    logging.debug("Accessing MongoDB database: %s", name or "default")
+    return mongo.get_db(name)
@@ -0,0 +1,143 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Type
+from pymongo import IndexModel  # type: ignore
+from pymongo.database import Database  # type: ignore
+from pymongo.errors import OperationFailure  # type: ignore
+from pydantic import BaseModel  # type: ignore
+import logging
+
+logger = logging.getLogger(__name__)
+
+ASCENDING = 1
+DESCENDING = -1
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """Declarative description of a single MongoDB index.
+
+    Models attach a list of these as ``_indexes`` next to ``_collection_name``.
+    """
+    keys: Tuple[Tuple[str, int], ...]
+    name: Optional[str] = None
+    unique: bool = False
+    sparse: bool = False
+    partial_filter: Optional[Dict[str, Any]] = None
+    expire_after_seconds: Optional[int] = None
+
+    @property
+    def resolved_name(self) -> str:
+        # Same naming scheme pymongo uses when no explicit name is given.
+        return self.name or "_".join(f"{key}_{direction}" for key, direction in self.keys)
+
+    def options(self) -> Dict[str, Any]:
+        options: Dict[str, Any] = {"name": self.resolved_name}
+        if self.unique:
+            options["unique"] = True
+        if self.sparse:
+            options["sparse"] = True
+        if self.partial_filter is not None:
+            options["partialFilterExpression"] = self.partial_filter
+        if self.expire_after_seconds is not None:
+            options["expireAfterSeconds"] = self.expire_after_seconds
+        return options
+
+    def to_index_model(self) -> IndexModel:
+        return IndexModel(list(self.keys), **self.options())
+
+    def matches(self, live: Dict[str, Any]) -> bool:
+        """Compare against one entry of ``Collection.index_information()``."""
+        live_keys = tuple((key, int(direction)) for key, direction in live.get("key", []))
+        return (
+            live_keys == tuple(self.keys)
+            and bool(live.get("unique", False)) == self.unique
+            and bool(live.get("sparse", False)) == self.sparse
+            and live.get("partialFilterExpression") == self.partial_filter
+            and live.get("expireAfterSeconds") == self.expire_after_seconds
+        )
+
+
+@dataclass
+class IndexDiff:
+    collection: str
+    missing: List[str] = field(default_factory=list)
+    mismatched: List[str] = field(default_factory=list)
+    extra: List[str] = field(default_factory=list)
+
+    @property
+    def in_sync(self) -> bool:
+        return not (self.missing or self.mismatched or self.extra)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "collection": self.collection,
+            "missing": self.missing,
+            "mismatched": self.mismatched,
+            "extra": self.extra,
+        }
+
+
+def get_indexed_models() -> List[Type[BaseModel]]:
+    """Every model that declares ``_indexes``; imported lazily to avoid import cycles."""
+    from app.models.user import UserModel
+    from app.models.student import StudentModel
+    from app.models.teacher import TeacherModel
+    from app.models.classes import ClassesModel
+    from app.models.grade import GradeModel
+    from app.models.feedback import FeedbackModel
+    from app.models.report import ReportModel
+    from app.models.user_search import UserSearchEntryModel
+    from app.models.user_stats import UserStatsDailyModel
+    from app.models.revoked_token import RevokedTokenModel
+    from app.models.enrollment import EnrollmentModel
+    return [UserModel, StudentModel, TeacherModel, ClassesModel, GradeModel, FeedbackModel, ReportModel, UserSearchEntryModel, UserStatsDailyModel, RevokedTokenModel, EnrollmentModel]
+
+
+def _declared_indexes(models: Optional[List[Type[BaseModel]]] = None) -> Dict[str, List[IndexSpec]]:
+    declared: Dict[str, List[IndexSpec]] = {}
+    for model in models or get_indexed_models():
+        collection_name = getattr(model, "_collection_name", None)
+        specs = getattr(model, "_indexes", None) or []
+        if not collection_name or not specs:
+            continue
+        declared.setdefault(collection_name, []).extend(specs)
+    return declared
+
+
+def ensure_indexes(db: Database, models: Optional[List[Type[BaseModel]]] = None) -> Dict[str, List[str]]:
+    """Create every declared index. Safe to run on each start-up: MongoDB treats
+    re-creating an identical index as a no-op. Conflicting definitions are logged
+    and skipped so a drifted index never blocks the app from booting.
+    """
+    created: Dict[str, List[str]] = {}
+    for collection_name, specs in _declared_indexes(models).items():
+        collection = db[collection_name]
+        for spec in specs:
+            try:
+                collection.create_indexes([spec.to_index_model()])
+                created.setdefault(collection_name, []).append(spec.resolved_name)
+            except OperationFailure as e:
+                logger.error(
+                    "Index %s on %s conflicts with the live definition: %s",
+                    spec.resolved_name, collection_name, e,
+                )
+    return created
+
+
+def diff_indexes(db: Database, models: Optional[List[Type[BaseModel]]] = None) -> List[IndexDiff]:
+    """Compare declared indexes with ``index_information()`` of each collection."""
+    diffs: List[IndexDiff] = []
+    for collection_name, specs in _declared_indexes(models).items():
+        live = db[collection_name].index_information()
+        diff = IndexDiff(collection=collection_name)
+        declared_names = set()
+        for spec in specs:
+            declared_names.add(spec.resolved_name)
+            live_index = live.get(spec.resolved_name)
+            if live_index is None:
+                diff.missing.append(spec.resolved_name)
+            elif not spec.matches(live_index):
+                diff.mismatched.append(spec.resolved_name)
+        diff.extra = sorted(name for name in live if name != "_id_" and name not in declared_names)
+        diffs.append(diff)
+    return diffs
@@ -0,0 +1,8 @@
+from typing import Any, Dict, List
+
+
+def build_enrollment_counts_pipeline() -> List[Dict[str, Any]]:
+    """Enrollment rows per class, for rebuilding ``classes.enrolled_count``."""
+    return [
+        {"$group": {"_id": "$class_id", "count": {"$sum": 1}}},
+    ]
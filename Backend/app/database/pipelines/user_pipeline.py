@@ -1,128 +1,28 @@
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
-from app.utils.objectid import ObjectId # type: ignore
+from typing import List, Dict, Any, Optional
 
-def users_growth_by_role_pipeline(start_date: str, end_date: str) -> List[Dict[str, Any]]:
-    start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-    end_dt = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1) - timedelta(milliseconds=1)
+USER_SEARCH_SORT_FIELD = "created_at"
 
-    return [
-        {
-            "$match": {
-                "created_at": {
-                    "$gte": start_dt,
-                    "$lte": end_dt
-                }
-            }
-        },
-        {
-            "$group": {
-                "_id": "$role",
-                "count": {"$sum": 1}
-            }
-        },
-        {
-            "$sort": {"count": -1}
-        }
-    ]
-
-
-
-def build_user_growth_stats_pipeline(start_date: str, end_date: str) -> list:
-    start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-    end_dt = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1) - timedelta(milliseconds=1)
-
-    pipeline = [
-        {
-            "$match": {
-                "created_at": {
-                    "$gte": start_dt,
-                    "$lte": end_dt
-                }
-            }
-        },
-        {
-            "$facet": {
-                "dailyCounts": [
-                    {
-                        "$group": {
-                            "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}},
-                            "count": {"$sum": 1}
-                        }
-                    },
-                    {"$sort": {"_id": 1}}
-                ],
-                "totalCount": [
-                    {"$count": "total"}
-                ]
-            }
-        }
-    ]
-    return pipeline
-
-
-def build_user_detail_pipeline(_id: ObjectId) -> list:
-    return [
-        {"$match": {"_id": _id}},
-        
-        {"$lookup": {
-            "from": "admin",
-            "localField": "_id",
-            "foreignField": "_id",
-            "as": "admin"
-        }},
-        {"$unwind": {"path": "$admin", "preserveNullAndEmptyArrays": True}},
-
-        {"$lookup": {
-            "from": "teacher",
-            "localField": "_id",
-            "foreignField": "_id",
-            "as": "teacher"
-        }},
-        {"$unwind": {"path": "$teacher", "preserveNullAndEmptyArrays": True}},
-
-        {"$lookup": {
-            "from": "student",
-            "localField": "_id",
-            "foreignField": "_id",
-            "as": "student"
-        }},
-        {"$unwind": {"path": "$student", "preserveNullAndEmptyArrays": True}},
-    ]
-
-
-
-
-def build_search_user_pipeline(query: str, page: int, page_size: int) -> list:
-    regex = {"$regex": query, "$options": "i"}
-    skip = (page - 1) * page_size
-    pipeline = [
-        {"$match": {"$or": [{"username": regex}, {"email": regex}]}},
-        {"$skip": skip},
-        {"$limit": page_size},
-        {"$lookup": {"from": "admin", "localField": "_id", "foreignField": "_id", "as": "admin"}},
-        {"$unwind": {"path": "$admin", "preserveNullAndEmptyArrays": True}},
-        {"$lookup": {"from": "teacher", "localField": "_id", "foreignField": "_id", "as": "teacher"}},
-        {"$unwind": {"path": "$teacher", "preserveNullAndEmptyArrays": True}},
-        {"$lookup": {"from": "student", "localField": "_id", "foreignField": "_id", "as": "student"}},
-        {"$unwind": {"path": "$student", "preserveNullAndEmptyArrays": True}},
-    ]
-    return pipeline
 
+def build_keyset_filter(sort_field: str, direction: int, cursor: Dict[str, Any]) -> Dict[str, Any]:
+    """Seek predicate for ``(sort_field, _id)`` ordering: rows strictly after the cursor."""
+    op = "$lt" if direction < 0 else "$gt"
+    return {
+        "$or": [
+            {sort_field: {op: cursor[sort_field]}},
+            {sort_field: cursor[sort_field], "_id": {op: cursor["_id"]}},
+        ]
+    }
 
 
+def build_search_user_pipeline(page_size: int, cursor: Optional[Dict[str, Any]] = None) -> list:
+    """Newest users first, paged by ``(created_at, _id)`` instead of ``$skip``.
 
-def build_role_counts_pipeline(start_dt: datetime, end_dt: datetime) -> list:
+    Used when the search query is blank; text queries go through the search index.
+    Fetches ``page_size + 1`` rows so the caller can tell whether a next page exists.
+    """
+    match = build_keyset_filter(USER_SEARCH_SORT_FIELD, -1, cursor) if cursor else {}
     return [
-        {
-            "$match": {
-                "created_at": {"$gte": start_dt, "$lte": end_dt}
-            }
-        },
-        {
-            "$group": {
-                "_id": "$role",
-                "count": {"$sum": 1}
-            }
-        }
+        {"$match": match},
+        {"$sort": {USER_SEARCH_SORT_FIELD: -1, "_id": -1}},
+        {"$limit": page_size + 1},
     ]
@@ -0,0 +1,52 @@
+import re
+from typing import List, Dict, Any, Optional
+from app.database.pipelines.user_pipeline import build_keyset_filter
+
+USER_SEARCH_SCORE_FIELD = "score"
+
+
+def build_user_search_index_pipeline(
+    query: str,
+    grams: List[str],
+    page_size: int,
+    users_collection: str,
+    cursor: Optional[Dict[str, Any]] = None,
+) -> list:
+    """Indexed candidate lookup on ``grams`` followed by ranking.
+
+    ``query`` must already be normalized. Candidates are re-checked against the
+    escaped query to drop trigram false positives, scored (3 exact, 2 prefix,
+    1 substring) and paged by ``(score, _id)``. The matching user documents
+    are joined back in ranked order.
+    """
+    escaped = re.escape(query)
+
+    def contains(field: str, pattern: str) -> Dict[str, Any]:
+        return {"$regexMatch": {"input": field, "regex": pattern}}
+
+    pipeline: List[Dict[str, Any]] = [
+        {"$match": {"grams": {"$all": grams}}},
+        {"$addFields": {
+            USER_SEARCH_SCORE_FIELD: {"$switch": {
+                "branches": [
+                    {"case": {"$or": [{"$eq": ["$username_lc", query]}, {"$eq": ["$email_lc", query]}]}, "then": 3},
+                    {"case": {"$or": [contains("$username_lc", "^" + escaped), contains("$email_lc", "^" + escaped)]}, "then": 2},
+                    {"case": {"$or": [contains("$username_lc", escaped), contains("$email_lc", escaped)]}, "then": 1},
+                ],
+                "default": 0,
+            }}
+        }},
+        {"$match": {USER_SEARCH_SCORE_FIELD: {"$gt": 0}}},
+    ]
+    if cursor:
+        pipeline.append({"$match": build_keyset_filter(USER_SEARCH_SCORE_FIELD, -1, cursor)})
+    pipeline += [
+        {"$sort": {USER_SEARCH_SCORE_FIELD: -1, "_id": -1}},
+        {"$limit": page_size + 1},
+        {"$project": {USER_SEARCH_SCORE_FIELD: 1}},
+        {"$lookup": {"from": users_collection, "localField": "_id", "foreignField": "_id", "as": "user"}},
+        {"$unwind": "$user"},
+        {"$addFields": {"user._search_score": f"${USER_SEARCH_SCORE_FIELD}"}},
+        {"$replaceRoot": {"newRoot": "$user"}},
+    ]
+    return pipeline
@@ -0,0 +1,73 @@
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+
+def _date_range_match(start_dt: Optional[datetime], end_dt: Optional[datetime]) -> Dict[str, Any]:
+    date_filter: Dict[str, Any] = {}
+    if start_dt is not None:
+        date_filter["$gte"] = start_dt
+    if end_dt is not None:
+        date_filter["$lte"] = end_dt
+    return {"date": date_filter} if date_filter else {}
+
+
+def build_daily_totals_pipeline(start_dt: datetime, end_dt: datetime) -> List[Dict[str, Any]]:
+    """Per-day totals across roles, read from the rollup collection."""
+    return [
+        {"$match": _date_range_match(start_dt, end_dt)},
+        {"$group": {"_id": "$date", "count": {"$sum": "$count"}}},
+        {"$match": {"count": {"$gt": 0}}},
+        {"$sort": {"_id": 1}},
+    ]
+
+
+def build_role_totals_pipeline(start_dt: Optional[datetime] = None, end_dt: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """Per-role totals, optionally limited to a date range."""
+    return [
+        {"$match": _date_range_match(start_dt, end_dt)},
+        {"$group": {"_id": "$role", "count": {"$sum": "$count"}}},
+    ]
+
+
+def period_key(index: int) -> str:
+    return f"p{index}"
+
+
+def build_role_totals_by_period_pipeline(periods: Sequence[Tuple[datetime, datetime]]) -> List[Dict[str, Any]]:
+    """Per-role totals for N date ranges in one pass.
+
+    Rows in any of the ranges are grouped by role once; each range gets its own
+    conditional ``$sum`` bucket named ``p0 .. pN-1``. Ranges may overlap.
+    """
+    buckets = {
+        period_key(i): {"$sum": {"$cond": [
+            {"$and": [{"$gte": ["$date", start_dt]}, {"$lte": ["$date", end_dt]}]},
+            "$count",
+            0,
+        ]}}
+        for i, (start_dt, end_dt) in enumerate(periods)
+    }
+    return [
+        {"$match": {"$or": [_date_range_match(start_dt, end_dt) for start_dt, end_dt in periods]}},
+        {"$group": {"_id": "$role", **buckets}},
+    ]
+
+
+def build_user_stats_rebuild_pipeline(rollup_collection: str, rebuilt_at: datetime) -> List[Dict[str, Any]]:
+    """Re-aggregate ``users`` into the rollup by (UTC day, role)."""
+    return [
+        {"$match": {"created_at": {"$type": "date"}}},
+        {"$group": {
+            "_id": {
+                "date": {"$dateFromParts": {
+                    "year": {"$year": "$created_at"},
+                    "month": {"$month": "$created_at"},
+                    "day": {"$dayOfMonth": "$created_at"},
+                }},
+                "role": "$role",
+            },
+            "count": {"$sum": 1},
+        }},
+        {"$project": {"_id": 0, "date": "$_id.date", "role": "$_id.role", "count": 1, "updated_at": {"$literal": rebuilt_at}}},
+        {"$merge": {"into": rollup_collection, "on": ["date", "role"], "whenMatched": "replace", "whenNotMatched": "insert"}},
+    ]
@@ -18,4 +18,12 @@ class AttendanceStatus(str, Enum):
     PRESENT =  "present"
     ABSENT = "absent"
     LATE = "late"
-    EXCUSED = "excused"
\ No newline at end of file
+    EXCUSED = "excused"
+
+class EnrollmentStatus(str, Enum):
+    ENROLLED = "enrolled"
+    ALREADY_ENROLLED = "already_enrolled"
+    CLASS_FULL = "class_full"
+    CLASS_NOT_FOUND = "class_not_found"
+    UNENROLLED = "unenrolled"
+    NOT_ENROLLED = "not_enrolled"
@@ -1,6 +1,5 @@
 from flask import jsonify
 from werkzeug.exceptions import HTTPException
-from app.utils.convert import convert_objectid_to_str
 from app.error.exceptions import (
     AppBaseException,
     UnauthorizedError,
@@ -12,9 +11,11 @@ from app.error.exceptions import (
     AuthenticationError,
     DatabaseError,
 )
+from app.error.error_log import error_log_sampler, log_app_exception, log_unexpected_exception
 
 
 def register_error_handlers(app):
+    error_log_sampler.configure(app.config)
 
     @app.errorhandler(HTTPException)
     def handle_http_exception(error: HTTPException):
@@ -28,6 +29,7 @@ def register_error_handlers(app):
 
     @app.errorhandler(CustomValidationError)
     def handle_custom_validation(error: CustomValidationError):
+        log_app_exception(error)
         return jsonify({
             "error_code": "VALIDATION_ERROR",
             "message": "Validation failed",
@@ -39,10 +41,11 @@ def register_error_handlers(app):
 
     @app.errorhandler(NotFoundError)
     def handle_not_found(error: NotFoundError):
+        log_app_exception(error)
         return jsonify({
             "error_code": "NOT_FOUND",
             "message": error.message,
-            "details": convert_objectid_to_str(error.details or {}),
+            "details": error.details or {},
             "severity": "medium",
             "category": "client",
             "recoverable": False
@@ -50,10 +53,11 @@ def register_error_handlers(app):
 
     @app.errorhandler(DatabaseError)
     def handle_database_error(error: DatabaseError):
+        log_app_exception(error)
         return jsonify({
             "error_code": "DATABASE_ERROR",
             "message": error.message,
-            "details": convert_objectid_to_str(error.details or {}),
+            "details": error.details or {},
             "severity": "high",
             "category": "system",
             "recoverable": False
@@ -61,10 +65,11 @@ def register_error_handlers(app):
 
     @app.errorhandler(AuthenticationError)
     def handle_authentication_error(error: AuthenticationError):
+        log_app_exception(error)
         return jsonify({
             "error_code": "AUTHENTICATION_ERROR",
             "message": error.message,
-            "details": convert_objectid_to_str(error.details or {}),
+            "details": error.details or {},
             "severity": "medium",
             "category": "auth",
             "recoverable": False
@@ -72,10 +77,11 @@ def register_error_handlers(app):
 
     @app.errorhandler(UnauthorizedError)
     def handle_unauthorized(error: UnauthorizedError):
+        log_app_exception(error)
         return jsonify({
             "error_code": "UNAUTHORIZED",
             "message": error.message,
-            "details": convert_objectid_to_str(error.details or {}),
+            "details": error.details or {},
             "severity": "medium",
             "category": "auth",
             "recoverable": False
@@ -83,10 +89,11 @@ def register_error_handlers(app):
 
     @app.errorhandler(ForbiddenError)
     def handle_forbidden(error: ForbiddenError):
+        log_app_exception(error)
         return jsonify({
             "error_code": "FORBIDDEN",
             "message": error.message,
-            "details": convert_objectid_to_str(error.details or {}),
+            "details": error.details or {},
             "severity": "medium",
             "category": "auth",
             "recoverable": False
@@ -94,17 +101,19 @@ def register_error_handlers(app):
 
     @app.errorhandler(AppBaseException)
     def handle_app_base_exception(error: AppBaseException):
+        log_app_exception(error)
         return jsonify({
-            "error_code": error.code or "APP_ERROR",
+            "error_code": error.error_code or "APP_ERROR",
             "message": error.message,
-            "details": convert_objectid_to_str(error.details or {}),
-            "severity": error.severity or "medium",
-            "category": error.category or "application",
+            "details": error.details or {},
+            "severity": error.severity.value if error.severity else "medium",
+            "category": error.category.value if error.category else "application",
             "recoverable": error.recoverable if hasattr(error, "recoverable") else False
         }), error.status_code or 400
 
     @app.errorhandler(Exception)
     def handle_unexpected_exception(error: Exception):
+        log_unexpected_exception(error)
         return jsonify({
             "error_code": "INTERNAL_SERVER_ERROR",
             "message": "An unexpected error occurred.",
@@ -0,0 +1,142 @@
+import logging
+import random
+import reprlib
+import threading
+import time
+from typing import Any, Dict, Optional
+from flask import g, has_request_context, request  # type: ignore
+from app.error.exceptions import AppBaseException, ErrorSeverity
+
+logger = logging.getLogger("app.error")
+
+_SEVERITY_LEVELS = {
+    ErrorSeverity.CRITICAL: logging.CRITICAL,
+    ErrorSeverity.HIGH: logging.ERROR,
+    ErrorSeverity.MEDIUM: logging.WARNING,
+    ErrorSeverity.LOW: logging.INFO,
+}
+
+# Bounded repr: cost and size stay flat no matter how much request data a wrapper carries.
+_detail_repr = reprlib.Repr()
+_detail_repr.maxlevel = 3
+_detail_repr.maxdict = 20
+_detail_repr.maxlist = 20
+_detail_repr.maxstring = 200
+_detail_repr.maxother = 200
+
+
+def parse_sample_rates(raw: Optional[str]) -> Dict[str, float]:
+    """``"NOTFOUNDERROR_ERROR=0.01,UNAUTHORIZEDERROR_ERROR=0.1"`` -> ``{code: rate}``."""
+    rates: Dict[str, float] = {}
+    for part in (raw or "").split(","):
+        code, sep, rate = part.partition("=")
+        if sep and code.strip():
+            rates[code.strip()] = float(rate)
+    return rates
+
+
+class ErrorLogSampler:
+    """Decides which handled errors are written to the log.
+
+    LOW and MEDIUM severity errors are sampled per error code (``sample_rates``,
+    else ``default_rate``). Every code is also capped at ``max_per_window`` records
+    per ``window`` seconds; what the cap drops is reported as one summary line
+    when the window rolls over.
+    """
+
+    def __init__(
+        self,
+        sample_rates: Optional[Dict[str, float]] = None,
+        default_rate: float = 1.0,
+        max_per_window: int = 60,
+        window: float = 60.0,
+        max_detail_chars: int = 2048,
+    ):
+        self.sample_rates = dict(sample_rates or {})
+        self.default_rate = default_rate
+        self.max_per_window = max_per_window
+        self.window = window
+        self.max_detail_chars = max_detail_chars
+        self._lock = threading.Lock()
+        self._windows: Dict[str, list] = {}  # code -> [window_start, logged, suppressed]
+        self.logged = 0
+        self.sampled_out = 0
+        self.rate_limited = 0
+
+    def configure(self, config) -> None:
+        self.sample_rates = parse_sample_rates(config.get("ERROR_LOG_SAMPLE_RATES"))
+        self.default_rate = config.get("ERROR_LOG_DEFAULT_SAMPLE_RATE", 1.0)
+        self.max_per_window = config.get("ERROR_LOG_MAX_PER_MINUTE", 60)
+        self.max_detail_chars = config.get("ERROR_LOG_MAX_DETAIL_CHARS", 2048)
+
+    def should_log(self, code: str, severity: ErrorSeverity) -> bool:
+        if severity in (ErrorSeverity.LOW, ErrorSeverity.MEDIUM):
+            rate = self.sample_rates.get(code, self.default_rate)
+            if rate < 1.0 and random.random() >= rate:
+                self.sampled_out += 1
+                return False
+        now = time.monotonic()
+        with self._lock:
+            state = self._windows.get(code)
+            if state is None or now - state[0] >= self.window:
+                if state is not None and state[2]:
+                    logger.warning("Suppressed %d %s log records in the last %.0fs", state[2], code, self.window)
+                state = self._windows[code] = [now, 0, 0]
+            if state[1] >= self.max_per_window:
+                state[2] += 1
+                self.rate_limited += 1
+                return False
+            state[1] += 1
+        self.logged += 1
+        return True
+
+    def truncate(self, value: Any) -> Optional[str]:
+        if not value:
+            return None
+        text = _detail_repr.repr(value)
+        if len(text) > self.max_detail_chars:
+            text = text[:self.max_detail_chars] + "...<truncated>"
+        return text
+
+    def stats(self) -> Dict[str, int]:
+        return {"logged": self.logged, "sampled_out": self.sampled_out, "rate_limited": self.rate_limited}
+
+
+error_log_sampler = ErrorLogSampler()
+
+
+def _claim_request() -> bool:
+    """True the first time per request; later calls are duplicates of an already logged error."""
+    if not has_request_context():
+        return True
+    if g.get("_error_logged"):
+        return False
+    g._error_logged = True
+    return True
+
+
+def log_app_exception(error: AppBaseException, sampler: ErrorLogSampler = error_log_sampler) -> None:
+    """Log a handled ``AppBaseException`` once per request, subject to sampling and rate caps."""
+    level = _SEVERITY_LEVELS.get(error.severity, logging.WARNING)
+    if not logger.isEnabledFor(level) or not _claim_request():
+        return
+    if not sampler.should_log(error.error_code, error.severity):
+        return
+    extra = {
+        "error_code": error.error_code,
+        "category": error.category.value,
+        "severity": error.severity.value,
+        "status_code": error.status_code,
+        "details": sampler.truncate(error.details),
+        "context": sampler.truncate(error.context),
+    }
+    if has_request_context():
+        extra.update(method=request.method, path=request.path)
+    logger.log(level, "%s severity error: %s", error.severity.value.capitalize(), error.message, extra=extra)
+
+
+def log_unexpected_exception(error: Exception, sampler: ErrorLogSampler = error_log_sampler) -> None:
+    if not _claim_request() or not sampler.should_log("UNHANDLED_EXCEPTION", ErrorSeverity.CRITICAL):
+        return
+    extra = {"method": request.method, "path": request.path} if has_request_context() else {}
+    logger.error("Unhandled exception: %s", type(error).__name__, exc_info=error, extra=extra)
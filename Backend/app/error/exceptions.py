@@ -1,9 +1,7 @@
 
 from typing import Optional, Dict, Any, Union
 from enum import Enum
-import logging
 import json
-logger = logging.getLogger(__name__)
 
 class ErrorSeverity(Enum):
     """Severity levels for exceptions."""
@@ -26,7 +24,7 @@ class AppBaseException(Exception):
     """
     Base exception for custom app-level errors.
     
-    Provides rich error context, logging, and standardized error handling.
+    Provides rich error context and standardized error handling.
     """
     
     def __init__(
@@ -53,8 +51,8 @@ class AppBaseException(Exception):
         self.recoverable = recoverable
         self.context = context or {}
         self.user_message = user_message or self._generate_user_message()
-        # Log the exception based on severity
-        self._log_exception()
+        # Not logged here: most instances are routine control flow. The error
+        # handlers log once per request, sampled (see app.error.error_log).
     
     def _generate_error_code(self) -> str:
         """Generate a default error code based on the exception class."""
@@ -64,19 +62,6 @@ class AppBaseException(Exception):
         """Generate a user-friendly message."""
         return "An error occurred. Please try again or contact support."
     
-    def _log_exception(self):
-        """Log the exception with appropriate level based on severity."""
-        log_data = { 'error_code': self.error_code, 'error_message': self.message,  'category': self.category.value,'severity': self.severity.value,'recoverable': self.recoverable,'details': self.details,'context': self.context}
-        
-        if self.severity == ErrorSeverity.CRITICAL:
-            logger.critical(f"Critical error: {self.message}", extra=log_data)
-        elif self.severity == ErrorSeverity.HIGH:
-            logger.error(f"High severity error: {self.message}", extra=log_data)
-        elif self.severity == ErrorSeverity.MEDIUM:
-            logger.warning(f"Medium severity error: {self.message}", extra=log_data)
-        else:
-            logger.info(f"Low severity error: {self.message}", extra=log_data)
-    
     def to_dict(self) -> Dict[str, Any]:
         """Convert exception to dictionary for API responses."""
         return {
@@ -0,0 +1,175 @@
+import atexit
+import copy
+import logging
+import os
+import queue
+import re
+import sys
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+from flask import Flask, g, request  # type: ignore
+from app.utils.json_provider import dumps_bytes
+
+REQUEST_ID_HEADER = "X-Request-ID"
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+# Attributes every LogRecord has; anything else came in through ``extra=``.
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+
+def parse_logger_levels(raw: Optional[str]) -> Dict[str, str]:
+    """``"pymongo=WARNING,app.error=INFO"`` -> ``{logger: level}``."""
+    levels: Dict[str, str] = {}
+    for part in (raw or "").split(","):
+        name, sep, level = part.partition("=")
+        if sep and name.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamps ``record.request_id``. Handler filters run in the thread that logs, where the context var is set."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, message, request_id, then any ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        try:
+            return dumps_bytes(entry).decode("utf-8")
+        except TypeError:
+            return dumps_bytes({k: v if isinstance(v, (str, int, float, bool, type(None))) else repr(v) for k, v in entry.items()}).decode("utf-8")
+
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread.
+
+    The stock ``prepare`` formats on the calling thread. Here only the message is
+    frozen (so later mutation of the args can't change it), and the JSON encoding
+    and traceback rendering happen off the request path.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class LoggingPipeline:
+    """Root logger -> ``DeferredQueueHandler`` -> ``QueueListener`` -> stream handler.
+
+    Only the handlers this pipeline installed are replaced on reconfiguration, so
+    handlers added by test runners or other tools stay in place. The listener
+    thread does not survive ``fork()``; the child starts a fresh queue and listener.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queue_handler: Optional[DeferredQueueHandler] = None
+        self._listener: Optional[QueueListener] = None
+        self._target: Optional[logging.Handler] = None
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._restart_after_fork)
+        atexit.register(self.stop)
+
+    def configure(self, config) -> None:
+        fmt = str(config.get("LOG_FORMAT", "json")).lower()
+        target = logging.StreamHandler(sys.stderr)
+        if fmt == "text":
+            target.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"))
+        else:
+            target.setFormatter(JsonFormatter())
+
+        with self._lock:
+            self._stop_locked()
+            root = logging.getLogger()
+            if self._queue_handler is not None:
+                root.removeHandler(self._queue_handler)
+            self._target = target
+            self._queue_handler = DeferredQueueHandler(queue.Queue(-1))
+            self._queue_handler.addFilter(RequestIdFilter())
+            root.addHandler(self._queue_handler)
+            self._start_locked()
+
+        logging.getLogger().setLevel(str(config.get("LOG_LEVEL", "INFO")).upper())
+        for name, level in parse_logger_levels(config.get("LOG_LEVELS")).items():
+            logging.getLogger(name).setLevel(level)
+
+    def _start_locked(self) -> None:
+        self._listener = QueueListener(self._queue_handler.queue, self._target, respect_handler_level=True)
+        self._listener.start()
+
+    def _stop_locked(self) -> None:
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+    def stop(self) -> None:
+        """Flush what is queued and stop the listener thread."""
+        with self._lock:
+            self._stop_locked()
+
+    def _restart_after_fork(self) -> None:
+        self._lock = threading.Lock()
+        if self._queue_handler is None:
+            return
+        # The parent's listener thread is gone and its queue may hold a lock taken mid-put.
+        self._listener = None
+        self._queue_handler.queue = queue.Queue(-1)
+        self._start_locked()
+
+
+logging_pipeline = LoggingPipeline()
+
+
+def resolve_request_id(incoming: Optional[str]) -> str:
+    """The caller's ``X-Request-ID`` when it is well-formed, else a fresh one."""
+    return incoming if incoming and _VALID_REQUEST_ID.match(incoming) else uuid.uuid4().hex
+
+
+def _bind_request_id() -> None:
+    request_id = resolve_request_id(request.headers.get(REQUEST_ID_HEADER))
+    request_id_var.set(request_id)
+    g.request_id = request_id
+
+
+def _echo_request_id(response):
+    response.headers.setdefault(REQUEST_ID_HEADER, g.get("request_id", "-"))
+    return response
+
+
+def _unbind_request_id(_exc: Optional[BaseException]) -> None:
+    request_id_var.set("-")
+
+
+def init_logging(app: Flask) -> None:
+    """Install the queue-backed pipeline and per-request IDs (``X-Request-ID`` in and out)."""
+    logging_pipeline.configure(app.config)
+    app.before_request(_bind_request_id)
+    app.after_request(_echo_request_id)
+    app.teardown_request(_unbind_request_id)
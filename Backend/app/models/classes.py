@@ -4,6 +4,7 @@ from pydantic import BaseModel, Field, HttpUrl  # type: ignore
 from app.models.schedule import ScheduleItemModel  # type: ignore
 from app.utils.objectid import ObjectId # type: ignore
 from app.utils.pyobjectid import PyObjectId
+from app.database.indexes import IndexSpec, ASCENDING
 
 class ClassInfoModel(BaseModel):
     course_code: str
@@ -22,11 +23,15 @@ class ClassInfoModel(BaseModel):
 
 class ClassesModel(BaseModel):
     _collection_name: ClassVar[str] = "classes"
+    _indexes: ClassVar[List[IndexSpec]] = [
+        IndexSpec(keys=(("created_by", ASCENDING),)),
+    ]
     
     id: PyObjectId | None = Field(default=None, alias="_id")
     class_info: ClassInfoModel | None = None 
     created_by: str | ObjectId | None = None
-    students_enrolled: List[str] = Field(default_factory=list) 
+    # Membership lives in the ``enrollments`` collection; this counter is what enforces max_students.
+    enrolled_count: int = 0
     max_students: int | None = 30 
     model_config = {
         "extra": "allow",
@@ -0,0 +1,26 @@
+from datetime import datetime, timezone
+from typing import ClassVar, List, Optional
+from pydantic import BaseModel, Field  # type: ignore
+from app.utils.pyobjectid import PyObjectId
+from app.database.indexes import IndexSpec, ASCENDING
+
+
+class EnrollmentModel(BaseModel):
+    """One student enrolled in one class. Replaces ``classes.students_enrolled`` and ``student_info.class_ids``."""
+    _collection_name: ClassVar[str] = "enrollments"
+    _indexes: ClassVar[List[IndexSpec]] = [
+        # Roster pages and membership checks; unique so an enrollment can't be recorded twice.
+        IndexSpec(keys=(("class_id", ASCENDING), ("student_id", ASCENDING)), name="class_student_unique", unique=True),
+        # A student's classes (schedule).
+        IndexSpec(keys=(("student_id", ASCENDING), ("class_id", ASCENDING)), name="student_class"),
+    ]
+
+    id: Optional[PyObjectId] = Field(default=None, alias="_id")
+    class_id: PyObjectId
+    student_id: PyObjectId
+    enrolled_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    model_config = {
+        "populate_by_name": True,
+        "arbitrary_types_allowed": True,
+    }
@@ -5,6 +5,8 @@ from app.enums.roles import FeedbackRole
 from app.enums.category import Category
 from app.enums.status import FeedbackStatus
 from app.utils.pyobjectid import PyObjectId
+from app.database.indexes import IndexSpec, ASCENDING, DESCENDING
+from typing import ClassVar, List
 class FeedbackResponseModel(BaseModel):
     __collection_name__ = "feedback_response"
     
@@ -15,7 +17,13 @@ class FeedbackResponseModel(BaseModel):
 
 
 class FeedbackModel(BaseModel):
-    
+    _collection_name: ClassVar[str] = "feedback"
+    _indexes: ClassVar[List[IndexSpec]] = [
+        IndexSpec(keys=(("sender_id", ASCENDING), ("created_at", DESCENDING))),
+        IndexSpec(keys=(("receiver_id", ASCENDING), ("created_at", DESCENDING))),
+        IndexSpec(keys=(("status", ASCENDING),)),
+    ]
+
     id: PyObjectId | None = Field(None, alias="_id")
     sender_id: str
     receiver_id: str | None = None
@@ -1,8 +1,14 @@
 from pydantic import BaseModel, Field, computed_field  # type: ignore
+from typing import ClassVar, List
 from app.utils.pyobjectid import PyObjectId
+from app.database.indexes import IndexSpec, ASCENDING
 
 class GradeModel(BaseModel):
-    
+    _collection_name: ClassVar[str] = "grades"
+    _indexes: ClassVar[List[IndexSpec]] = [
+        IndexSpec(keys=(("course_id", ASCENDING), ("term", ASCENDING))),
+    ]
+
     id: PyObjectId | None = Field(None, alias="_id")
     student_name: str
     course_id: str
@@ -1,12 +1,18 @@
 from pydantic import BaseModel, Field # type: ignore
-from typing import Optional
+from typing import ClassVar, List, Optional
 from datetime import datetime, timezone
 from app.enums.report import TargetType, ReportReason, Severity
 from app.enums.status import ReportStatus
 from app.utils.pyobjectid import PyObjectId
+from app.database.indexes import IndexSpec, ASCENDING, DESCENDING
 class ReportModel(BaseModel):
     
     __collection_name__ = "report"
+    _collection_name: ClassVar[str] = "report_info"
+    _indexes: ClassVar[List[IndexSpec]] = [
+        IndexSpec(keys=(("reporter_id", ASCENDING), ("created_at", DESCENDING))),
+        IndexSpec(keys=(("status", ASCENDING), ("created_at", DESCENDING))),
+    ]
     
     
     id: PyObjectId | None = Field(None, alias="_id")
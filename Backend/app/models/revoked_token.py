@@ -0,0 +1,26 @@
+from typing import ClassVar, List, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field  # type: ignore
+from app.utils.pyobjectid import PyObjectId
+from app.database.indexes import IndexSpec, ASCENDING
+
+
+class RevokedTokenModel(BaseModel):
+    """A revoked access token. MongoDB drops the row once the token would have expired anyway."""
+    _collection_name: ClassVar[str] = "revoked_tokens"
+    _indexes: ClassVar[List[IndexSpec]] = [
+        IndexSpec(keys=(("jti", ASCENDING),), name="jti_unique", unique=True),
+        IndexSpec(keys=(("expires_at", ASCENDING),), name="expires_at_ttl", expire_after_seconds=0),
+        IndexSpec(keys=(("revoked_at", ASCENDING),)),
+    ]
+
+    id: Optional[PyObjectId] = Field(default=None, alias="_id")
+    jti: str
+    user_id: Optional[str] = None
+    expires_at: datetime
+    revoked_at: datetime
+
+    model_config = {
+        "populate_by_name": True,
+        "arbitrary_types_allowed": True,
+    }
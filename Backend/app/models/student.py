@@ -4,10 +4,10 @@ from typing import Optional, List, Dict, ClassVar
 from app.enums.status import AttendanceStatus
 from app.utils.objectid import ObjectId # type: ignore
 from app.utils.pyobjectid import PyObjectId
+from app.database.indexes import IndexSpec, ASCENDING
 class StudentInfoModel(BaseModel):
     student_id: str
     grade: Optional[int] = 0
-    class_ids: List[str] = Field(default_factory=list)
     major: Optional[str] = None
     birth_date: Optional[datetime] = None
     batch: Optional[str] = None
@@ -27,7 +27,6 @@ class StudentInfoModel(BaseModel):
         data = {
             "student_id": "",
             "grade": None,
-            "class_ids": [],
             "major": None,
             "birth_date": None,
             "batch": None,
@@ -54,6 +53,9 @@ class StudentInfoModel(BaseModel):
 
 class StudentModel(BaseModel):
     _collection_name: ClassVar[str] = "student" 
+    _indexes: ClassVar[List[IndexSpec]] = [
+        IndexSpec(keys=(("student_info.student_id", ASCENDING),)),
+    ]
     
     id: Optional[PyObjectId] = Field(None, alias="_id")
     student_info: StudentInfoModel
@@ -3,6 +3,7 @@ from pydantic import BaseModel, Field   # type: ignore
 from datetime import datetime, timezone
 from app.utils.pyobjectid import PyObjectId
 from app.utils.objectid import ObjectId  # type: ignore
+from app.database.indexes import IndexSpec, ASCENDING
 
 class TeacherInfoModel(BaseModel):
     lecturer_id: Optional[str] = None
@@ -30,6 +31,9 @@ class TeacherInfoModel(BaseModel):
 
 class TeacherModel(BaseModel):
     _collection_name: ClassVar[str] = "teacher"
+    _indexes: ClassVar[List[IndexSpec]] = [
+        IndexSpec(keys=(("teacher_info.lecturer_id", ASCENDING),)),
+    ]
     
     id: Optional[PyObjectId] = Field(None, alias="_id")
     phone_number: Optional[str] = None
@@ -1,14 +1,21 @@
 # app/models/user_model.py
-from typing import ClassVar, Optional
+from typing import ClassVar, List, Optional
 from pydantic import BaseModel, Field  # type: ignore
 from datetime import datetime, timezone
 from app.utils.pyobjectid import PyObjectId 
 from app.enums.roles import Role
 from app.utils.objectid import ObjectId  # type: ignore
+from app.database.indexes import IndexSpec, ASCENDING, DESCENDING
 
 
 class UserModel(BaseModel):
     _collection_name: ClassVar[str] = "users"
+    _indexes: ClassVar[List[IndexSpec]] = [
+        IndexSpec(keys=(("username", ASCENDING),), name="username_unique", unique=True, partial_filter={"username": {"$type": "string"}}),
+        IndexSpec(keys=(("email", ASCENDING),), name="email_unique", unique=True, partial_filter={"email": {"$type": "string"}}),
+        IndexSpec(keys=(("created_at", ASCENDING), ("role", ASCENDING))),
+        IndexSpec(keys=(("created_at", DESCENDING), ("_id", DESCENDING))),
+    ]
     id: Optional[PyObjectId] = Field(default=None, alias="_id")
     role: Role = Role.STUDENT
     username: Optional[str] = Field(default=None, min_length=1, max_length=50)
@@ -0,0 +1,26 @@
+from typing import ClassVar, List, Optional
+from datetime import datetime, timezone
+from pydantic import BaseModel, Field  # type: ignore
+from app.utils.pyobjectid import PyObjectId
+from app.database.indexes import IndexSpec, ASCENDING
+
+
+class UserSearchEntryModel(BaseModel):
+    """One row of the user search index; ``_id`` is the user's ``_id``."""
+    _collection_name: ClassVar[str] = "user_search_index"
+    _indexes: ClassVar[List[IndexSpec]] = [
+        IndexSpec(keys=(("grams", ASCENDING),)),
+        IndexSpec(keys=(("indexed_at", ASCENDING),)),
+    ]
+
+    id: PyObjectId = Field(alias="_id")
+    username_lc: str = ""
+    email_lc: str = ""
+    grams: List[str] = Field(default_factory=list)
+    created_at: Optional[datetime] = None
+    indexed_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    model_config = {
+        "populate_by_name": True,
+        "arbitrary_types_allowed": True,
+    }
@@ -0,0 +1,24 @@
+from typing import ClassVar, List, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field  # type: ignore
+from app.utils.pyobjectid import PyObjectId
+from app.database.indexes import IndexSpec, ASCENDING
+
+
+class UserStatsDailyModel(BaseModel):
+    """Number of users created on ``date`` (UTC midnight) per role, net of deletions."""
+    _collection_name: ClassVar[str] = "user_stats_daily"
+    _indexes: ClassVar[List[IndexSpec]] = [
+        IndexSpec(keys=(("date", ASCENDING), ("role", ASCENDING)), name="date_role_unique", unique=True),
+    ]
+
+    id: Optional[PyObjectId] = Field(default=None, alias="_id")
+    date: datetime
+    role: str
+    count: int = 0
+    updated_at: Optional[datetime] = None
+
+    model_config = {
+        "populate_by_name": True,
+        "arbitrary_types_allowed": True,
+    }
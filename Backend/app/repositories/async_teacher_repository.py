@@ -0,0 +1,53 @@
+from typing import AsyncIterator, Optional, AbstractSet, Union
+from pymongo.asynchronous.database import AsyncDatabase  # type: ignore
+from app.models.classes import ClassesModel
+from app.models.teacher import TeacherModel
+from app.utils.objectid import ObjectId  # type: ignore
+from app.utils.model_utils import default_model_utils, trusted_model_utils
+from app.utils.projection import to_projection
+from app.error.exceptions import ExceptionFactory, NotFoundError, InternalServerError, ErrorCategory, AppBaseException
+
+
+class AsyncTeacherRepository:
+    """Read-only teacher profile and class queries on ``AsyncMongoClient`` for the ASGI app.
+
+    Mirrors ``MongoTeacherService.get_teacher_by_id`` and the ``MongoClassesService``
+    class reads, including their error responses.
+    """
+
+    def __init__(self, db: AsyncDatabase):
+        self.db = db
+        self.model_utils = default_model_utils
+        self.read_model_utils = trusted_model_utils
+        self.collection = self.db[TeacherModel._collection_name]
+        self.classes = self.db[ClassesModel._collection_name]
+
+    async def get_teacher_by_id(self, _id: Union[str, ObjectId]) -> TeacherModel:
+        try:
+            validated_id = self.model_utils.validate_object_id(_id)
+            result = await self.collection.find_one({"_id": validated_id})
+            if not result:
+                raise ExceptionFactory.not_found(resource_type="Teacher", resource_id=str(_id))
+            return self.read_model_utils.convert_to_response_model(result, TeacherModel)
+        except AppBaseException:
+            raise
+        except Exception as e:
+            raise InternalServerError(message="Unexpected error occurred while fetching teacher", cause=e)
+
+    async def iter_all_classes(self, batch_size: int = 500, fields: Optional[AbstractSet[str]] = None) -> AsyncIterator[ClassesModel]:
+        async for raw_doc in self.classes.find({}, to_projection(fields, ClassesModel)).batch_size(batch_size):
+            model = self.read_model_utils.convert_to_response_model(raw_doc, ClassesModel)
+            if model is not None:
+                yield model
+
+    async def find_classes_by_id(self, class_id: Union[ObjectId, str]) -> ClassesModel:
+        validated_id = self.model_utils.validate_object_id(class_id)
+        try:
+            raw_doc = await self.classes.find_one({"_id": validated_id})
+            if not raw_doc:
+                raise NotFoundError(message=f"Class not found with ID {class_id}", category=ErrorCategory.DATABASE, status_code=404)
+            return self.read_model_utils.convert_to_response_model(raw_doc, ClassesModel)
+        except AppBaseException:
+            raise
+        except Exception as e:
+            raise InternalServerError(message="Unexpected error occurred while finding classes", cause=e, details={"id": class_id}, status_code=500)
@@ -0,0 +1,103 @@
+from typing import AsyncIterator, Dict, List, Optional, AbstractSet, Tuple, Union
+import logging
+from pymongo.asynchronous.database import AsyncDatabase  # type: ignore
+from app.models.user import UserModel
+from app.utils.objectid import ObjectId  # type: ignore
+from app.utils.model_utils import default_model_utils, trusted_model_utils
+from app.utils.projection import to_projection
+from app.utils.cache import cached
+from app.error.exceptions import InternalServerError, ErrorSeverity, ErrorCategory, AppBaseException
+from app.repositories.user_stats_repository import AsyncUserStatsRepository
+from app.repositories.user_repository import (
+    USER_STATS_CACHE,
+    UserDetailResponse,
+    UserGrowthStatsResponse,
+    UserGrowthStateWithComparisonResponse,
+    UserRoleCountsByPeriodResponse,
+    detail_source,
+    growth_comparison,
+    growth_stats,
+    parse_date_range,
+    role_counts,
+    role_counts_for_periods,
+    user_detail,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncUserRepository:
+    """Read-only ``UserRepositoryImpl`` counterpart on ``AsyncMongoClient`` for the ASGI app.
+
+    Same projections, pipelines, response shaping and analytics cache namespace
+    as the sync repository; only the I/O is awaited.
+    """
+
+    def __init__(self, db: AsyncDatabase, stats: Optional[AsyncUserStatsRepository] = None):
+        self.db = db
+        self.model_utils = default_model_utils
+        self.read_model_utils = trusted_model_utils
+        self.collection = self.db[UserModel._collection_name]
+        self.stats = stats or AsyncUserStatsRepository(db)
+
+    def _to_user(self, data: dict) -> Optional[UserModel]:
+        return self.read_model_utils.to_model(data, UserModel)
+
+    async def iter_all_users(self, batch_size: int = 500, fields: Optional[AbstractSet[str]] = None) -> AsyncIterator[UserModel]:
+        """Async counterpart of ``UserRepositoryImpl.iter_all_users``."""
+        async for user_data in self.collection.find({}, to_projection(fields, UserModel)).batch_size(batch_size):
+            user = self._to_user(user_data)
+            if user is not None:
+                yield user
+
+    async def find_user_detail(self, _id: Union[str, ObjectId]) -> UserDetailResponse:
+        """Async counterpart of ``UserRepositoryImpl.find_user_detail``."""
+        obj_id = self.model_utils.validate_object_id(_id)
+        try:
+            user_doc = await self.collection.find_one({"_id": obj_id}, {"role": 1})
+            role, model_cls, collection_name = detail_source(_id, user_doc)
+            return user_detail(_id, role, model_cls, await self.db[collection_name].find_one({"_id": obj_id}))
+        except AppBaseException:
+            raise
+        except Exception as e:
+            raise InternalServerError(message="Failed to find user detail", cause=e, details={"received_value": _id}, status_code=500, severity=ErrorSeverity.HIGH, category=ErrorCategory.DATABASE)
+
+    @cached(USER_STATS_CACHE, "CACHE_TTL_COUNT_BY_ROLE")
+    async def count_users_by_role(self) -> Dict[str, int]:
+        try:
+            return role_counts(await self.stats.role_totals())
+        except Exception as e:
+            raise InternalServerError(message="Failed to count users by role", cause=e, status_code=500, severity=ErrorSeverity.HIGH, category=ErrorCategory.DATABASE)
+
+    @cached(USER_STATS_CACHE, "CACHE_TTL_GROWTH_STATS")
+    async def find_user_growth_stats(self, start_date: str, end_date: str) -> List[UserGrowthStatsResponse]:
+        try:
+            start_dt, end_dt = parse_date_range(start_date, end_date)
+            return growth_stats(await self.stats.daily_totals(start_dt, end_dt))
+        except AppBaseException:
+            raise
+        except Exception as e:
+            raise InternalServerError(message="Failed to find user growth stats", cause=e, details={"received_value": start_date, "end_date": end_date}, status_code=500, severity=ErrorSeverity.HIGH, category=ErrorCategory.DATABASE)
+
+    @cached(USER_STATS_CACHE, "CACHE_TTL_GROWTH_BY_ROLE")
+    async def find_users_growth_stats_by_role_with_comparison(
+        self,
+        current_start_date: str,
+        current_end_date: str,
+        previous_start_date: str,
+        previous_end_date: str
+    ) -> List[UserGrowthStateWithComparisonResponse]:
+        counts_by_role = await self.stats.role_totals_by_period([
+            parse_date_range(current_start_date, current_end_date),
+            parse_date_range(previous_start_date, previous_end_date),
+        ])
+        return growth_comparison(counts_by_role)
+
+    @cached(USER_STATS_CACHE, "CACHE_TTL_GROWTH_BY_ROLE")
+    async def find_user_counts_by_role_for_periods(self, periods: List[Tuple[str, str]]) -> List[UserRoleCountsByPeriodResponse]:
+        date_ranges = [parse_date_range(start, end) for start, end in periods]
+        try:
+            counts_by_role = await self.stats.role_totals_by_period(date_ranges)
+        except Exception as e:
+            raise InternalServerError(message="Failed to count users by role for periods", cause=e, details={"periods": periods}, status_code=500, severity=ErrorSeverity.HIGH, category=ErrorCategory.DATABASE)
+        return role_counts_for_periods(counts_by_role, len(periods))
@@ -0,0 +1,292 @@
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, TypedDict
+from pymongo import ReturnDocument  # type: ignore
+from pymongo.database import Database  # type: ignore
+from pymongo.errors import BulkWriteError  # type: ignore
+from app.database.pipelines.enrollment_pipeline import build_enrollment_counts_pipeline
+from app.enums.status import EnrollmentStatus
+from app.error.exceptions import BadRequestError, DatabaseError, ErrorCategory, ErrorSeverity
+from app.models.classes import ClassesModel
+from app.models.enrollment import EnrollmentModel
+from app.models.student import StudentModel
+from app.utils.cursor import decode_cursor, encode_cursor
+from app.utils.model_utils import trusted_model_utils
+from app.utils.objectid import ObjectId  # type: ignore
+import logging
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY = 11000
+DEFAULT_MAX_STUDENTS = ClassesModel.model_fields["max_students"].default
+# Classes not yet migrated have no counter; their embedded array is what fills seats until then.
+_COUNT = {"$ifNull": ["$enrolled_count", {"$size": {"$ifNull": ["$students_enrolled", []]}}]}
+_CAPACITY = {"$ifNull": ["$max_students", DEFAULT_MAX_STUDENTS]}
+_SEATS_PROJECTION = {"enrolled_count": 1, "max_students": 1, "students_enrolled": 1}
+
+
+class EnrollmentResult(TypedDict):
+    class_id: str
+    student_id: str
+    status: EnrollmentStatus
+
+
+class RosterPage(TypedDict):
+    students: List[Dict[str, Any]]
+    next_cursor: Optional[str]
+
+
+class SchedulePage(TypedDict):
+    classes: List[ClassesModel]
+    next_cursor: Optional[str]
+
+
+def summarize_enrollments(results: List[EnrollmentResult]) -> Dict[str, int]:
+    """``{status: count}`` over bulk enrollment results."""
+    return dict(Counter(result["status"].value for result in results))
+
+
+def _capacity(doc: Dict[str, Any]) -> int:
+    capacity = doc.get("max_students")
+    return DEFAULT_MAX_STUDENTS if capacity is None else capacity
+
+
+def _reserve_seats(requested: int) -> List[Dict[str, Any]]:
+    """Update pipeline: ``enrolled_count += requested``, capped at ``max_students`` and never lowered.
+
+    One stage whatever ``requested`` is, so batch size is bounded only by ``ENROLLMENT_BULK_MAX_ITEMS``.
+    """
+    return [{"$set": {"enrolled_count": {"$max": [_COUNT, {"$min": [_CAPACITY, {"$add": [_COUNT, requested]}]}]}}}]
+
+
+def _seats_taken(doc: Dict[str, Any]) -> int:
+    """``_COUNT`` evaluated on a fetched document."""
+    count = doc.get("enrolled_count")
+    return len(doc.get("students_enrolled") or []) if count is None else count
+
+
+def _granted(before: Dict[str, Any], requested: int) -> int:
+    """Seats ``_reserve_seats(requested)`` handed out, replayed on the pre-update document."""
+    count = _seats_taken(before)
+    return max(count, min(_capacity(before), count + requested)) - count
+
+
+def _as_object_id(value: Any) -> Optional[ObjectId]:
+    if isinstance(value, ObjectId):
+        return value
+    if isinstance(value, str) and ObjectId.is_valid(value):
+        return ObjectId(value)
+    return None
+
+
+def _result(class_id: ObjectId, student_id: ObjectId, status: EnrollmentStatus) -> EnrollmentResult:
+    return EnrollmentResult(class_id=str(class_id), student_id=str(student_id), status=status)
+
+
+class EnrollmentRepository:
+    """Class membership as one ``enrollments`` row per (class, student).
+
+    ``classes.enrolled_count`` is the seat counter that enforces ``max_students``.
+    Seats are reserved on it in one atomic update before any row is written, and
+    a row is deleted before its seat is released, so the counter never exceeds
+    capacity and never undercounts the rows. Re-enrolling is rejected by the
+    unique ``(class_id, student_id)`` index. A class without the counter (not
+    yet migrated) starts from the size of its legacy ``students_enrolled`` array.
+    """
+
+    def __init__(self, db: Database, collection_name: str = EnrollmentModel._collection_name):
+        self.db = db
+        self.collection = self.db[collection_name]
+        self.classes = self.db[ClassesModel._collection_name]
+        self.read_model_utils = trusted_model_utils
+
+    def _insert_rows(self, pairs: List[Tuple[ObjectId, ObjectId]], enrolled_at: datetime) -> Set[int]:
+        """Insert ``(class_id, student_id)`` rows; returns the indexes of pairs that already existed."""
+        if not pairs:
+            return set()
+        docs = [{"class_id": class_id, "student_id": student_id, "enrolled_at": enrolled_at} for class_id, student_id in pairs]
+        try:
+            self.collection.insert_many(docs, ordered=False)
+            return set()
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            failed = [error for error in errors if error.get("code") != DUPLICATE_KEY]
+            if failed:
+                raise DatabaseError(
+                    message="Failed to record enrollments",
+                    details={"errors": failed[:10]},
+                    severity=ErrorSeverity.HIGH,
+                    category=ErrorCategory.DATABASE,
+                    status_code=500,
+                )
+            return {error["index"] for error in errors}
+
+    def _delete_rows(self, class_id: ObjectId, student_ids: List[ObjectId]) -> int:
+        if not student_ids:
+            return 0
+        return self.collection.delete_many({"class_id": class_id, "student_id": {"$in": student_ids}}).deleted_count
+
+    def _class_exists(self, class_id: ObjectId) -> bool:
+        return self.classes.count_documents({"_id": class_id}, limit=1) > 0
+
+    def _enrolled_among(self, class_id: ObjectId, student_ids: List[ObjectId]) -> Set[ObjectId]:
+        """Which of ``student_ids`` already have a row; answered from the ``class_student_unique`` index alone."""
+        rows = self.collection.find({"class_id": class_id, "student_id": {"$in": student_ids}}, {"_id": 0, "student_id": 1})
+        return {row["student_id"] for row in rows}
+
+    def _release_seats(self, class_id: ObjectId, seats: int) -> None:
+        if seats:
+            self.classes.update_one({"_id": class_id}, {"$inc": {"enrolled_count": -seats}})
+
+    def _seat_rows(self, class_id: ObjectId, student_ids: List[ObjectId], enrolled_at: datetime) -> Set[int]:
+        """``_insert_rows`` for students already holding reserved seats.
+
+        If the insert fails, the seats of rows that did not land are released
+        before the error propagates, so a failed write never strands capacity.
+        """
+        try:
+            return self._insert_rows([(class_id, student_id) for student_id in student_ids], enrolled_at)
+        except Exception:
+            landed = self._enrolled_among(class_id, student_ids)
+            self._release_seats(class_id, len(student_ids) - len(landed))
+            raise
+
+    def enroll(self, class_id: ObjectId, student_ids: List[ObjectId]) -> List[EnrollmentResult]:
+        """Enroll ``student_ids`` (in order) while ``class_id`` has seats; one result per student."""
+        statuses: Dict[ObjectId, EnrollmentStatus] = dict.fromkeys(
+            self._enrolled_among(class_id, student_ids), EnrollmentStatus.ALREADY_ENROLLED
+        )
+        candidates = [student_id for student_id in student_ids if student_id not in statuses]
+        if candidates:
+            before = self.classes.find_one_and_update(
+                {"_id": class_id}, _reserve_seats(len(candidates)), projection=_SEATS_PROJECTION, return_document=ReturnDocument.BEFORE
+            )
+            if before is None:
+                return [_result(class_id, student_id, EnrollmentStatus.CLASS_NOT_FOUND) for student_id in student_ids]
+            granted = _granted(before, len(candidates))
+            seated = candidates[:granted]
+            # A concurrent request may have enrolled the same student since the check above.
+            raced = self._seat_rows(class_id, seated, datetime.now(timezone.utc))
+            self._release_seats(class_id, len(raced))
+            for i, student_id in enumerate(seated):
+                statuses[student_id] = EnrollmentStatus.ALREADY_ENROLLED if i in raced else EnrollmentStatus.ENROLLED
+            statuses.update(dict.fromkeys(candidates[granted:], EnrollmentStatus.CLASS_FULL))
+        return [_result(class_id, student_id, statuses[student_id]) for student_id in student_ids]
+
+    def unenroll(self, class_id: ObjectId, student_ids: List[ObjectId]) -> List[EnrollmentResult]:
+        rows = list(self.collection.find({"class_id": class_id, "student_id": {"$in": student_ids}}, {"student_id": 1}))
+        if not rows and not self._class_exists(class_id):
+            return [_result(class_id, student_id, EnrollmentStatus.CLASS_NOT_FOUND) for student_id in student_ids]
+        if rows:
+            deleted = self.collection.delete_many({"_id": {"$in": [row["_id"] for row in rows]}}).deleted_count
+            if deleted:
+                self.classes.update_one({"_id": class_id}, {"$inc": {"enrolled_count": -deleted}})
+        removed = {row["student_id"] for row in rows}
+        return [
+            _result(class_id, student_id, EnrollmentStatus.UNENROLLED if student_id in removed else EnrollmentStatus.NOT_ENROLLED)
+            for student_id in student_ids
+        ]
+
+    def enroll_one(self, class_id: ObjectId, student_id: ObjectId) -> Tuple[EnrollmentStatus, Optional[Dict[str, Any]]]:
+        """Single enrollment; also returns the class document when the class exists and has the student."""
+        if self.is_enrolled(class_id, student_id):
+            return EnrollmentStatus.ALREADY_ENROLLED, self.classes.find_one({"_id": class_id})
+        class_doc = self.classes.find_one_and_update(
+            {"_id": class_id, "$expr": {"$lt": [_COUNT, _CAPACITY]}},
+            [{"$set": {"enrolled_count": {"$add": [_COUNT, 1]}}}],
+            return_document=ReturnDocument.AFTER,
+        )
+        if class_doc is None:
+            return (EnrollmentStatus.CLASS_FULL if self._class_exists(class_id) else EnrollmentStatus.CLASS_NOT_FOUND), None
+        if self._seat_rows(class_id, [student_id], datetime.now(timezone.utc)):
+            self._release_seats(class_id, 1)
+            class_doc["enrolled_count"] -= 1
+            return EnrollmentStatus.ALREADY_ENROLLED, class_doc
+        return EnrollmentStatus.ENROLLED, class_doc
+
+    def unenroll_one(self, class_id: ObjectId, student_id: ObjectId) -> Optional[Dict[str, Any]]:
+        """Remove one enrollment; returns the class document after the update, None when the class is gone."""
+        deleted = self._delete_rows(class_id, [student_id])
+        if not deleted:
+            return self.classes.find_one({"_id": class_id})
+        return self.classes.find_one_and_update(
+            {"_id": class_id}, {"$inc": {"enrolled_count": -deleted}}, return_document=ReturnDocument.AFTER
+        )
+
+    def is_enrolled(self, class_id: ObjectId, student_id: ObjectId) -> bool:
+        return self.collection.find_one({"class_id": class_id, "student_id": student_id}, {"_id": 1}) is not None
+
+    def _page(self, key: str, value: ObjectId, sort_field: str, page_size: int, cursor: Optional[str]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Keyset page over one side of a compound index, ``page_size + 1`` rows to detect a next page."""
+        query: Dict[str, Any] = {key: value}
+        if cursor:
+            values = decode_cursor(cursor)
+            if sort_field not in values:
+                raise BadRequestError(message="Invalid pagination cursor", details={"cursor": cursor}, user_message="The pagination cursor is invalid. Please restart from the first page.")
+            query[sort_field] = {"$gt": values[sort_field]}
+        rows = list(
+            self.collection.find(query, {"_id": 0, sort_field: 1, "enrolled_at": 1}).sort(sort_field, 1).limit(page_size + 1)
+        )
+        next_cursor = encode_cursor({sort_field: rows[page_size - 1][sort_field]}) if len(rows) > page_size else None
+        return rows[:page_size], next_cursor
+
+    def roster(self, class_id: ObjectId, page_size: int, cursor: Optional[str] = None) -> RosterPage:
+        """Students of a class ordered by ID, served from ``class_student_unique``."""
+        rows, next_cursor = self._page("class_id", class_id, "student_id", page_size, cursor)
+        return RosterPage(students=rows, next_cursor=next_cursor)
+
+    def schedule(self, student_id: ObjectId, page_size: int, cursor: Optional[str] = None) -> SchedulePage:
+        """A student's classes ordered by ID: one page of ``student_class`` plus one ``$in`` read of the classes."""
+        rows, next_cursor = self._page("student_id", student_id, "class_id", page_size, cursor)
+        class_ids = [row["class_id"] for row in rows]
+        docs = {doc["_id"]: doc for doc in self.classes.find({"_id": {"$in": class_ids}})} if class_ids else {}
+        classes = self.read_model_utils.convert_to_response_model_list(
+            [docs[class_id] for class_id in class_ids if class_id in docs], ClassesModel
+        )
+        return SchedulePage(classes=classes, next_cursor=next_cursor)
+
+    def _embedded_pairs(self, batch_size: int) -> Iterator[Tuple[ObjectId, ObjectId]]:
+        for doc in self.classes.find({"students_enrolled": {"$exists": True}}, {"students_enrolled": 1}).batch_size(batch_size):
+            for student_id in doc.get("students_enrolled") or []:
+                yield doc["_id"], _as_object_id(student_id)
+        students = self.db[StudentModel._collection_name]
+        for doc in students.find({"student_info.class_ids": {"$exists": True}}, {"student_info.class_ids": 1}).batch_size(batch_size):
+            for class_id in (doc.get("student_info") or {}).get("class_ids") or []:
+                yield _as_object_id(class_id), doc["_id"]
+
+    def migrate_embedded(self, batch_size: int = 1000) -> Dict[str, int]:
+        """Move ``classes.students_enrolled`` and ``student_info.class_ids`` into ``enrollments``.
+
+        Zeroes ``enrolled_count`` on every class, sets it from the rows for classes
+        that have any, then drops the arrays; run it while enrollment is paused.
+        Re-running is safe: existing rows are skipped by the unique index.
+        """
+        migrated_at = datetime.now(timezone.utc)
+        inserted = skipped = 0
+        batch: List[Tuple[ObjectId, ObjectId]] = []
+
+        def flush() -> int:
+            existing = self._insert_rows(batch, migrated_at)
+            return len(batch) - len(existing)
+
+        for class_id, student_id in self._embedded_pairs(batch_size):
+            if class_id is None or student_id is None:
+                skipped += 1
+                continue
+            batch.append((class_id, student_id))
+            if len(batch) >= batch_size:
+                inserted += flush()
+                batch = []
+        inserted += flush()
+
+        counted = 0
+        self.classes.update_many({}, {"$set": {"enrolled_count": 0}})
+        for entry in self.collection.aggregate(build_enrollment_counts_pipeline()):
+            counted += self.classes.update_one({"_id": entry["_id"]}, {"$set": {"enrolled_count": entry["count"]}}).matched_count
+        self.classes.update_many({"students_enrolled": {"$exists": True}}, {"$unset": {"students_enrolled": ""}})
+        self.db[StudentModel._collection_name].update_many(
+            {"student_info.class_ids": {"$exists": True}}, {"$unset": {"student_info.class_ids": ""}}
+        )
+        logger.info("Enrollments migrated: %d rows inserted, %d invalid IDs skipped, %d classes counted", inserted, skipped, counted)
+        return {"inserted": inserted, "skipped": skipped, "classes": counted}
+
@@ -2,16 +2,22 @@ from app.models.user import UserModel, Role
 from app.models.student import StudentModel
 from app.models.teacher import TeacherModel
 from app.utils.objectid import ObjectId # type: ignore
-from typing import  Optional, List, Dict, Union, Tuple, Type,TypedDict, Any
+from typing import  Optional, List, Dict, Union, Tuple, Type,TypedDict, Any, Iterator, AbstractSet
 from pydantic import BaseModel
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 import logging
-from app.utils.model_utils import default_model_utils
+from app.utils.model_utils import default_model_utils, trusted_model_utils
 from app.error.exceptions import NotFoundError, ValidationError as CustomValidationError, BadRequestError, InternalServerError, ErrorSeverity, ErrorCategory, AppBaseException
-from app.database.pipelines.user_pipeline import users_growth_by_role_pipeline, build_user_detail_pipeline, build_user_growth_stats_pipeline, build_search_user_pipeline, build_role_counts_pipeline
+from app.database.pipelines.user_pipeline import build_search_user_pipeline, USER_SEARCH_SORT_FIELD
+from app.database.pipelines.user_search_pipeline import build_user_search_index_pipeline, USER_SEARCH_SCORE_FIELD
+from app.repositories.user_search_repository import UserSearchIndex, normalize, query_grams
+from app.repositories.user_stats_repository import UserStatsRepository
+from app.utils.cache import cached, analytics_cache
+from app.utils.events import events, USER_CREATED, USER_DELETED, USERS_IMPORTED
 from pymongo.database import Database # type: ignore
-from app.utils.convert import convert_objectid_to_str
+from app.utils.cursor import encode_cursor, decode_cursor
+from app.utils.projection import to_projection
 
 class UserDetailResponse(TypedDict):
     role: str
@@ -22,6 +28,14 @@ class UserGrowthStatsResponse(TypedDict):
     count: int
     percentage: float
 
+class UserSearchPage(TypedDict):
+    users: List[UserModel]
+    next_cursor: Optional[str]
+
+class UserRoleCountsByPeriodResponse(TypedDict):
+    role: str
+    counts: List[int]
+
 class UserGrowthStateWithComparisonResponse(TypedDict):
     role: str
     previous: int
@@ -30,6 +44,122 @@ class UserGrowthStateWithComparisonResponse(TypedDict):
 
 logger = logging.getLogger(__name__)
 
+USER_STATS_CACHE = "user_stats"
+
+
+def _invalidate_user_stats(**_payload) -> None:
+    analytics_cache.invalidate(USER_STATS_CACHE)
+
+
+# Only creation and deletion move the counts; role and created_at are not patchable.
+events.subscribe(USER_CREATED, _invalidate_user_stats)
+events.subscribe(USER_DELETED, _invalidate_user_stats)
+events.subscribe(USERS_IMPORTED, _invalidate_user_stats)
+
+
+# Response shaping shared by the sync repository and the async read repository.
+def parse_date_range(start: str, end: str) -> Tuple[datetime, datetime]:
+    start_dt = datetime.strptime(start, "%Y-%m-%d")
+    end_dt = datetime.strptime(end, "%Y-%m-%d") + timedelta(days=1) - timedelta(milliseconds=1)
+    return start_dt, end_dt
+
+
+def role_counts(role_totals: Dict[str, int]) -> Dict[str, int]:
+    counts = {role.value: 0 for role in Role}
+    for role, count in role_totals.items():
+        if role in counts:
+            counts[role] = count
+    return counts
+
+
+def growth_stats(daily_counts: List[Tuple[datetime, int]]) -> List[UserGrowthStatsResponse]:
+    total_count = sum(count for _, count in daily_counts)
+    stats = []
+    for day, count in daily_counts:
+        percent = (count / total_count * 100) if total_count > 0 else 0
+        stats.append({
+            "date": day.strftime("%Y-%m-%d"),
+            "count": count,
+            "percentage": round(percent, 2)
+        })
+    return stats
+
+
+def growth_comparison(counts_by_role: Dict[str, List[int]]) -> List[UserGrowthStateWithComparisonResponse]:
+    """``counts_by_role`` holds ``[current, previous]`` per role."""
+    current_counts = {role: counts[0] for role, counts in counts_by_role.items() if counts[0]}
+    previous_counts = {role: counts[1] for role, counts in counts_by_role.items() if counts[1]}
+
+    all_roles = set(current_counts.keys()) | set(previous_counts.keys())
+    growth_stats = []
+
+    for role in all_roles:
+        current = current_counts.get(role, 0)
+        previous = previous_counts.get(role, 0)
+
+        if previous == 0:
+            growth = 100.0 * current if current > 0 else 0.0
+        else:
+            growth = ((current - previous) / previous) * 100
+
+        growth_stats.append(UserGrowthStateWithComparisonResponse(role=role, previous=previous, current=current, growth_percentage=round(growth, 2)))
+
+    return growth_stats
+
+
+def role_counts_for_periods(counts_by_role: Dict[str, List[int]], period_count: int) -> List[UserRoleCountsByPeriodResponse]:
+    zeros = [0] * period_count
+    return [
+        UserRoleCountsByPeriodResponse(role=role.value, counts=counts_by_role.get(role.value, zeros))
+        for role in Role
+    ]
+
+
+def role_model_map() -> Dict[str, Tuple[Type[BaseModel], str]]:
+    return {
+        Role.TEACHER.value: (TeacherModel, TeacherModel._collection_name),
+        Role.STUDENT.value: (StudentModel, StudentModel._collection_name),
+        Role.ADMIN.value: (UserModel, UserModel._collection_name)
+    }
+
+
+def detail_source(_id: Union[str, ObjectId], user_doc: Optional[Dict[str, Any]]) -> Tuple[str, Type[BaseModel], str]:
+    """``(role, model_cls, collection_name)`` for the user's role document."""
+    if not user_doc:
+        raise NotFoundError(
+            message="User detail not found",
+            details={"received_value": _id},
+            status_code=404,
+            severity=ErrorSeverity.LOW,
+            category=ErrorCategory.DATABASE,
+        )
+
+    role = user_doc.get("role")
+    role_map = role_model_map()
+    if role not in role_map:
+        raise NotFoundError(
+            message="Role not found",
+            details={"role": role},
+            status_code=404,
+            severity=ErrorSeverity.LOW,
+            category=ErrorCategory.DATABASE,
+        )
+    model_cls, collection_name = role_map[role]
+    return role, model_cls, collection_name
+
+
+def user_detail(_id: Union[str, ObjectId], role: str, model_cls: Type[BaseModel], role_data_raw: Optional[Dict[str, Any]]) -> UserDetailResponse:
+    if not role_data_raw:
+        raise NotFoundError(
+            message=f"{role.capitalize()} data not found",
+            details={"received_value": _id},
+            status_code=404,
+            severity=ErrorSeverity.LOW,
+            category=ErrorCategory.DATABASE,
+        )
+    role_dump = model_cls(**role_data_raw).model_dump(by_alias=True, exclude_none=True, exclude={"password"}, mode="json")
+    return UserDetailResponse(role=role, data=role_dump)
+
 class UserRepository(ABC):
     @abstractmethod
     def find_user_by_username(self, username: str) -> Optional[UserModel]:
@@ -45,18 +175,21 @@ class UserRepository(ABC):
     
     
 class UserRepositoryImpl(UserRepository):
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, search_index: Optional[UserSearchIndex] = None, stats: Optional[UserStatsRepository] = None):
         self.db = db
         self.model_utils = default_model_utils
+        self.read_model_utils = trusted_model_utils
         self.collection = self.db[UserModel._collection_name]
+        self.search_index = search_index or UserSearchIndex(db)
+        self.stats = stats or UserStatsRepository(db)
         self._student_service = None
         self._teacher_service = None
     
     def _to_user(self, data: dict) -> Optional[UserModel]:
-        return self.model_utils.to_model(data, UserModel)
+        return self.read_model_utils.to_model(data, UserModel)
     
     def _to_users(self, data_list: List[dict]) -> List[UserModel]:
-        return self.model_utils.to_model_list(data_list, UserModel)
+        return self.read_model_utils.to_model_list(data_list, UserModel)
 
 
     def _validate_object_id(self, _id: Union[str, ObjectId]) -> ObjectId:
@@ -65,19 +198,28 @@ class UserRepositoryImpl(UserRepository):
     
 
     def role_model_map(self) -> Dict[str, Tuple[Type[BaseModel], str]]:
-        return {
-            Role.TEACHER.value: (TeacherModel, TeacherModel._collection_name),
-            Role.STUDENT.value: (StudentModel, StudentModel._collection_name),
-            Role.ADMIN.value: (UserModel, UserModel._collection_name)
-        }
-    @staticmethod
-    def _parse_date_range( start: str, end: str) -> Tuple[datetime, datetime]:
-            start_dt = datetime.strptime(start, "%Y-%m-%d")
-            end_dt = datetime.strptime(end, "%Y-%m-%d") + timedelta(days=1) - timedelta(milliseconds=1)
-            return start_dt, end_dt
-
-    def _convert_objectid_to_str(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        return convert_objectid_to_str(data)
+        return role_model_map()
+
+    _parse_date_range = staticmethod(parse_date_range)
+
+    def _hydrate_role_data(self, users: List[Dict[str, Any]]) -> None:
+        """Attach each user's role document under the role collection name,
+        with one ``$in`` query per role for the whole page."""
+        ids_by_role: Dict[str, List[ObjectId]] = {}
+        for user in users:
+            ids_by_role.setdefault(user.get("role"), []).append(user["_id"])
+        role_map = self.role_model_map()
+        for role, ids in ids_by_role.items():
+            if role not in role_map:
+                continue
+            _, collection_name = role_map[role]
+            if collection_name == UserModel._collection_name:
+                continue
+            role_docs = {doc["_id"]: doc for doc in self.db[collection_name].find({"_id": {"$in": ids}})}
+            for user in users:
+                role_doc = role_docs.get(user["_id"])
+                if role_doc is not None:
+                    user[collection_name] = role_doc
 
     def find_user_by_username(self, username: str) -> Optional[UserModel]:
         try:
@@ -142,24 +284,56 @@ class UserRepositoryImpl(UserRepository):
             users_list = list(users_cursor)
             return self._to_users(users_list)
         except Exception as e:
-            logger.error(f"Failed to fetch all users: {e}")
+            logger.error("Failed to fetch all users: %s", e)
             raise InternalServerError(f"Failed to fetch all users: {e}")
         
         
-    def search_user(self, query: str, page: int, page_size: int) -> List[UserModel]:
-        """Search for users by username or email
+    def iter_all_users(self, batch_size: int = 500, fields: Optional[AbstractSet[str]] = None) -> Iterator[UserModel]:
+        """Iterate all users without loading the collection; password hashes are never read.
+        @param batch_size: int documents per getMore
+        @param fields: Optional[AbstractSet[str]] model fields to fetch (see parse_fields); None for all
+        @return: Iterator[UserModel]
+        """
+        for user_data in self.collection.find({}, to_projection(fields, UserModel)).batch_size(batch_size):
+            user = self._to_user(user_data)
+            if user is not None:
+                yield user
+
+    def search_user(self, query: str, page_size: int, cursor: Optional[str] = None) -> UserSearchPage:
+        """Search for users by username or email through the search index, best match first.
+        A blank query lists users newest first.
         @param query: str
-        @param page: int
         @param page_size: int
-        @return: List[UserModel]
+        @param cursor: Optional[str] opaque token returned as next_cursor by the previous page
+        @return: UserSearchPage
+        @throws: BadRequestError
         @throws: InternalServerError
         """
+        normalized = normalize(query)
+        sort_field = USER_SEARCH_SCORE_FIELD if normalized else USER_SEARCH_SORT_FIELD
+        cursor_values = decode_cursor(cursor) if cursor else None
+        if cursor_values is not None and not {sort_field, "_id"} <= cursor_values.keys():
+            raise BadRequestError(message="Invalid pagination cursor", details={"cursor": cursor}, user_message="The pagination cursor is invalid. Please restart the search.")
         try:
-            pipeline = build_search_user_pipeline(query, page, page_size)
-            users_cursor = self.db.users.aggregate(pipeline)
-            users_list = list(users_cursor)
-            return self._to_users(users_list)
-        except CustomValidationError as e:
+            if normalized:
+                pipeline = build_user_search_index_pipeline(
+                    normalized, query_grams(normalized), page_size, UserModel._collection_name, cursor_values
+                )
+                users_list = list(self.search_index.collection.aggregate(pipeline))
+            else:
+                pipeline = build_search_user_pipeline(page_size, cursor_values)
+                users_list = list(self.collection.aggregate(pipeline))
+            next_cursor = None
+            if len(users_list) > page_size:
+                users_list = users_list[:page_size]
+                last = users_list[-1]
+                sort_value = last.get("_search_score") if normalized else last.get(USER_SEARCH_SORT_FIELD)
+                next_cursor = encode_cursor({sort_field: sort_value, "_id": last["_id"]})
+            for user in users_list:
+                user.pop("_search_score", None)
+            self._hydrate_role_data(users_list)
+            return UserSearchPage(users=self._to_users(users_list), next_cursor=next_cursor)
+        except (CustomValidationError, BadRequestError) as e:
             raise e
         except Exception as e:
             raise InternalServerError(f"Failed to search users: {e}")
@@ -179,7 +353,7 @@ class UserRepositoryImpl(UserRepository):
                 return self._to_user(user_data)
             return None
         except Exception as e:
-            logger.error(f"Failed to find user by email {email}: {e}")
+            logger.error("Failed to find user by email %s: %s", email, e)
             raise InternalServerError(f"Failed to find user by email {email}: {e}")
           
     
@@ -196,58 +370,21 @@ class UserRepositoryImpl(UserRepository):
             raw_users = list(users_cursor)
             return self._to_users(raw_users)
         except Exception as e:
-            logger.error(f"Failed to find users by role {role}: {e}")
+            logger.error("Failed to find users by role %s: %s", role, e)
             raise InternalServerError(f"Failed to find users by role {role}: {e}")
 
         
         
         
     def find_user_detail(self, _id: Union[str, ObjectId]) -> UserDetailResponse:
-        """Find user's role-specific detail and include role in response"""
+        """Find user's role-specific detail and include role in response.
+        Reads the role first so only that role's collection is queried."""
         obj_id = self._validate_object_id(_id)
-        pipeline = build_user_detail_pipeline(obj_id)
         
         try:
-            data = list(self.collection.aggregate(pipeline))
-            if not data:
-                raise NotFoundError(
-                    message="User detail not found",
-                    details={"received_value": _id},
-                    status_code=404,
-                    severity=ErrorSeverity.LOW,
-                    category=ErrorCategory.DATABASE,
-                )
-
-            user_doc = data[0]
-            user = UserModel.model_validate(user_doc)
-
-            role_map = self.role_model_map()
-            if user.role not in role_map:
-                raise NotFoundError(
-                    message="Role not found",
-                    details={"role": user.role},
-                    status_code=404,
-                    severity=ErrorSeverity.LOW,
-                    category=ErrorCategory.DATABASE,
-                )
-
-            model_cls, collection_name = role_map[user.role]
-
-            role_data_raw = user_doc.get(collection_name)
-            if not role_data_raw:
-                raise NotFoundError(
-                    message=f"{user.role.capitalize()} data not found",
-                    details={"received_value": _id},
-                    status_code=404,
-                    severity=ErrorSeverity.LOW,
-                    category=ErrorCategory.DATABASE,
-                )
-
-            role_model = model_cls(**role_data_raw)
-            role_dump = role_model.model_dump(by_alias=True, exclude_none=True, mode="json")
-            cleaned_data = self._convert_objectid_to_str(role_dump)
-
-            return UserDetailResponse(role=user.role, data=cleaned_data)
+            user_doc = self.collection.find_one({"_id": obj_id}, {"role": 1})
+            role, model_cls, collection_name = detail_source(_id, user_doc)
+            return user_detail(_id, role, model_cls, self.db[collection_name].find_one({"_id": obj_id}))
 
         except AppBaseException:
             raise
@@ -261,44 +398,20 @@ class UserRepositoryImpl(UserRepository):
                 category=ErrorCategory.DATABASE,
             )
 
+    @cached(USER_STATS_CACHE, "CACHE_TTL_COUNT_BY_ROLE")
     def count_users_by_role(self) -> Dict[str, int]:
         try:
-            pipeline = [
-                {"$group": {"_id": "$role", "count": {"$sum": 1}}}
-            ]
-            result = self.collection.aggregate(pipeline)
-            counts = {role.value: 0 for role in Role}
-            for r in result:
-                if r["_id"] in counts:
-                    counts[r["_id"]] = r["count"]      
-            return counts
-            
+            return role_counts(self.stats.role_totals())
         except Exception as e:
-            logger.error(f"Failed to count users by roles: {e}")
-            return {} 
+            raise InternalServerError(message="Failed to count users by role", cause=e, status_code=500, severity=ErrorSeverity.HIGH, category=ErrorCategory.DATABASE)
 
 
 
+    @cached(USER_STATS_CACHE, "CACHE_TTL_GROWTH_STATS")
     def find_user_growth_stats(self, start_date: str, end_date: str) -> List[UserGrowthStatsResponse]:
         try:
-            pipeline = build_user_growth_stats_pipeline(start_date, end_date)
-            result = list(self.collection.aggregate(pipeline))
-            if not result or ("dailyCounts" not in result[0] and "totalCount" not in result[0]):
-                return []
-
-            daily_counts = result[0].get("dailyCounts", [])
-            total_count = result[0].get("totalCount", [{}])[0].get("total", 0)
-
-            stats = []
-            for entry in daily_counts:
-                percent = (entry["count"] / total_count * 100) if total_count > 0 else 0
-                stats.append({
-                    "date": entry["_id"],
-                    "count": entry["count"],
-                    "percentage": round(percent, 2)
-                })
-
-            return stats
+            start_dt, end_dt = self._parse_date_range(start_date, end_date)
+            return growth_stats(self.stats.daily_totals(start_dt, end_dt))
         except AppBaseException:
             raise 
         except Exception as e:
@@ -307,6 +420,7 @@ class UserRepositoryImpl(UserRepository):
 
 
 
+    @cached(USER_STATS_CACHE, "CACHE_TTL_GROWTH_BY_ROLE")
     def find_users_growth_stats_by_role_with_comparison(
         self,
         current_start_date: str,
@@ -320,26 +434,20 @@ class UserRepositoryImpl(UserRepository):
         current_start_dt, current_end_dt = self._parse_date_range(current_start_date, current_end_date)
         previous_start_dt, previous_end_dt = self._parse_date_range(previous_start_date, previous_end_date)
 
-        def get_role_counts(start_dt: datetime, end_dt: datetime) -> Dict[str, int]:
-            pipeline = build_role_counts_pipeline(start_dt, end_dt)
-            results = list(self.collection.aggregate(pipeline))
-            return {entry["_id"]: entry["count"] for entry in results}
-
-        current_counts = get_role_counts(current_start_dt, current_end_dt)
-        previous_counts = get_role_counts(previous_start_dt, previous_end_dt)
-
-        all_roles = set(current_counts.keys()) | set(previous_counts.keys())
-        growth_stats = []
-
-        for role in all_roles:
-            current = current_counts.get(role, 0)
-            previous = previous_counts.get(role, 0)
-
-            if previous == 0:
-                growth = 100.0 * current if current > 0 else 0.0
-            else:
-                growth = ((current - previous) / previous) * 100
+        counts_by_role = self.stats.role_totals_by_period([
+            (current_start_dt, current_end_dt),
+            (previous_start_dt, previous_end_dt),
+        ])
+        return growth_comparison(counts_by_role)
 
-            growth_stats.append(UserGrowthStateWithComparisonResponse(role=role, previous=previous, current=current, growth_percentage=round(growth, 2)))
-
-        return growth_stats
\ No newline at end of file
+    @cached(USER_STATS_CACHE, "CACHE_TTL_GROWTH_BY_ROLE")
+    def find_user_counts_by_role_for_periods(self, periods: List[Tuple[str, str]]) -> List[UserRoleCountsByPeriodResponse]:
+        """
+        Count new users per role for each ``(start_date, end_date)`` period in one round trip.
+        """
+        date_ranges = [self._parse_date_range(start, end) for start, end in periods]
+        try:
+            counts_by_role = self.stats.role_totals_by_period(date_ranges)
+        except Exception as e:
+            raise InternalServerError(message="Failed to count users by role for periods", cause=e, details={"periods": periods}, status_code=500, severity=ErrorSeverity.HIGH, category=ErrorCategory.DATABASE)
+        return role_counts_for_periods(counts_by_role, len(periods))
@@ -0,0 +1,115 @@
+import re
+import unicodedata
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
+from pymongo import ReplaceOne  # type: ignore
+from pymongo.database import Database  # type: ignore
+from app.models.user import UserModel
+from app.models.user_search import UserSearchEntryModel
+from app.utils.objectid import ObjectId  # type: ignore
+import logging
+
+logger = logging.getLogger(__name__)
+
+GRAM_SIZE = 3
+PREFIX_MARKER = "^"
+_WORD_SPLIT = re.compile(r"[^\w]+")
+
+
+def normalize(value: Optional[str]) -> str:
+    if not value:
+        return ""
+    return unicodedata.normalize("NFKC", value).casefold().strip()
+
+
+def _trigrams(value: str) -> Set[str]:
+    return {value[i:i + GRAM_SIZE] for i in range(len(value) - GRAM_SIZE + 1)}
+
+
+def _word_prefixes(value: str) -> Set[str]:
+    # Anchored 1-2 character prefixes so short queries still hit the index.
+    prefixes: Set[str] = set()
+    for word in filter(None, _WORD_SPLIT.split(value)):
+        for size in range(1, GRAM_SIZE):
+            if len(word) >= size:
+                prefixes.add(PREFIX_MARKER + word[:size])
+    return prefixes
+
+
+def document_grams(*values: str) -> List[str]:
+    grams: Set[str] = set()
+    for value in values:
+        if value:
+            grams |= _trigrams(value)
+            grams |= _word_prefixes(value)
+    return sorted(grams)
+
+
+def query_grams(query: str) -> List[str]:
+    """Grams every matching document must contain; empty when the query is blank."""
+    if len(query) >= GRAM_SIZE:
+        return sorted(_trigrams(query))
+    if query:
+        return [PREFIX_MARKER + query]
+    return []
+
+
+class UserSearchIndex:
+    """Side collection of normalized username/email grams, kept in step with ``users``."""
+
+    def __init__(self, db: Database, collection_name: str = UserSearchEntryModel._collection_name):
+        self.db = db
+        self.collection = self.db[collection_name]
+
+    @staticmethod
+    def build_entry(user: Dict[str, Any], indexed_at: Optional[datetime] = None) -> Dict[str, Any]:
+        username_lc = normalize(user.get("username"))
+        email_lc = normalize(user.get("email"))
+        return {
+            "_id": user["_id"],
+            "username_lc": username_lc,
+            "email_lc": email_lc,
+            "grams": document_grams(username_lc, email_lc),
+            "created_at": user.get("created_at"),
+            "indexed_at": indexed_at or datetime.now(timezone.utc),
+        }
+
+    def index_user(self, user: Dict[str, Any], session=None) -> None:
+        entry = self.build_entry(user)
+        self.collection.replace_one({"_id": entry["_id"]}, entry, upsert=True, session=session)
+
+    def remove_user(self, _id: Union[str, ObjectId], session=None) -> None:
+        self.collection.delete_one({"_id": ObjectId(_id) if isinstance(_id, str) else _id}, session=session)
+
+    def index_many(self, users: Iterable[Dict[str, Any]], indexed_at: Optional[datetime] = None, session=None) -> int:
+        ops = [ReplaceOne({"_id": user["_id"]}, self.build_entry(user, indexed_at), upsert=True) for user in users]
+        if not ops:
+            return 0
+        self.collection.bulk_write(ops, ordered=False, session=session)
+        return len(ops)
+
+    def rebuild(self, batch_size: int = 1000) -> int:
+        """Re-index every user, then drop entries for users that no longer exist."""
+        started_at = datetime.now(timezone.utc)
+        users = self.db[UserModel._collection_name].find(
+            {}, {"username": 1, "email": 1, "created_at": 1}
+        ).batch_size(batch_size)
+        total = 0
+        batch: List[Dict[str, Any]] = []
+        for user in users:
+            batch.append(user)
+            if len(batch) >= batch_size:
+                total += self.index_many(batch, started_at)
+                batch = []
+        total += self.index_many(batch, started_at)
+        removed = self.collection.delete_many({"indexed_at": {"$lt": started_at}}).deleted_count
+        logger.info("User search index rebuilt: %d indexed, %d stale removed", total, removed)
+        return total
+
+    def rebuild_if_empty(self, batch_size: int = 1000) -> Optional[int]:
+        """Build the index on first start against a database that already has users."""
+        if self.collection.find_one({}, {"_id": 1}) is not None:
+            return None
+        if self.db[UserModel._collection_name].find_one({}, {"_id": 1}) is None:
+            return None
+        return self.rebuild(batch_size=batch_size)
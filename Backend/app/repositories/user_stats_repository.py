@@ -0,0 +1,132 @@
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from pymongo import UpdateOne  # type: ignore
+from pymongo.database import Database  # type: ignore
+from app.models.user import UserModel
+from app.models.user_stats import UserStatsDailyModel
+from app.database.pipelines.user_stats_pipeline import (
+    build_daily_totals_pipeline,
+    build_role_totals_pipeline,
+    build_role_totals_by_period_pipeline,
+    period_key,
+    build_user_stats_rebuild_pipeline,
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def to_utc_day(value: datetime) -> datetime:
+    """Naive UTC midnight of ``value``; rollup rows are keyed by this."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return datetime(value.year, value.month, value.day)
+
+
+def _daily_totals(entries: Iterable[Dict[str, Any]]) -> List[Tuple[datetime, int]]:
+    return [(entry["_id"], entry["count"]) for entry in entries]
+
+
+def _role_totals(entries: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    return {entry["_id"]: entry["count"] for entry in entries}
+
+
+def _role_totals_by_period(entries: Iterable[Dict[str, Any]], period_count: int) -> Dict[str, List[int]]:
+    return {entry["_id"]: [entry.get(period_key(i), 0) for i in range(period_count)] for entry in entries}
+
+
+class UserStatsRepository:
+    """Maintains and reads the ``user_stats_daily`` rollup.
+
+    Writes are single ``$inc`` upserts, so dashboard reads cost O(days x roles)
+    instead of a scan over ``users``.
+    """
+
+    def __init__(self, db: Database, collection_name: str = UserStatsDailyModel._collection_name):
+        self.db = db
+        self.collection = self.db[collection_name]
+
+    def record(self, role: str, created_at: datetime, delta: int, session=None) -> None:
+        self.collection.update_one(
+            {"date": to_utc_day(created_at), "role": role},
+            {"$inc": {"count": delta}, "$set": {"updated_at": datetime.now(timezone.utc)}},
+            upsert=True,
+            session=session,
+        )
+
+    def record_created(self, role: str, created_at: datetime, session=None) -> None:
+        self.record(role, created_at, 1, session=session)
+
+    def record_many(self, created: Iterable[Tuple[str, datetime]], session=None) -> int:
+        """Apply a batch of ``(role, created_at)`` creations as one ``$inc`` per (day, role)."""
+        counts = Counter((role, to_utc_day(created_at)) for role, created_at in created)
+        if not counts:
+            return 0
+        now = datetime.now(timezone.utc)
+        ops = [
+            UpdateOne({"date": day, "role": role}, {"$inc": {"count": count}, "$set": {"updated_at": now}}, upsert=True)
+            for (role, day), count in counts.items()
+        ]
+        self.collection.bulk_write(ops, ordered=False, session=session)
+        return len(ops)
+
+    def record_deleted(self, role: str, created_at: Optional[datetime], session=None) -> None:
+        if created_at is None:
+            return
+        self.record(role, created_at, -1, session=session)
+
+    def rebuild(self) -> int:
+        """Recompute every row from ``users`` and drop rows for days that no longer have users."""
+        rebuilt_at = datetime.now(timezone.utc)
+        pipeline = build_user_stats_rebuild_pipeline(self.collection.name, rebuilt_at)
+        self.db[UserModel._collection_name].aggregate(pipeline)
+        removed = self.collection.delete_many({"updated_at": {"$lt": rebuilt_at}}).deleted_count
+        total = self.collection.count_documents({})
+        logger.info("User stats rollup rebuilt: %d rows, %d stale removed", total, removed)
+        return total
+
+    def rebuild_if_empty(self) -> Optional[int]:
+        """Build the rollup on first start against a database that already has users."""
+        if self.collection.find_one({}, {"_id": 1}) is not None:
+            return None
+        if self.db[UserModel._collection_name].find_one({}, {"_id": 1}) is None:
+            return None
+        return self.rebuild()
+
+    def daily_totals(self, start_dt: datetime, end_dt: datetime) -> List[Tuple[datetime, int]]:
+        return _daily_totals(self.collection.aggregate(build_daily_totals_pipeline(start_dt, end_dt)))
+
+    def role_totals(self, start_dt: Optional[datetime] = None, end_dt: Optional[datetime] = None) -> Dict[str, int]:
+        return _role_totals(self.collection.aggregate(build_role_totals_pipeline(start_dt, end_dt)))
+
+    def role_totals_by_period(self, periods: Sequence[Tuple[datetime, datetime]]) -> Dict[str, List[int]]:
+        """``{role: [count in period 0, count in period 1, ...]}`` from a single aggregate call."""
+        if not periods:
+            return {}
+        pipeline = build_role_totals_by_period_pipeline(periods)
+        return _role_totals_by_period(self.collection.aggregate(pipeline), len(periods))
+
+
+class AsyncUserStatsRepository:
+    """Read side of ``UserStatsRepository`` on an ``AsyncDatabase``; same pipelines, same shapes."""
+
+    def __init__(self, db, collection_name: str = UserStatsDailyModel._collection_name):
+        self.db = db
+        self.collection = self.db[collection_name]
+
+    async def _aggregate(self, pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        cursor = await self.collection.aggregate(pipeline)
+        return await cursor.to_list()
+
+    async def daily_totals(self, start_dt: datetime, end_dt: datetime) -> List[Tuple[datetime, int]]:
+        return _daily_totals(await self._aggregate(build_daily_totals_pipeline(start_dt, end_dt)))
+
+    async def role_totals(self, start_dt: Optional[datetime] = None, end_dt: Optional[datetime] = None) -> Dict[str, int]:
+        return _role_totals(await self._aggregate(build_role_totals_pipeline(start_dt, end_dt)))
+
+    async def role_totals_by_period(self, periods: Sequence[Tuple[datetime, datetime]]) -> Dict[str, List[int]]:
+        if not periods:
+            return {}
+        pipeline = build_role_totals_by_period_pipeline(periods)
+        return _role_totals_by_period(await self._aggregate(pipeline), len(periods))
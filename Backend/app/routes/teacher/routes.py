@@ -1,11 +1,13 @@
-from flask import Blueprint, request , jsonify, g  # type: ignore
-from app.services.teacher_service import MongoTeacherService
+from flask import Blueprint, request , jsonify, g, current_app  # type: ignore
+from app.container import get_container
 from app.auth.jwt_utils import role_required
 from app.enums.roles import Role
 from app.utils.response_utils import Response  # type: ignore
-from app.database.db import get_db # type: ignore
 from app.error.exceptions import BadRequestError, ErrorSeverity, ErrorCategory
 from app.utils.auth_utils import get_current_user_id
+from app.utils.projection import parse_fields
+from app.admin.routes import parse_page_args
+from app.models.classes import ClassesModel
 teacher_bp = Blueprint('teacher', __name__)
 
 
@@ -13,7 +15,7 @@ teacher_bp = Blueprint('teacher', __name__)
 @role_required([Role.TEACHER.value])
 def get_teacher_profile():
     user_id = get_current_user_id()
-    teacher_service = MongoTeacherService(get_db())
+    teacher_service = get_container().teacher_service
     teacher_info = teacher_service.get_teacher_by_id(user_id)
     return Response.success_response(
         data=teacher_info.model_dump(),
@@ -27,7 +29,7 @@ def patch_teacher_profile():
     """Update teacher profile (Teacher only)."""
     user_id = get_current_user_id()
 
-    teacher_service = MongoTeacherService(get_db())
+    teacher_service = get_container().teacher_service
     updated_teacher = teacher_service.patch_teacher(user_id, request.get_json())
     return Response.success_response(
         data=updated_teacher,
@@ -42,7 +44,7 @@ def patch_teacher_profile():
 def create_teacher_class():
     """Create teacher class (Teacher only)."""
     user_id = get_current_user_id()
-    teacher_service = MongoTeacherService(get_db())
+    teacher_service = get_container().teacher_service
     result = teacher_service.teacher_create_classes(user_id, request.get_json())
     if not result:
         raise
@@ -57,7 +59,7 @@ def create_teacher_class():
 def update_teacher_class(_id):
     """Update teacher class (Teacher only)."""
     user_id = get_current_user_id()
-    teacher_service = MongoTeacherService(get_db())
+    teacher_service = get_container().teacher_service
     result = teacher_service.teacher_update_class(_id, request.get_json())
     return Response.success_response(
         data=result,
@@ -70,12 +72,13 @@ def update_teacher_class(_id):
 @teacher_bp.route('/classes', methods=['GET'])
 @role_required([Role.TEACHER.value])
 def get_all_class():
-    """Get teacher classes (Teacher only)."""
+    """Get teacher classes (Teacher only). Optional ``fields=class_info,max_students`` limits the fields."""
     user_id = get_current_user_id()
-    teacher_service = MongoTeacherService(get_db())
-    result = teacher_service.find_all_classes()
-    return Response.success_response(
-        data = [item.model_dump(mode="json", by_alias=True, exclude_none=True) for item in result] if result else [],
+    fields = parse_fields(request.args.get('fields'), ClassesModel)
+    teacher_service = get_container().teacher_service
+    result = teacher_service.iter_all_classes(current_app.config.get("STREAM_BATCH_SIZE", 500), fields)
+    return Response.stream_response(
+        (item.model_dump(mode="json", by_alias=True, exclude_none=True, include=fields) for item in result),
         message="Classes fetched"
     )
     
@@ -89,7 +92,7 @@ def get_class_by_id(_id):
     """Get teacher classes (Teacher only)."""
     if not _id:
         raise BadRequestError(message="Class ID is required", status_code=400, severity=ErrorSeverity.LOW, category=ErrorCategory.VALIDATION)
-    teacher_service = MongoTeacherService(get_db())
+    teacher_service = get_container().teacher_service
     result = teacher_service.find_classes_by_id(_id)
     return Response.success_response(
         data=result.model_dump(mode='json'),
@@ -98,12 +101,25 @@ def get_class_by_id(_id):
 
 
 
+@teacher_bp.route('/classes/<_id>/students', methods=['GET'])
+@role_required([Role.TEACHER.value])
+def get_class_roster(_id):
+    """Students enrolled in a class, ``page_size`` at a time (Teacher only)."""
+    page_size, cursor = parse_page_args(request.args)
+    page = get_container().classes_service.find_class_roster(_id, page_size, cursor)
+    return Response.success_response(
+        data=page["students"],
+        message="Class roster fetched",
+        metadata={"next_cursor": page["next_cursor"], "page_size": page_size}
+    )
+
+
 @teacher_bp.route('/classes/<class_id>', methods=['PUT'])
 @role_required([Role.TEACHER.value])
 def update_class(class_id):
     """Update class (Teacher only)."""
     user_id = get_current_user_id()
-    teacher_service = MongoTeacherService(get_db())
+    teacher_service = get_container().teacher_service
     result = teacher_service.teacher_update_class(class_id, request.get_json())
     return Response.success_response(
         data=result.model_dump(),
@@ -122,7 +138,7 @@ def create_feedback():
     if not data:
         raise BadRequestError(message="Invalid or missing JSON payload")
 
-    teacher_service = MongoTeacherService(get_db())
+    teacher_service = get_container().teacher_service
     result = teacher_service.teacher_create_feedback(data)
 
     return Response.success_response(
@@ -155,7 +171,7 @@ def create_teacher_profile():
             details={"received": str(data)}
         )
 
-    teacher_service = MongoTeacherService(get_db())
+    teacher_service = get_container().teacher_service
     result = teacher_service.create_teacher(data)
 
     if not result:
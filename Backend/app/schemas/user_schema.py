@@ -73,7 +73,6 @@ class TeacherPatchSchema(BaseModel):
 class StudentInfoPatchSchema(BaseModel):
     student_id: Optional[str] = Field(None, description="Unique student identifier")
     year_level: Optional[str] = Field(None, description="Year level of the student")
-    class_ids: Optional[List[str]] = Field(default_factory=list)
     major: Optional[str] = None
     birth_date: Optional[date] = None
     batch: Optional[str] = None
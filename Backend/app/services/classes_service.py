@@ -1,18 +1,24 @@
 from app.models.classes import ClassesModel, ClassInfoModel
-from app.error.exceptions import NotFoundError, ValidationError, DatabaseError, ExceptionFactory, InternalServerError, AppBaseException, BadRequestError, ErrorCategory, ErrorSeverity , AppTypeError
+from app.error.exceptions import NotFoundError, ValidationError, DatabaseError, ExceptionFactory, InternalServerError, AppBaseException, BadRequestError, BusinessLogicError, ErrorCategory, ErrorSeverity , AppTypeError
+from app.enums.status import EnrollmentStatus
+from app.repositories.enrollment_repository import EnrollmentRepository, EnrollmentResult, RosterPage, SchedulePage
 from app.utils.objectid import ObjectId # type: ignore
-from typing import Optional, List, Dict, Any , Union
+from typing import Optional, List, Dict, Any , Union, Iterator, AbstractSet, Tuple
+from app.utils.projection import to_projection
 from app.utils.dict_utils import flatten_dict
 from datetime import datetime, timezone
-from app.utils.console import console
-from app.utils.model_utils import default_model_utils
+from app.utils.model_utils import default_model_utils, trusted_model_utils
 from pymongo.database import Database # type: ignore
 from abc import ABC, abstractmethod
-from app.utils.convert import convert_serializable , convert_objectid_to_str
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Maintained by the enrollment repository; never taken from a create/update payload.
+SERVER_OWNED_FIELDS = frozenset({"enrolled_count"})
+# Embedded membership replaced by the enrollments collection; rejected instead of stored as an extra.
+RETIRED_FIELDS = frozenset({"students_enrolled"})
+
 class ClassesService(ABC):
     @abstractmethod
     def create_classes(self, _id: ObjectId | str, data: Union[List[Dict[str, Any]], Dict[str, Any]]) -> Dict[str, Any]:
@@ -21,17 +27,35 @@ class ClassesService(ABC):
 
 
 class MongoClassesService(ClassesService):
-    def __init__(self, db: Database, collection_name: str = ClassesModel._collection_name):
+    def __init__(
+        self,
+        db: Database,
+        collection_name: str = ClassesModel._collection_name,
+        max_bulk_items: int = 5000,
+        enrollments: Optional[EnrollmentRepository] = None,
+    ):
         self.db = db
+        self.max_bulk_items = max_bulk_items
+        self.enrollments = enrollments or EnrollmentRepository(db)
         self.collection = self.db[collection_name]
-        self.now = datetime.now(timezone.utc)
         self.model_utils =  default_model_utils
+        self.read_model_utils = trusted_model_utils
+
+    @property
+    def now(self) -> datetime:
+        return datetime.now(timezone.utc)
+
+    def _reject_retired_fields(self, data: Any) -> None:
+        if not isinstance(data, dict):
+            return
+        for field in RETIRED_FIELDS.intersection(data):
+            raise ExceptionFactory.validation_failed(field=field, value=data[field], reason="Use the enrollment endpoints to manage class membership")
 
     def _to_classes(self, data: Dict[str, Any]) -> Optional[ClassesModel]:
         return self.model_utils.to_model(data, ClassesModel)
     
     def _to_classes_list(self, data: List[Dict[str, Any]]) -> List[ClassesModel]:
-        return [self._convert_objectid_dict(doc) for doc in data]
+        return self.model_utils.to_model_list(data, ClassesModel)
 
     def _initialize_update_history(self) -> List[datetime]:
         return [self.now]
@@ -40,12 +64,12 @@ class MongoClassesService(ClassesService):
         return self.model_utils.validate_object_id(id_val)
 
     def _convert_to_response_model(self, data: Dict[str, Any]) -> Optional[ClassesModel]:
-        return self.model_utils.convert_to_response_model(data, ClassesModel)
+        return self.read_model_utils.convert_to_response_model(data, ClassesModel)
     
     
     
     def _convert_to_response_model_list(self, data_list: List[Dict[str, Any]]) -> List[ClassesModel]:
-        return self.model_utils.convert_to_response_model_list(data_list, ClassesModel)
+        return self.read_model_utils.convert_to_response_model_list(data_list, ClassesModel)
     
     def _fetch_first_inserted(self, inserted_ids: List[ObjectId]) -> ClassesModel:
         if not inserted_ids:
@@ -75,11 +99,14 @@ class MongoClassesService(ClassesService):
             data = [data]
         elif not isinstance(data, list) or not data:
             raise ExceptionFactory.validation_failed(field="data", value=data, reason="Input must be a dict or a non-empty list")
+        for doc in data:
+            self._reject_retired_fields(doc)
         classes = self._to_classes_list(data)
         for class_model in classes:
             class_model.created_by = created_by_id
+            class_model.enrolled_count = 0
         classes_dicts = [
-            convert_serializable(class_model.model_dump(by_alias=True, exclude_none=True, mode="json"))
+            class_model.model_dump(by_alias=True, exclude_none=True, mode="json")
             for class_model in classes
         ]
         if not classes_dicts:
@@ -97,10 +124,14 @@ class MongoClassesService(ClassesService):
     
     def update_classes(self, _id: ObjectId | str, data: Dict[str, Any]) -> ClassesModel:
         validated_id = self._validate_object_id(_id)
+        self._reject_retired_fields(data)
         data_model = self._to_classes(data)
         if not data_model:
             raise ExceptionFactory.validation_failed(field="data", value=data, reason="Invalid class data")
-        result = self.collection.update_one({"_id": validated_id}, {"$set": data_model.model_dump(by_alias=True, exclude_none=True, mode="json")})
+        update = data_model.model_dump(by_alias=True, exclude_none=True, exclude_unset=True, exclude=SERVER_OWNED_FIELDS, mode="json")
+        if not update:
+            raise ExceptionFactory.validation_failed(field="data", value=data, reason="No updatable class fields")
+        result = self.collection.update_one({"_id": validated_id}, {"$set": update})
         if result.matched_count == 0:
             raise NotFoundError(message=f"Class not found with ID {_id}", category=ErrorCategory.DATABASE, status_code=404)
         raw_doc = self.collection.find_one({"_id": validated_id})
@@ -122,6 +153,12 @@ class MongoClassesService(ClassesService):
             raise InternalServerError(message="Unexpected error occurred while finding classes", cause=e, status_code=500)
     
     
+    def iter_all_classes(self, batch_size: int = 500, fields: Optional[AbstractSet[str]] = None) -> Iterator[ClassesModel]:
+        for raw_doc in self.collection.find({}, to_projection(fields, ClassesModel)).batch_size(batch_size):
+            model = self._convert_to_response_model(raw_doc)
+            if model is not None:
+                yield model
+
     def find_classes_by_id(self, class_id: Union[ObjectId, str]) -> ClassesModel:
         validated_id = self._validate_object_id(class_id)
         try:
@@ -140,38 +177,81 @@ class MongoClassesService(ClassesService):
         validated_id = self._validate_object_id(created_by)   
         try:
             result = self.collection.find({"created_by": validated_id})
-            return self._to_classes_list(list(result))
+            return self._convert_to_response_model_list(list(result))
         except AppBaseException:
             raise
         except Exception as e:
             raise InternalServerError(message="Unexpected error occurred while finding classes", cause=e, details={"id": created_by})
     
 
-    def _update_student_enrollment(self, _id: ObjectId | str, class_id: ObjectId | str, operation: str) -> Optional[ClassesModel]:
-        validated_student_id = self._validate_object_id(_id)
-        if not validated_student_id:
-            raise ExceptionFactory.validation_failed(field="_id", value=_id, reason="Invalid student ID format") 
-        
-        validated_class_id = self._validate_object_id(class_id)
-        if not validated_class_id:
-            raise ExceptionFactory.validation_failed(field="class_id", value=class_id, reason="Invalid class ID format")
-        
-        mongo_op = {"$addToSet": {"students_enrolled": validated_student_id}} if operation == "enroll" else {"$pull": {"students_enrolled": validated_student_id}}
-        
-        result = self.collection.update_one({"_id": validated_class_id}, mongo_op)
-        if result.matched_count == 0:
-            raise NotFoundError("Class not found")
-        result = self.collection.find_one({"_id": validated_class_id})
-        return self._to_classes(result) if result else None
+    def _validate_ids(self, field: str, values: Any) -> List[ObjectId]:
+        if isinstance(values, (str, ObjectId)):
+            values = [values]
+        if not isinstance(values, list) or not values:
+            raise ExceptionFactory.validation_failed(field=field, value=values, reason="Expected a non-empty list of IDs")
+        # Duplicates collapse to one item; request order is kept.
+        return list(dict.fromkeys(self._validate_object_id(value) for value in values))
+
+    def _bulk_pairs(self, student_ids: Any, class_ids: Any) -> Tuple[List[ObjectId], List[ObjectId]]:
+        students = self._validate_ids("student_ids", student_ids)
+        classes = self._validate_ids("class_ids", class_ids)
+        if len(students) * len(classes) > self.max_bulk_items:
+            raise BadRequestError(
+                message=f"Too many enrollments in one request: {len(students) * len(classes)} > {self.max_bulk_items}",
+                user_message="Split the request into smaller batches.",
+                details={"students": len(students), "classes": len(classes), "max_items": self.max_bulk_items},
+            )
+        return students, classes
+
+    def enroll_students(self, student_ids: Any, class_ids: Any) -> List[EnrollmentResult]:
+        """Enroll every student in every class, never past ``max_students``.
 
+        Each pair is reported as enrolled, already_enrolled, class_full or
+        class_not_found; see ``EnrollmentRepository.enroll``.
+        """
+        students, classes = self._bulk_pairs(student_ids, class_ids)
+        results: List[EnrollmentResult] = []
+        for class_id in classes:
+            results.extend(self.enrollments.enroll(class_id, students))
+        return results
 
+    def unenroll_students(self, student_ids: Any, class_ids: Any) -> List[EnrollmentResult]:
+        """Remove every student from every class; pairs are unenrolled, not_enrolled or class_not_found."""
+        students, classes = self._bulk_pairs(student_ids, class_ids)
+        results: List[EnrollmentResult] = []
+        for class_id in classes:
+            results.extend(self.enrollments.unenroll(class_id, students))
+        return results
 
     def enroll_student_to_class(self, student_id: ObjectId | str, class_id: ObjectId | str) -> Optional[ClassesModel]:
-        return self._update_student_enrollment(student_id, class_id, "enroll")
+        validated_student_id = self._validate_object_id(student_id)
+        validated_class_id = self._validate_object_id(class_id)
+        status, class_doc = self.enrollments.enroll_one(validated_class_id, validated_student_id)
+        if status == EnrollmentStatus.CLASS_NOT_FOUND:
+            raise NotFoundError("Class not found")
+        if status == EnrollmentStatus.CLASS_FULL:
+            raise BusinessLogicError(
+                message=f"Class {class_id} is full",
+                rule="max_students",
+                status_code=409,
+                user_message="This class has no seats left.",
+                details={"class_id": str(class_id)},
+            )
+        return self._convert_to_response_model(class_doc) if class_doc else None
 
     def unenroll_student_from_class(self, student_id: ObjectId | str, class_id: ObjectId | str) -> Optional[ClassesModel]:
-        return self._update_student_enrollment(student_id, class_id, "unenroll")
+        validated_student_id = self._validate_object_id(student_id)
+        validated_class_id = self._validate_object_id(class_id)
+        class_doc = self.enrollments.unenroll_one(validated_class_id, validated_student_id)
+        if class_doc is None:
+            raise NotFoundError("Class not found")
+        return self._convert_to_response_model(class_doc)
+
+    def find_class_roster(self, class_id: ObjectId | str, page_size: int, cursor: Optional[str] = None) -> RosterPage:
+        return self.enrollments.roster(self._validate_object_id(class_id), page_size, cursor)
 
+    def find_student_schedule(self, student_id: ObjectId | str, page_size: int, cursor: Optional[str] = None) -> SchedulePage:
+        return self.enrollments.schedule(self._validate_object_id(student_id), page_size, cursor)
 
 
 def get_classes_service(db: Database) -> MongoClassesService:
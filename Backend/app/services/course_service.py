@@ -4,11 +4,9 @@ from app.utils.objectid import ObjectId # type: ignore
 from typing import Optional, List, Dict, Any , Union
 from app.utils.dict_utils import flatten_dict
 from datetime import datetime, timezone
-from app.utils.console import console
 from app.utils.model_utils import default_model_utils
 from pymongo.database import Database # type: ignore
 from abc import ABC, abstractmethod
-from app.utils.convert import convert_serializable , convert_objectid_to_str
 import logging
 
 logger = logging.getLogger(__name__)
@@ -60,7 +58,7 @@ class MongoCourseService(CourseService):
             inserted_ids = self._insert_many([data])
             return self._fetch_first_inserted(inserted_ids)
         except Exception as e:
-            logger.error(f"Error creating course: {e}")
+            logger.error("Error creating course: %s", e)
             raise InternalServerError(
                 message="Failed to create course",
                 error=str(e),
@@ -80,7 +78,7 @@ class MongoCourseService(CourseService):
                 )
             return self._convert_to_response_model(course)
         except Exception as e:
-            logger.error(f"Error getting course by id: {e}")
+            logger.error("Error getting course by id: %s", e)
             raise InternalServerError(
                 message="Failed to get course by id",
                 error=str(e),
@@ -1,7 +1,7 @@
 from app.models.feedback import FeedbackModel
 from app.database.db import get_db
 from app.error.exceptions import NotFoundError, ValidationError, DatabaseError, ExceptionFactory, InternalServerError, AppBaseException, BadRequestError, ErrorCategory, ErrorSeverity , AppTypeError
-from app.utils.convert import convert_objectid_to_str
+from app.utils.convert import to_json_compatible
 from app.utils.objectid import ObjectId # type: ignore
 from typing import Optional, List, Dict, Any, Union
 from datetime import datetime, timezone
@@ -18,7 +18,7 @@ class FeedbackService(ABC):
 class MongoFeedbackService(FeedbackService):
     def __init__(self, db: Database):
         self.db = db
-        self.collection = self.db.feedback
+        self.collection = self.db[FeedbackModel._collection_name]
         self.model_utils = default_model_utils
 
     def _to_feedback(self, data: Dict[str, Any]) -> Optional[FeedbackModel]:
@@ -34,7 +34,7 @@ class MongoFeedbackService(FeedbackService):
         return self.model_utils.prepare_safe_update(update_data)
     
     def _convert_objectid_dict(self, data: Dict[str, Any]) -> Optional[FeedbackModel]:
-        data = convert_objectid_to_str(data)
+        data = to_json_compatible(data)
         return FeedbackModel(**data)
     
     def _fetch_first_inserted(self, inserted_id: ObjectId) ->  Optional[FeedbackModel]:
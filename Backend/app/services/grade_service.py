@@ -5,7 +5,7 @@ from pymongo.errors import PyMongoError # type: ignore
 from pymongo.database import Database # type: ignore
 from app.error.exceptions import NotFoundError, ValidationError, DatabaseError, AuthenticationError, BadRequestError, InternalServerError, UnauthorizedError, ForbiddenError, ExceptionFactory, AppBaseException, ErrorSeverity, ErrorCategory # type: ignore
 from abc import ABC, abstractmethod
-from app.utils.model_utils import default_model_utils
+from app.utils.model_utils import default_model_utils, trusted_model_utils
 from app.utils.pyobjectid import PyObjectId
 import logging
 
@@ -33,6 +33,7 @@ class MongoGradeService(GradeService):
     def __init__(self, db: Database):
         self.db = db
         self.model_utils = default_model_utils
+        self.read_model_utils = trusted_model_utils
         self.collection = self.db.grades
 
     def _to_grade(self, data: Dict[str, Any]) -> Optional[GradeModel]:
@@ -48,7 +49,7 @@ class MongoGradeService(GradeService):
         return self.model_utils.prepare_safe_update(update_data)
     
     def _convert_to_response_model(self, data: Dict[str, Any]) -> Optional[GradeModel]:
-        return self.model_utils.convert_to_response_model(data, GradeModel)
+        return self.read_model_utils.convert_to_response_model(data, GradeModel)
 
 
     def create_grade(self, student_id: ObjectId, teacher_id: ObjectId, class_id: ObjectId, course_id: ObjectId, data: Dict[str, Any]) -> Optional[GradeModel]:
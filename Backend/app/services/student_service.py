@@ -6,19 +6,20 @@ from app.models.user import UserModel # type: ignore
 from abc import ABC, abstractmethod
 from app.error.exceptions import ExceptionFactory, AppBaseException, InternalServerError    
 from app.utils.model_utils import default_model_utils
-from app.utils.convert import convert_objectid_to_str
+from app.utils.convert import to_json_compatible
 
 class StudentService(ABC):
     pass
 
 
 class MongoStudentService(StudentService):
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, user_service=None, classes_service=None):
         self.db = db
         self.collection = self.db.student
         self.model_utils = default_model_utils
-        self._user_service = None
-        self._classes_service = None
+        # Injected by the service container; built on demand when constructed standalone.
+        self._user_service = user_service
+        self._classes_service = classes_service
 
     @property
     def user_service(self):
@@ -46,7 +47,7 @@ class MongoStudentService(StudentService):
         return self.model_utils.prepare_safe_update(update_data)
 
     def _convert_objectid_dict(self, data: Dict[str, Any]) -> StudentModel:
-        data = convert_objectid_to_str(data)
+        data = to_json_compatible(data)
         return StudentModel(**data) 
 
     def create_student(self, data: Dict[str, Any]) -> Optional[UserModel]:
@@ -1,5 +1,5 @@
 import logging
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Union, Iterator, AbstractSet
 from pymongo.database import Database # type: ignore
 from bson import ObjectId  # type: ignore
 from app.models.teacher import TeacherModel  # type: ignore
@@ -9,7 +9,7 @@ from abc import ABC, abstractmethod
 from app.error.exceptions import AppBaseException,ExceptionFactory, ValidationError, InternalServerError, NotFoundError, DatabaseError
 logger = logging.getLogger(__name__)
 from pymongo import ReturnDocument # type: ignore
-from app.utils.model_utils import default_model_utils
+from app.utils.model_utils import default_model_utils, trusted_model_utils
 from app.enums.roles import Role
 from app.models.feedback import FeedbackModel
 class TeacherService(ABC):
@@ -34,13 +34,15 @@ class TeacherService(ABC):
     def teacher_create_classes(self, data: Dict[str, Any]) -> Optional[ClassesModel]:
         pass
 class MongoTeacherService(TeacherService):
-    def __init__(self, db: Database, collection_name: str = TeacherModel._collection_name):   
+    def __init__(self, db: Database, collection_name: str = TeacherModel._collection_name, classes_service=None, user_service=None, feedback_service=None):   
         self.db = db
         self.collection = self.db[collection_name]
         self.model_utils = default_model_utils
-        self._classes_service = None
-        self._user_service = None
-        self._feedback_service = None
+        self.read_model_utils = trusted_model_utils
+        # Injected by the service container; built on demand when constructed standalone.
+        self._classes_service = classes_service
+        self._user_service = user_service
+        self._feedback_service = feedback_service
 
     @property
     def classes_service(self):
@@ -88,7 +90,7 @@ class MongoTeacherService(TeacherService):
             )
 
     def _convert_to_response_model(self, data: Dict[str, Any]) -> Optional[TeacherModel]:
-        return self.model_utils.convert_to_response_model(data, TeacherModel)
+        return self.read_model_utils.convert_to_response_model(data, TeacherModel)
     
     def _to_objectid(self, id_val: Union[str, ObjectId]) -> Optional[ObjectId]:
         return self.model_utils.validate_object_id(id_val)
@@ -167,8 +169,11 @@ class MongoTeacherService(TeacherService):
         return self.classes_service.find_all_classes()
     
     
+    def iter_all_classes(self, batch_size: int = 500, fields: Optional[AbstractSet[str]] = None) -> Iterator[ClassesModel]:
+        return self.classes_service.iter_all_classes(batch_size, fields)
+
     def find_classes_by_teacher_id(self, _id: Union[ObjectId, str]) -> List[ClassesModel]:
-        logger.info('receive from find_classes_by_teacher_id', _id)
+        logger.info('receive from find_classes_by_teacher_id %s', _id)
         return self.classes_service.find_classes_by_teacher_id(_id)
     
     def find_classes_by_id(self, _id: Union[ObjectId, str]) -> ClassesModel:
@@ -180,11 +185,11 @@ class MongoTeacherService(TeacherService):
         return self.classes_service.create_classes(_id, class_data)
 
     def teacher_update_class(self, _id: Union[ObjectId, str], class_data: Dict[str, Any]) ->  ClassesModel:
-        logger.info('receive from teacher_update_class', class_data)
+        logger.info('receive from teacher_update_class %s', class_data)
         return self.classes_service.update_classes(_id, class_data)
 
     def teacher_create_feedback(self,feedback_data: Dict[str, Any]) -> Optional[FeedbackModel]:
-        logger.info('receive from teacher_create_feedback', feedback_data)
+        logger.info('receive from teacher_create_feedback %s', feedback_data)
         return self.feedback_service.create_feedback(feedback_data)
 
 def get_teacher_service(db: Database) -> MongoTeacherService:
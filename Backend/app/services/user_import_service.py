@@ -0,0 +1,203 @@
+import csv
+import io
+import json
+import logging
+from datetime import datetime
+from itertools import islice
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple, TypedDict
+from pydantic import ValidationError as PydanticValidationError
+from pymongo.database import Database  # type: ignore
+from pymongo.errors import BulkWriteError  # type: ignore
+from app.auth.password_hasher import PasswordHasher, default_password_hasher
+from app.enums.roles import Role
+from app.error.exceptions import BadRequestError, ErrorSeverity, ErrorCategory
+from app.models.user import UserModel
+from app.models.student import StudentModel
+from app.models.teacher import TeacherModel
+from app.repositories.user_search_repository import UserSearchIndex
+from app.repositories.user_stats_repository import UserStatsRepository
+from app.schemas.user_schema import UserCreateSchema
+from app.services.user_service import build_role_document, duplicate_key_field
+from app.utils.events import events, USERS_IMPORTED
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("csv", "jsonl")
+DUPLICATE_KEY = 11000
+
+
+class ImportRowError(TypedDict):
+    row: int
+    field: Optional[str]
+    error: str
+
+
+class UserImportReport(TypedDict):
+    total: int
+    inserted: int
+    failed: int
+    errors: List[ImportRowError]
+    errors_truncated: bool
+
+
+def detect_format(content_type: Optional[str], explicit: Optional[str] = None) -> str:
+    """Pick the import format from an explicit ``format`` value or the request content type."""
+    if explicit:
+        fmt = explicit.lower()
+    elif content_type and "csv" in content_type:
+        fmt = "csv"
+    elif content_type and ("ndjson" in content_type or "jsonl" in content_type or "json-seq" in content_type):
+        fmt = "jsonl"
+    else:
+        fmt = ""
+    if fmt not in IMPORT_FORMATS:
+        raise BadRequestError(
+            message="Unsupported import format",
+            details={"format": explicit, "content_type": content_type},
+            user_message="Upload users as CSV (text/csv) or JSON Lines (application/x-ndjson).",
+            status_code=400,
+            severity=ErrorSeverity.LOW,
+            category=ErrorCategory.VALIDATION,
+        )
+    return fmt
+
+
+def iter_import_rows(stream: IO[bytes], fmt: str) -> Iterator[Tuple[int, Any]]:
+    """Yield ``(row_number, row)`` from a binary stream without reading it all into memory.
+
+    A JSONL line that is not valid JSON is yielded as an ``Exception`` so the caller
+    can report it against its row instead of aborting the import.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        for row_number, row in enumerate(csv.DictReader(text), start=1):
+            yield row_number, {key.strip(): (value.strip() or None) if isinstance(value, str) else value for key, value in row.items() if key}
+        return
+    for row_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield row_number, json.loads(line)
+        except ValueError as e:
+            yield row_number, e
+
+
+class UserImportService:
+    """Bulk user creation for onboarding: validate in chunks, hash in parallel, write in batches.
+
+    Passwords of a chunk are hashed as one batch spread over the hashing pool.
+    Each chunk costs one ``insert_many`` into ``users``, one per role collection,
+    and one bulk write each for the search index and the stats rollup. Duplicates
+    are rejected by the unique indexes and reported per row.
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        search_index: UserSearchIndex,
+        stats: UserStatsRepository,
+        password_hasher: Optional[PasswordHasher] = None,
+        chunk_size: int = 1000,
+        max_errors: int = 1000,
+    ):
+        self.db = db
+        self.collection = self.db[UserModel._collection_name]
+        self._role_collections = {
+            Role.STUDENT.value: self.db[StudentModel._collection_name],
+            Role.TEACHER.value: self.db[TeacherModel._collection_name],
+        }
+        self._search_index = search_index
+        self._stats = stats
+        self._password_hasher = password_hasher or default_password_hasher
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+
+    def import_stream(self, stream: IO[bytes], fmt: str) -> UserImportReport:
+        report = UserImportReport(total=0, inserted=0, failed=0, errors=[], errors_truncated=False)
+        rows = iter_import_rows(stream, fmt)
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                break
+            report["total"] += len(chunk)
+            self._import_chunk(chunk, report)
+        report["failed"] = report["total"] - report["inserted"]
+        if report["inserted"]:
+            events.emit(USERS_IMPORTED, count=report["inserted"])
+        logger.info("User import finished: %d/%d inserted", report["inserted"], report["total"])
+        return report
+
+    def _add_error(self, report: UserImportReport, row: int, error: str, field: Optional[str] = None) -> None:
+        if len(report["errors"]) >= self.max_errors:
+            report["errors_truncated"] = True
+            return
+        report["errors"].append(ImportRowError(row=row, field=field, error=error))
+
+    def _validate(self, chunk: List[Tuple[int, Any]], report: UserImportReport) -> List[Tuple[int, UserCreateSchema]]:
+        valid = []
+        for row_number, row in chunk:
+            if isinstance(row, Exception):
+                self._add_error(report, row_number, f"Invalid JSON: {row}")
+                continue
+            if not isinstance(row, dict):
+                self._add_error(report, row_number, "Row must be an object")
+                continue
+            try:
+                valid.append((row_number, UserCreateSchema.model_validate(row)))
+            except PydanticValidationError as e:
+                first = e.errors()[0]
+                field = ".".join(str(part) for part in first["loc"]) or None
+                self._add_error(report, row_number, "; ".join(err["msg"] for err in e.errors()), field)
+        return valid
+
+    def _import_chunk(self, chunk: List[Tuple[int, Any]], report: UserImportReport) -> None:
+        valid = self._validate(chunk, report)
+        if not valid:
+            return
+        hashes = self._password_hasher.hash_many([user.password for _, user in valid])
+        created_at = datetime.utcnow()
+        docs = []
+        for (_, user), password in zip(valid, hashes):
+            doc = user.model_dump(exclude_none=True)
+            doc.update(role=user.role.value, password=password, created_at=created_at)
+            docs.append(doc)
+
+        failed = set()
+        try:
+            self.collection.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            for write_error in e.details.get("writeErrors", []):
+                index = write_error["index"]
+                failed.add(index)
+                if write_error.get("code") == DUPLICATE_KEY:
+                    field = duplicate_key_field(write_error, write_error.get("errmsg", ""))
+                    self._add_error(report, valid[index][0], f"{field.capitalize()} already exists", field)
+                else:
+                    self._add_error(report, valid[index][0], write_error.get("errmsg", "Write failed"))
+
+        inserted = [(valid[i][0], doc) for i, doc in enumerate(docs) if i not in failed]
+        inserted = self._insert_role_documents(inserted, report)
+        if not inserted:
+            return
+        users = [doc for _, doc in inserted]
+        self._search_index.index_many(users)
+        self._stats.record_many((doc["role"], doc["created_at"]) for doc in users)
+        report["inserted"] += len(users)
+
+    def _insert_role_documents(self, inserted: List[Tuple[int, Dict[str, Any]]], report: UserImportReport) -> List[Tuple[int, Dict[str, Any]]]:
+        """Write role documents per collection; users whose role document fails are removed again."""
+        orphaned = set()
+        for role, collection in self._role_collections.items():
+            batch = [(row, doc) for row, doc in inserted if doc["role"] == role]
+            if not batch:
+                continue
+            try:
+                collection.insert_many([build_role_document(doc["_id"], role) for _, doc in batch], ordered=False)
+            except BulkWriteError as e:
+                for write_error in e.details.get("writeErrors", []):
+                    row, doc = batch[write_error["index"]]
+                    orphaned.add(doc["_id"])
+                    self._add_error(report, row, f"Failed to create {role} profile: {write_error.get('errmsg', '')}")
+        if orphaned:
+            self.collection.delete_many({"_id": {"$in": list(orphaned)}})
+        return [(row, doc) for row, doc in inserted if doc["_id"] not in orphaned]
@@ -4,22 +4,52 @@ from app.models.user import UserModel
 from app.enums.roles import Role
 from app.utils.objectid import ObjectId # type: ignore
 from typing import TypedDict, List, Optional, Dict, Any, Union, Literal
-from werkzeug.security import generate_password_hash  # type: ignore
 from app.models.student import StudentModel
 import logging
 from abc import ABC, abstractmethod
 from app.utils.dict_utils import flatten_dict # type: ignore
 from app.models.teacher import TeacherModel
 from datetime import datetime, timezone
-from app.error.exceptions import     NotFoundError, BadRequestError, InternalServerError, AppBaseException, ErrorSeverity, ErrorCategory  # type: ignore 
+from app.error.exceptions import     NotFoundError, BadRequestError, InternalServerError, UnauthorizedError, AppBaseException, ErrorSeverity, ErrorCategory  # type: ignore 
 from pymongo.database import Database # type: ignore
+from pymongo.errors import ConfigurationError, DuplicateKeyError, OperationFailure # type: ignore
 from app.utils.date_utils import ensure_date
 from app.repositories.user_repository import  UserRepositoryImpl
-from app.utils.model_utils import default_model_utils
+from app.repositories.user_search_repository import UserSearchIndex
+from app.utils.model_utils import default_model_utils, trusted_model_utils
 from functools import lru_cache
 from app.utils.pyobjectid import PyObjectId
+from app.utils.events import events, USER_CREATED, USER_UPDATED, USER_DELETED
+from app.auth.password_hasher import PasswordHasher, default_password_hasher
 logger = logging.getLogger(__name__)
 
+# Server error code for "Transaction numbers are only allowed on a replica set member or mongos".
+ILLEGAL_OPERATION = 20
+
+
+def build_role_document(_id: ObjectId, role: Union[Role, str]) -> Optional[dict]:
+    """Build the minimal role document for a new user; admins have none, they live in ``users`` only."""
+    if isinstance(role, str):
+        role = Role(role)
+    if role == Role.STUDENT:
+        data = StudentModel.create_minimal(_id=PyObjectId(_id)).model_dump(by_alias=True)
+    elif role == Role.TEACHER:
+        data = TeacherModel.create_minimal(_id=PyObjectId(_id)).model_dump(by_alias=True)
+    else:
+        return None
+    data["_id"] = data.pop("id", None) or _id
+    return data
+
+
+def duplicate_key_field(details: Optional[dict], errmsg: str = "") -> str:
+    """Name the user field (``username`` or ``email``) a duplicate key error is about."""
+    key_pattern = (details or {}).get("keyPattern") or {}
+    field = next(iter(key_pattern), None)
+    if field is None:
+        field = "email" if "email_unique" in (errmsg or (details or {}).get("errmsg", "")) else "username"
+    return field
+
+
 class UpdateRoleInfoResponse(TypedDict):
     role: str
     update_data: dict
@@ -46,17 +76,20 @@ class UserService(ABC):
         pass
 
 class MongoUserService(UserService):
-    def __init__(self, db: Database, user_repo: UserRepositoryImpl , collection_name = UserModel._collection_name):
+    def __init__(self, db: Database, user_repo: UserRepositoryImpl , collection_name = UserModel._collection_name, search_index: Optional[UserSearchIndex] = None, password_hasher: Optional[PasswordHasher] = None):
         self.db = db
         self.collection = self.db[UserModel._collection_name]
         self._user_repo = user_repo
-        self.now = datetime.now(timezone.utc)
+        self._search_index = search_index or user_repo.search_index
+        self._password_hasher = password_hasher or default_password_hasher
         self.model_utils = default_model_utils
+        self.read_model_utils = trusted_model_utils
         self._role_collections = {
             Role.TEACHER.value: self.db[TeacherModel._collection_name],
             Role.STUDENT.value: self.db[StudentModel._collection_name],
             Role.ADMIN.value: self.db[UserModel._collection_name]
         }
+        self._transactions_supported: Optional[bool] = None
     def _get_role_collection(self, role: str):
         collection = self._role_collections.get(role)
         if collection is None:
@@ -66,12 +99,16 @@ class MongoUserService(UserService):
     @property
     def user_repo(self) -> UserRepositoryImpl:
         return self._user_repo
+
+    @property
+    def now(self) -> datetime:
+        return datetime.now(timezone.utc)
       
     def _to_user(self, data: dict) -> Optional[UserModel]:
-        return self.model_utils.to_model(data, UserModel)
+        return self.read_model_utils.to_model(data, UserModel)
 
     def _to_user_list(self, data_list: List[dict]) -> List[UserModel]:
-        return self.model_utils.to_model_list(data_list, UserModel)
+        return self.read_model_utils.to_model_list(data_list, UserModel)
 
     def _prepare_safe_update(self, user_update_data: dict) -> dict:
         return self.model_utils.prepare_safe_update(user_update_data)
@@ -105,45 +142,69 @@ class MongoUserService(UserService):
         return UpdateRoleInfoResponse(role=role, update_data=update_data, original_data=original_data)
 
 
-    def _create_role_specific_data(self, _id: ObjectId, role: Union[Role, str]) -> None:
-        """Create minimal role-specific data for a new user based on their role."""
-        if isinstance(role, str):
-            role = Role(role)
-        role_collection = self._get_role_collection(role)
-        if role == Role.STUDENT:
-            new_student = StudentModel.create_minimal(_id=PyObjectId(_id))
-            data = new_student.model_dump(by_alias=True)
-        elif role == Role.TEACHER:
-            new_teacher = TeacherModel.create_minimal(_id=PyObjectId(_id))
-            data = new_teacher.model_dump(by_alias=True)
-        elif role == Role.ADMIN:
-            data = {"_id": _id}
-        data["_id"] = data.pop("id", None) or _id
+    def _insert_user_documents(self, data: dict, role: str, session=None) -> ObjectId:
+        """Insert the user and its role document; the unique indexes reject duplicates."""
+        result = self.collection.insert_one(data, session=session)
+        if not result.acknowledged:
+            raise InternalServerError(message="Failed to create user in database", details={"username": data.get("username")}, status_code=500)
+        _id = result.inserted_id
+        role_data = build_role_document(_id, role)
+        if role_data is not None:
+            logger.info("Creating %s info for user_id: %s", role, _id)
+            self._get_role_collection(role).insert_one(role_data, session=session)
+        return _id
 
-        logger.info(f"Creating {role} info for user_id: {_id}")
-        role_collection.insert_one(data)
+    def _insert_user_with_compensation(self, data: dict, role: str) -> ObjectId:
+        """Standalone fallback: undo the user insert if the role document cannot be written."""
+        try:
+            return self._insert_user_documents(data, role)
+        except Exception:
+            if data.get("_id") is not None:
+                self.collection.delete_one({"_id": data["_id"]})
+            raise
+
+    def _insert_user(self, data: dict, role: str) -> ObjectId:
+        """Run both inserts in a transaction, falling back once per service on standalone servers."""
+        if self._transactions_supported is not False:
+            try:
+                with self.db.client.start_session() as session:
+                    _id = session.with_transaction(lambda s: self._insert_user_documents(data, role, session=s))
+                self._transactions_supported = True
+                return _id
+            except DuplicateKeyError:
+                raise
+            except OperationFailure as e:
+                if e.code != ILLEGAL_OPERATION:
+                    raise
+            except (ConfigurationError, NotImplementedError):
+                pass
+            logger.warning("MongoDB deployment does not support transactions; creating users without them")
+            self._transactions_supported = False
+            data.pop("_id", None)
+        return self._insert_user_with_compensation(data, role)
 
+    @staticmethod
+    def _duplicate_user_error(error: DuplicateKeyError, data: dict) -> BadRequestError:
+        if duplicate_key_field(error.details, str(error)) == "email":
+            return BadRequestError(message="Email already exists", details={"email": data.get("email")}, user_message="The email is  already registered. Please choose another.", status_code=400)
+        return BadRequestError(message="Username already exists", details={"username": data.get("username")}, user_message="The username is already teken. Please choose another.", status_code=400)
 
     def create_user(self, data: dict) -> UserModel:  
         data["created_at"] = datetime.utcnow()
         if "password" in data and data["password"]:
-            data["password"] = generate_password_hash(data["password"])
-        username = data.get("username")
-        email = data.get("email")
+            data["password"] = self._password_hasher.hash(data["password"])
         role = data.get("role", Role.STUDENT.value)
 
         if role not in [r.value for r in Role]:
             raise BadRequestError(message="Invalid role provided", details={"role": role}, user_message="The specified user role is invalid.", status_code=400)
         try:
-            if username and self.collection.find_one({"username": username}):
-                raise BadRequestError(message="Username already exists", details={"username": username}, user_message="The username is already teken. Please choose another.", status_code=400)
-            if email and self.collection.find_one({"email": email}):
-                raise BadRequestError(message="Email already exists", details={"email": email}, user_message="The email is  already registered. Please choose another.", status_code=400)
-            result = self.collection.insert_one(data)
-            if not result.acknowledged:
-                raise InternalServerError(message="Failed to create user in database", details={"data": data}, status_code=500)
-            _id = result.inserted_id
-            self._create_role_specific_data(_id, role)
+            try:
+                _id = self._insert_user(data, role)
+            except DuplicateKeyError as e:
+                raise self._duplicate_user_error(e, data)
+            self._search_index.index_user({**data, "_id": _id})
+            self._user_repo.stats.record_created(role, data["created_at"])
+            events.emit(USER_CREATED, user_id=_id, role=role)
             data["id"] = str(_id)
             data.pop("password", None)  
             to_model = self._to_user(data)
@@ -153,7 +214,29 @@ class MongoUserService(UserService):
         except AppBaseException:
             raise 
         except Exception as e:
-            raise InternalServerError(message="Failed to create user", cause=e, details={"data": data}, status_code=500, severity=ErrorSeverity.HIGH, category=ErrorCategory.DATABASE)
+            raise InternalServerError(message="Failed to create user", cause=e, details={"username": data.get("username"), "role": role}, status_code=500, severity=ErrorSeverity.HIGH, category=ErrorCategory.DATABASE)
+
+    def authenticate(self, username: str, password: str) -> UserModel:
+        """Verify credentials; hashes made with outdated parameters are upgraded in the background."""
+        user_data = self.collection.find_one({"username": username})
+        pwhash = user_data.get("password") if user_data else None
+        if not self._password_hasher.verify(pwhash, password):
+            raise UnauthorizedError(
+                message="Invalid username or password",
+                user_message="Invalid username or password.",
+                severity=ErrorSeverity.LOW,
+                category=ErrorCategory.AUTHENTICATION,
+            )
+        if self._password_hasher.needs_rehash(pwhash):
+            user_id = user_data["_id"]
+            self._password_hasher.rehash_in_background(
+                password, lambda new_hash: self.collection.update_one({"_id": user_id, "password": pwhash}, {"$set": {"password": new_hash}})
+            )
+        user_data.pop("password", None)
+        user = self._to_user(user_data)
+        if user is None:
+            raise InternalServerError(message="Stored user document is invalid", details={"username": username})
+        return user
 
     def patch_user(self, _id: Union[str, ObjectId], update_data: Dict[str, Any]) -> Optional[UserModel]:
         if not update_data:
@@ -167,7 +250,7 @@ class MongoUserService(UserService):
         user_id = self._validate_object_id(_id)
         update_data = self._prepare_safe_update(update_data)
         if update_data.get("password"):
-            update_data["password"] = generate_password_hash(update_data["password"])
+            update_data["password"] = self._password_hasher.hash(update_data["password"])
         existing_user = self.collection.find_one({"_id": user_id})
         if not existing_user:
             raise NotFoundError(
@@ -210,6 +293,9 @@ class MongoUserService(UserService):
             if result.matched_count > 0:
                 updated_user = self.collection.find_one({"_id": user_id})
                 if updated_user:
+                    if "username" in update_data or "email" in update_data:
+                        self._search_index.index_user(updated_user)
+                    events.emit(USER_UPDATED, user_id=user_id, fields=list(update_data))
                     return self._to_user(updated_user)
                 raise NotFoundError(message="User not found", resource_type="User", resource_id=str(user_id), user_message="User not found in the system.", status_code=404, severity=ErrorSeverity.LOW, category=ErrorCategory.DATABASE)
             raise InternalServerError(
@@ -225,8 +311,11 @@ class MongoUserService(UserService):
 
     def delete_user(self, _id: str) -> Literal[True]:
         validated_id = self._validate_object_id(_id)
-        result = self.collection.delete_one({"_id": validated_id})
-        if result.deleted_count > 0:
+        deleted = self.collection.find_one_and_delete({"_id": validated_id}, projection={"role": 1, "created_at": 1})
+        if deleted is not None:
+            self._search_index.remove_user(validated_id)
+            self._user_repo.stats.record_deleted(deleted.get("role"), deleted.get("created_at"))
+            events.emit(USER_DELETED, user_id=validated_id, role=deleted.get("role"))
             return True
         raise InternalServerError(
             message="User deletion failed; no documents deleted.",
@@ -293,5 +382,6 @@ class MongoUserService(UserService):
 
   
 def get_user_service(db: Database) -> MongoUserService:
-    user_repo = UserRepositoryImpl(db)
-    return  MongoUserService(db, user_repo)
\ No newline at end of file
+    search_index = UserSearchIndex(db)
+    user_repo = UserRepositoryImpl(db, search_index)
+    return  MongoUserService(db, user_repo, search_index=search_index)
\ No newline at end of file
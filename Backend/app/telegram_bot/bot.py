@@ -5,21 +5,20 @@ from telegram import Update
 from telegram.error import Conflict
 from config import Config
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 app = ApplicationBuilder().token(Config.TELEGRAM_BOT_TOKEN).build()
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    logger.info(f"Received /start from user {update.effective_user.id}")
+    logger.info("Received /start from user %s", update.effective_user.id)
     await update.message.reply_text("Hello! The bot is running with Flask and threading.")
 
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    logger.info(f"Received /help from user {update.effective_user.id}")
+    logger.info("Received /help from user %s", update.effective_user.id)
     await update.message.reply_text("This is the help command. Use /start to begin.")
 
 async def hello(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    logger.info(f"Received /hello from user {update.effective_user.id}")
+    logger.info("Received /hello from user %s", update.effective_user.id)
     await update.message.reply_text("ក្លាហាន")
 
 app.add_handler(CommandHandler("start", start))
@@ -37,7 +36,7 @@ def run_telegram_bot():
     except Conflict:
         logger.error("Conflict error: Another bot instance is running. Please stop other instances.")
     except Exception as e:
-        logger.error(f"Unexpected error: {e}")
+        logger.error("Unexpected error: %s", e)
     finally:
         loop.close()
 
@@ -0,0 +1,9 @@
+import pytest
+from app.utils.cache import analytics_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_analytics_cache():
+    analytics_cache.invalidate()
+    yield
+    analytics_cache.invalidate()
@@ -0,0 +1,183 @@
+import asyncio
+import json
+from datetime import datetime
+import pytest
+from flask import Flask, jsonify
+from mongomock import MongoClient
+import app.asgi as asgi_module
+from app.asgi import AsyncReadApp
+from app.auth.jwt_utils import create_access_token, token_revocations
+from app.error.error_handlers import register_error_handlers
+from app.logging_config import REQUEST_ID_HEADER
+from app.repositories.user_repository import UserRepositoryImpl
+from app.repositories.user_stats_repository import UserStatsRepository
+from app.utils.json_provider import FastJSONProvider
+
+
+class _AsyncCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def batch_size(self, n):
+        self._cursor = self._cursor.batch_size(n)
+        return self
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._cursor)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def to_list(self, length=None):
+        return list(self._cursor)
+
+
+class _AsyncCollection:
+    def __init__(self, collection):
+        self._collection = collection
+
+    def find(self, *args, **kwargs):
+        return _AsyncCursor(self._collection.find(*args, **kwargs))
+
+    async def find_one(self, *args, **kwargs):
+        return self._collection.find_one(*args, **kwargs)
+
+    async def aggregate(self, pipeline, **kwargs):
+        return _AsyncCursor(iter(self._collection.aggregate(pipeline, **kwargs)))
+
+
+class _AsyncDatabase:
+    """The slice of ``AsyncDatabase`` the async repositories use, over mongomock."""
+
+    def __init__(self, db):
+        self._db = db
+
+    def __getitem__(self, name):
+        return _AsyncCollection(self._db[name])
+
+
+@pytest.fixture
+def db(monkeypatch):
+    mock_db = MongoClient()["test_db"]
+    monkeypatch.setattr(asgi_module.async_mongo, "get_db", lambda name=None: _AsyncDatabase(mock_db))
+    monkeypatch.setattr(token_revocations, "_collection_provider", lambda: mock_db["revoked_tokens"])
+    return mock_db
+
+
+@pytest.fixture
+def asgi_app(db):
+    flask_app = Flask(__name__)
+    flask_app.json = FastJSONProvider(flask_app)
+    register_error_handlers(flask_app)
+    from app.logging_config import _bind_request_id, _echo_request_id
+    flask_app.before_request(_bind_request_id)
+    flask_app.after_request(_echo_request_id)
+
+    @flask_app.route("/api/admin/users", methods=["POST"])
+    def create_user():
+        return jsonify({"via": "flask"}), 201
+
+    return AsyncReadApp(flask_app)
+
+
+def _call(app, method, path, headers=None, query_string=b""):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 1234),
+        "root_path": "",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query_string,
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+    }
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    start = sent[0]
+    body = b"".join(m.get("body", b"") for m in sent[1:])
+    return start["status"], {k.decode(): v.decode() for k, v in start["headers"]}, body
+
+
+def _auth(role, **claims):
+    return {"Authorization": "Bearer " + create_access_token({"role": role, **claims})}
+
+
+def test_admin_list_streams_the_envelope(asgi_app, db):
+    db.users.insert_many([{"username": f"u{i}", "email": f"u{i}@x.io", "role": "student", "password": "secret1"} for i in range(3)])
+    status, headers, body = _call(asgi_app, "GET", "/api/admin/", _auth("admin"), b"fields=username")
+    payload = json.loads(body)
+    assert status == 200 and headers["x-accel-buffering"] == "no"
+    assert payload["success"] is True and payload["message"] == "Users fetched successfully"
+    assert [user["username"] for user in payload["data"]] == ["u0", "u1", "u2"]
+    assert all("password" not in user for user in payload["data"])
+
+
+def test_ndjson_and_empty_message(asgi_app):
+    status, headers, body = _call(asgi_app, "GET", "/api/admin/", {**_auth("admin"), "Accept": "application/x-ndjson"})
+    assert status == 200 and headers["content-type"].startswith("application/x-ndjson") and body == b""
+    _, _, body = _call(asgi_app, "GET", "/api/admin/", _auth("admin"))
+    assert json.loads(body)["message"] == "No users found"
+
+
+def test_auth_denials_match_role_required(asgi_app):
+    status, _, body = _call(asgi_app, "GET", "/api/admin/users/count-by-role")
+    assert status == 401 and json.loads(body) == {"msg": "Missing or invalid token"}
+    status, _, body = _call(asgi_app, "GET", "/api/admin/users/count-by-role", _auth("student"))
+    assert status == 403 and json.loads(body) == {"msg": "Access denied: role not allowed"}
+
+
+def test_stats_from_rollup(asgi_app, db):
+    stats = UserStatsRepository(db)
+    for day, role in [(1, "student"), (1, "teacher"), (2, "student")]:
+        stats.record_created(role, datetime(2025, 5, day, 12))
+    _, _, body = _call(asgi_app, "GET", "/api/admin/users/count-by-role", _auth("admin"))
+    assert json.loads(body)["data"] == {"student": 2, "teacher": 1, "admin": 0}
+    _, _, body = _call(asgi_app, "GET", "/api/admin/users/growth-stats", _auth("admin"), b"start_date=2025-05-01&end_date=2025-05-02")
+    assert [row["count"] for row in json.loads(body)["data"]] == [2, 1]
+
+
+def test_app_errors_use_flask_handlers(asgi_app):
+    status, headers, body = _call(asgi_app, "GET", "/api/admin/users/detail/not-an-id", {**_auth("admin"), REQUEST_ID_HEADER: "req-1"})
+    payload = json.loads(body)
+    assert status == 400 and payload["error_code"]
+    assert headers["x-request-id"] == "req-1" and int(headers["content-length"]) == len(body)
+
+
+def test_user_detail_matches_sync_repository(asgi_app, db):
+    user_id = db.users.insert_one({"username": "t1", "role": "teacher"}).inserted_id
+    db.teacher.insert_one({"_id": user_id, "teacher_info": {"subjects": ["Math"]}})
+    status, _, body = _call(asgi_app, "GET", f"/api/admin/users/detail/{user_id}", _auth("admin"))
+    detail, expected = json.loads(body)["data"], UserRepositoryImpl(db).find_user_detail(user_id)
+    assert status == 200 and detail["role"] == expected["role"] == "teacher"
+    assert detail["data"]["teacher_info"]["subjects"] == expected["data"]["teacher_info"]["subjects"] == ["Math"]
+    orphan = db.users.insert_one({"username": "s1", "role": "student"}).inserted_id
+    status, _, _ = _call(asgi_app, "GET", f"/api/admin/users/detail/{orphan}", _auth("admin"))
+    assert status == 404
+
+
+def test_public_class_lookup_and_not_found(asgi_app, db):
+    class_id = db.classes.insert_one({"max_students": 30}).inserted_id
+    status, _, body = _call(asgi_app, "GET", f"/api/teacher/classes/{class_id}")
+    assert status == 200 and json.loads(body)["data"]["max_students"] == 30
+    status, _, _ = _call(asgi_app, "GET", "/api/teacher/classes/" + "0" * 24)
+    assert status == 404
+
+
+def test_other_requests_fall_back_to_flask(asgi_app):
+    status, headers, body = _call(asgi_app, "POST", "/api/admin/users", {REQUEST_ID_HEADER: "req-2"})
+    assert status == 201 and json.loads(body) == {"via": "flask"}
+    assert headers["x-request-id"] == "req-2"
@@ -0,0 +1,97 @@
+from datetime import datetime
+from unittest.mock import MagicMock
+from mongomock import MongoClient
+import pytest
+from app.repositories.user_repository import UserRepositoryImpl
+from app.repositories.user_stats_repository import UserStatsRepository
+from app.services.user_service import MongoUserService
+from app.utils.cache import TTLCache, cached, _MISSING
+from app.utils.events import EventBus
+from app.error.exceptions import InternalServerError
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    @cached("demo", "CACHE_TTL_DEMO", default_ttl=60, cache=TTLCache())
+    def compute(self, start, end=None, roles=None):
+        self.calls += 1
+        return {"start": start, "end": end}
+
+
+def test_cached_normalizes_positional_and_keyword_args():
+    counter = Counter()
+    counter.compute("a", "b")
+    counter.compute(start="a", end="b")
+    counter.compute("a", end="b")
+    assert counter.calls == 1
+    counter.compute("a", "c")
+    assert counter.calls == 2
+
+
+def test_cached_accepts_unhashable_args_and_returns_copies():
+    counter = Counter()
+    first = counter.compute("a", roles=["x", "y"])
+    first["start"] = "mutated"
+    assert counter.compute("a", roles=["x", "y"])["start"] == "a"
+    assert counter.calls == 1
+
+
+def test_ttl_expiry_and_stats(monkeypatch):
+    cache = TTLCache()
+    clock = [100.0]
+    monkeypatch.setattr("app.utils.cache.time.monotonic", lambda: clock[0])
+    cache.set(("ns", 1), "value", ttl=10)
+    assert cache.get(("ns", 1)) == "value"
+    clock[0] = 111.0
+    assert cache.get(("ns", 1)) is _MISSING
+    assert cache.stats()["namespaces"]["ns"] == {"hits": 1, "misses": 1, "invalidations": 0, "hit_ratio": 0.5}
+
+
+def test_max_entries_evicts_oldest():
+    cache = TTLCache(max_entries=2)
+    for i in range(3):
+        cache.set(("ns", i), i, ttl=60)
+    assert cache.stats()["entries"] == 2
+    assert cache.get(("ns", 2)) == 2
+
+
+def test_event_bus_isolates_failing_handlers():
+    bus, seen = EventBus(), []
+    bus.subscribe("e", lambda **_: 1 / 0)
+    bus.subscribe("e", lambda **payload: seen.append(payload))
+    bus.emit("e", user_id=1)
+    assert seen == [{"user_id": 1}]
+
+
+@pytest.fixture
+def mock_db():
+    return MongoClient()["test_db"]
+
+
+def test_user_writes_invalidate_role_counts(mock_db):
+    stats = UserStatsRepository(mock_db)
+    user_repo = UserRepositoryImpl(mock_db, stats=stats)
+    service = MongoUserService(mock_db, user_repo, search_index=MagicMock())
+    user_id = mock_db.users.insert_one({"username": "t", "role": "teacher", "created_at": datetime(2025, 5, 1)}).inserted_id
+    stats.record_created("teacher", datetime(2025, 5, 1))
+
+    assert user_repo.count_users_by_role()["teacher"] == 1
+    stats.record_created("teacher", datetime(2025, 5, 2))
+    assert user_repo.count_users_by_role()["teacher"] == 1  # served from cache
+
+    service.delete_user(str(user_id))
+    assert user_repo.count_users_by_role()["teacher"] == 1  # 2 recorded - 1 deleted, recomputed
+
+
+def test_role_count_failures_are_not_cached(mock_db):
+    stats = UserStatsRepository(mock_db)
+    user_repo = UserRepositoryImpl(mock_db, stats=stats)
+    stats.record_created("teacher", datetime(2025, 5, 1))
+    real_totals = stats.role_totals
+    stats.role_totals = MagicMock(side_effect=RuntimeError("mongo down"))
+    with pytest.raises(InternalServerError):
+        user_repo.count_users_by_role()
+    stats.role_totals = real_totals
+    assert user_repo.count_users_by_role()["teacher"] == 1
@@ -0,0 +1,39 @@
+import threading
+from unittest.mock import MagicMock
+from app.container import ServiceContainer, build_container
+from app.services.user_service import MongoUserService
+from app.services.teacher_service import MongoTeacherService
+
+
+def test_factory_runs_once_across_threads():
+    calls = []
+    container = ServiceContainer()
+    container.register("svc", lambda c: calls.append(1) or object())
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(container.get("svc"))) for _ in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_override_is_scoped():
+    container = ServiceContainer()
+    container.register("svc", lambda c: "real")
+    with container.override("svc", "fake"):
+        assert container.get("svc") == "fake"
+    assert container.get("svc") == "real"
+
+
+def test_teacher_service_shares_injected_singletons():
+    container = build_container()
+    with container.override("db", MagicMock()):
+        teacher_service = container.teacher_service
+        assert isinstance(teacher_service, MongoTeacherService)
+        assert isinstance(container.user_service, MongoUserService)
+        assert teacher_service.user_service is container.user_service
+        assert teacher_service.classes_service is container.classes_service
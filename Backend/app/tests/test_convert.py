@@ -0,0 +1,66 @@
+from datetime import datetime
+from bson import ObjectId
+from pydantic import BaseModel, HttpUrl
+from app.utils.convert import to_json_compatible
+from app.utils.pyobjectid import PyObjectId
+
+
+def test_converts_nested_values():
+    oid = ObjectId()
+    when = datetime(2025, 1, 2, 3, 4, 5)
+    data = {"_id": oid, "meta": {"created_at": when, "tags": ["a", oid]}, "n": 1}
+    assert to_json_compatible(data) == {
+        "_id": str(oid),
+        "meta": {"created_at": when.isoformat(), "tags": ["a", str(oid)]},
+        "n": 1,
+    }
+
+
+def test_untouched_data_is_returned_as_is():
+    data = {"name": "x", "items": [1, 2.5, None, True, {"k": "v"}]}
+    assert to_json_compatible(data) is data
+
+
+def test_copy_on_write_shares_untouched_subtrees_and_keeps_input():
+    oid = ObjectId()
+    clean = {"k": [1, 2]}
+    data = {"_id": oid, "clean": clean, "dirty": [oid]}
+    result = to_json_compatible(data)
+    assert result is not data
+    assert result["clean"] is clean
+    assert data["_id"] is oid and data["dirty"] == [oid]
+
+
+def test_in_place_rewrites_containers():
+    oid = ObjectId()
+    inner = [oid]
+    data = {"_id": oid, "inner": inner}
+    result = to_json_compatible(data, in_place=True)
+    assert result is data
+    assert data == {"_id": str(oid), "inner": [str(oid)]}
+    assert data["inner"] is inner
+
+
+def test_subclasses_and_urls():
+    class Link(BaseModel):
+        url: HttpUrl
+
+    url = Link(url="https://example.com/a").url
+    oid = PyObjectId()
+    result = to_json_compatible([oid, url])
+    assert all(isinstance(value, str) for value in result)
+    assert result[0] == str(oid)
+    assert result[1] == "https://example.com/a"
+
+
+def test_deep_nesting_does_not_recurse():
+    oid = ObjectId()
+    data = leaf = {}
+    for _ in range(5000):
+        leaf["child"] = {}
+        leaf = leaf["child"]
+    leaf["_id"] = oid
+    result = to_json_compatible(data)
+    for _ in range(5000):
+        result = result["child"]
+    assert result == {"_id": str(oid)}
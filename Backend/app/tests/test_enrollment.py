@@ -0,0 +1,179 @@
+import pytest
+from bson import ObjectId
+from mongomock import MongoClient
+from app.database.indexes import ensure_indexes
+from app.enums.status import EnrollmentStatus
+from app.error.exceptions import BadRequestError, BusinessLogicError, DatabaseError, NotFoundError, ValidationError
+from app.models.enrollment import EnrollmentModel
+from app.repositories.enrollment_repository import EnrollmentRepository, summarize_enrollments
+from app.services.classes_service import MongoClassesService
+
+
+@pytest.fixture
+def mock_db():
+    db = MongoClient()["test_db"]
+    ensure_indexes(db, [EnrollmentModel])
+    return db
+
+
+@pytest.fixture
+def service(mock_db):
+    return MongoClassesService(mock_db, max_bulk_items=20)
+
+
+def _roster(mock_db, class_id):
+    return sorted(row["student_id"] for row in mock_db.enrollments.find({"class_id": class_id}))
+
+
+def test_bulk_enroll_stops_at_capacity(service, mock_db):
+    existing, *new = [ObjectId() for _ in range(4)]
+    small = mock_db.classes.insert_one({"max_students": 2, "enrolled_count": 1}).inserted_id
+    mock_db.enrollments.insert_one({"class_id": small, "student_id": existing})
+    default = mock_db.classes.insert_one({}).inserted_id
+    missing = ObjectId()
+
+    results = service.enroll_students([str(existing)] + [str(s) for s in new], [str(small), str(default), str(missing)])
+
+    by_class = {}
+    for result in results:
+        by_class.setdefault(result["class_id"], []).append(result["status"])
+    assert by_class[str(small)] == [
+        EnrollmentStatus.ALREADY_ENROLLED, EnrollmentStatus.ENROLLED, EnrollmentStatus.CLASS_FULL, EnrollmentStatus.CLASS_FULL,
+    ]
+    assert by_class[str(default)] == [EnrollmentStatus.ENROLLED] * 4
+    assert by_class[str(missing)] == [EnrollmentStatus.CLASS_NOT_FOUND] * 4
+    assert _roster(mock_db, small) == sorted([existing, new[0]])
+    assert mock_db.classes.find_one({"_id": small})["enrolled_count"] == 2
+    assert mock_db.classes.find_one({"_id": default})["enrolled_count"] == 4
+    assert mock_db.enrollments.count_documents({"class_id": missing}) == 0
+    assert summarize_enrollments(results) == {"already_enrolled": 1, "enrolled": 5, "class_full": 2, "class_not_found": 4}
+
+
+def test_bulk_unenroll_keeps_counter_in_step(service, mock_db):
+    a, b = ObjectId(), ObjectId()
+    class_id = mock_db.classes.insert_one({"max_students": 5}).inserted_id
+    service.enroll_students([str(a)], [str(class_id)])
+    results = service.unenroll_students([str(a), str(b)], [str(class_id), str(ObjectId())])
+    assert [r["status"] for r in results] == [
+        EnrollmentStatus.UNENROLLED, EnrollmentStatus.NOT_ENROLLED, EnrollmentStatus.CLASS_NOT_FOUND, EnrollmentStatus.CLASS_NOT_FOUND,
+    ]
+    assert _roster(mock_db, class_id) == []
+    assert mock_db.classes.find_one({"_id": class_id})["enrolled_count"] == 0
+
+
+def test_bulk_limits(service):
+    with pytest.raises(BadRequestError):
+        service.enroll_students([str(ObjectId()) for _ in range(5)], [str(ObjectId()) for _ in range(5)])
+    with pytest.raises(Exception):
+        service.enroll_students([], [str(ObjectId())])
+
+
+def test_single_enroll_enforces_capacity(service, mock_db):
+    class_id = mock_db.classes.insert_one({"max_students": 1}).inserted_id
+    first, second = ObjectId(), ObjectId()
+    assert service.enroll_student_to_class(str(first), str(class_id)).enrolled_count == 1
+    assert service.enroll_student_to_class(str(first), str(class_id)).enrolled_count == 1
+    with pytest.raises(BusinessLogicError) as exc:
+        service.enroll_student_to_class(str(second), str(class_id))
+    assert exc.value.status_code == 409
+    with pytest.raises(NotFoundError):
+        service.enroll_student_to_class(str(first), str(ObjectId()))
+    assert service.unenroll_student_from_class(str(first), str(class_id)).enrolled_count == 0
+    assert _roster(mock_db, class_id) == []
+
+
+def test_roster_and_schedule_pages(service, mock_db):
+    students = sorted(ObjectId() for _ in range(5))
+    classes = [mock_db.classes.insert_one({"max_students": 10, "class_info": None}).inserted_id for _ in range(3)]
+    service.enroll_students([str(s) for s in students], [str(c) for c in classes])
+
+    seen, cursor = [], None
+    while True:
+        page = service.find_class_roster(str(classes[0]), 2, cursor)
+        seen.extend(row["student_id"] for row in page["students"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == students
+
+    first = service.find_student_schedule(str(students[0]), 2)
+    rest = service.find_student_schedule(str(students[0]), 2, first["next_cursor"])
+    assert [str(c.id) for c in first["classes"] + rest["classes"]] == sorted(str(c) for c in classes)
+    assert rest["next_cursor"] is None
+
+
+def test_migrate_embedded_arrays(mock_db):
+    a, b, c = ObjectId(), ObjectId(), ObjectId()
+    full = mock_db.classes.insert_one({"students_enrolled": [a, str(b), "bogus"]}).inserted_id
+    empty = mock_db.classes.insert_one({"max_students": 3}).inserted_id
+    stale = mock_db.classes.insert_one({"max_students": 3, "enrolled_count": 2}).inserted_id
+    mock_db.student.insert_one({"_id": c, "student_info": {"student_id": "S1", "class_ids": [str(full)]}})
+    mock_db.student.insert_one({"_id": a, "student_info": {"student_id": "S2", "class_ids": [str(full)]}})
+
+    repo = EnrollmentRepository(mock_db)
+    report = repo.migrate_embedded(batch_size=2)
+    assert report == {"inserted": 3, "skipped": 1, "classes": 1}
+    assert _roster(mock_db, full) == sorted([a, b, c])
+    assert mock_db.classes.find_one({"_id": full}) == {"_id": full, "enrolled_count": 3}
+    assert mock_db.classes.find_one({"_id": empty})["enrolled_count"] == 0
+    assert mock_db.classes.find_one({"_id": stale})["enrolled_count"] == 0
+    assert "class_ids" not in mock_db.student.find_one({"_id": c})["student_info"]
+    mock_db.classes.update_one({"_id": empty}, {"$set": {"enrolled_count": 5}})
+    assert repo.migrate_embedded()["inserted"] == 0
+    assert mock_db.classes.find_one({"_id": full})["enrolled_count"] == 3
+    assert mock_db.classes.find_one({"_id": empty})["enrolled_count"] == 0
+
+
+def test_enrolled_count_is_server_owned(service, mock_db):
+    teacher = ObjectId()
+    info = {"course_code": "CS101", "course_title": "Intro", "lecturer": "Dr. A", "phone_number": "1"}
+    created = service.create_classes(teacher, {"class_info": info, "max_students": 1, "enrolled_count": 99})
+    assert created.enrolled_count == 0
+    service.enroll_student_to_class(str(ObjectId()), str(created.id))
+
+    updated = service.update_classes(created.id, {"max_students": 1, "enrolled_count": 0})
+    assert updated.enrolled_count == 1
+    assert service.update_classes(created.id, {"class_info": {**info, "course_title": "Intro II"}}).max_students == 1
+    with pytest.raises(BusinessLogicError) as exc:
+        service.enroll_student_to_class(str(ObjectId()), str(created.id))
+    assert exc.value.status_code == 409
+    with pytest.raises(ValidationError):
+        service.update_classes(created.id, {"students_enrolled": [str(ObjectId())]})
+    with pytest.raises(ValidationError):
+        service.create_classes(teacher, [{"class_info": info, "students_enrolled": []}])
+
+
+def test_bulk_enroll_past_pipeline_stage_limit(mock_db):
+    service = MongoClassesService(mock_db)
+    students = [str(ObjectId()) for _ in range(1500)]
+    class_id = mock_db.classes.insert_one({"max_students": 1200}).inserted_id
+    statuses = summarize_enrollments(service.enroll_students(students, [str(class_id)]))
+    assert statuses == {"enrolled": 1200, "class_full": 300}
+    assert mock_db.classes.find_one({"_id": class_id})["enrolled_count"] == 1200
+    assert mock_db.enrollments.count_documents({"class_id": class_id}) == 1200
+
+
+def test_unmigrated_class_is_counted_and_readable(service, mock_db):
+    a, b = ObjectId(), ObjectId()
+    class_id = mock_db.classes.insert_one({"max_students": 3, "students_enrolled": [a, b]}).inserted_id
+    statuses = summarize_enrollments(service.enroll_students([str(ObjectId()), str(ObjectId())], [str(class_id)]))
+    assert statuses == {"enrolled": 1, "class_full": 1}
+    with pytest.raises(BusinessLogicError):
+        service.enroll_student_to_class(str(ObjectId()), str(class_id))
+    assert [c.id for c in service.find_classes_by_teacher_id(str(ObjectId()))] == []
+    mock_db.classes.update_one({"_id": class_id}, {"$set": {"created_by": a}})
+    assert [str(c.id) for c in service.find_classes_by_teacher_id(str(a))] == [str(class_id)]
+
+
+def test_failed_insert_releases_reserved_seats(service, mock_db, monkeypatch):
+    class_id = mock_db.classes.insert_one({"max_students": 5}).inserted_id
+
+    def broken(*args, **kwargs):
+        raise DatabaseError(message="write failed")
+
+    monkeypatch.setattr(service.enrollments, "_insert_rows", broken)
+    with pytest.raises(DatabaseError):
+        service.enroll_students([str(ObjectId()), str(ObjectId())], [str(class_id)])
+    with pytest.raises(DatabaseError):
+        service.enroll_student_to_class(str(ObjectId()), str(class_id))
+    assert mock_db.classes.find_one({"_id": class_id})["enrolled_count"] == 0
@@ -0,0 +1,69 @@
+import logging
+import time
+import pytest
+from flask import Flask
+from app.error.error_handlers import register_error_handlers
+from app.error.error_log import ErrorLogSampler, error_log_sampler, parse_sample_rates
+from app.error.exceptions import ErrorSeverity, InternalServerError, NotFoundError
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["ERROR_LOG_SAMPLE_RATES"] = "NOTFOUNDERROR_ERROR=0"
+    register_error_handlers(app)
+    yield app
+    error_log_sampler.configure({})
+
+
+def test_constructing_an_exception_does_not_log(caplog):
+    with caplog.at_level(logging.DEBUG):
+        NotFoundError(message="User not found")
+        InternalServerError(message="boom", details={"data": "x" * 10000})
+    assert not caplog.records
+
+
+def test_handler_logs_once_with_truncated_details(app, caplog):
+    @app.route("/boom")
+    def boom():
+        raise InternalServerError(message="boom", details={"data": "x" * 10000, "rows": list(range(1000))})
+
+    with caplog.at_level(logging.INFO, logger="app.error"):
+        response = app.test_client().get("/boom")
+    assert response.status_code == 500
+    [record] = [r for r in caplog.records if r.name == "app.error"]
+    assert record.error_code == "INTERNALSERVERERROR_ERROR" and record.path == "/boom"
+    assert len(record.details) < 1000
+
+
+def test_sampled_out_codes_are_not_logged(app, caplog):
+    @app.route("/missing")
+    def missing():
+        raise NotFoundError(message="User not found")
+
+    with caplog.at_level(logging.INFO, logger="app.error"):
+        assert app.test_client().get("/missing").status_code == 404
+    assert not [r for r in caplog.records if r.name == "app.error"]
+
+
+def test_rate_cap_per_code_and_summary(caplog):
+    sampler = ErrorLogSampler(max_per_window=2, window=0.05)
+    results = [sampler.should_log("X", ErrorSeverity.HIGH) for _ in range(5)]
+    assert results == [True, True, False, False, False]
+    assert sampler.should_log("Y", ErrorSeverity.HIGH)
+    time.sleep(0.06)
+    with caplog.at_level(logging.WARNING, logger="app.error"):
+        assert sampler.should_log("X", ErrorSeverity.HIGH)
+    assert "Suppressed 3 X" in caplog.records[0].getMessage()
+    assert sampler.stats()["rate_limited"] == 3
+
+
+def test_sampling_spares_high_severity():
+    sampler = ErrorLogSampler(default_rate=0.0)
+    assert not sampler.should_log("A", ErrorSeverity.LOW)
+    assert sampler.should_log("A", ErrorSeverity.HIGH)
+
+
+def test_parse_sample_rates():
+    assert parse_sample_rates("A=0.5, B=0 ,junk") == {"A": 0.5, "B": 0.0}
+    assert parse_sample_rates(None) == {}
@@ -0,0 +1,42 @@
+import pytest
+from mongomock import MongoClient
+from app.database.indexes import ensure_indexes, diff_indexes, IndexSpec, ASCENDING
+from app.models.user import UserModel
+from app.models.classes import ClassesModel
+
+
+@pytest.fixture
+def mock_db():
+    client = MongoClient()
+    return client["test_db"]
+
+
+def test_ensure_indexes_is_idempotent(mock_db):
+    first = ensure_indexes(mock_db, [UserModel, ClassesModel])
+    second = ensure_indexes(mock_db, [UserModel, ClassesModel])
+
+    assert first == second
+    assert "username_unique" in first[UserModel._collection_name]
+    assert "created_by_1" in first[ClassesModel._collection_name]
+
+
+def test_diff_reports_missing_and_extra(mock_db):
+    mock_db[UserModel._collection_name].create_index([("legacy_field", ASCENDING)])
+
+    diffs = {diff.collection: diff for diff in diff_indexes(mock_db, [UserModel])}
+    users_diff = diffs[UserModel._collection_name]
+
+    assert set(users_diff.missing) == {spec.resolved_name for spec in UserModel._indexes}
+    assert users_diff.extra == ["legacy_field_1"]
+    assert not users_diff.in_sync
+
+
+def test_diff_in_sync_after_apply(mock_db):
+    ensure_indexes(mock_db, [ClassesModel])
+    diffs = diff_indexes(mock_db, [ClassesModel])
+    assert all(diff.in_sync for diff in diffs)
+
+
+def test_index_spec_default_name():
+    spec = IndexSpec(keys=(("created_at", ASCENDING), ("role", ASCENDING)))
+    assert spec.resolved_name == "created_at_1_role_1"
@@ -0,0 +1,95 @@
+import importlib
+import json
+import sys
+from datetime import date, datetime, timezone
+from enum import Enum
+import pytest
+from bson import ObjectId
+from flask import Flask, jsonify
+from pydantic import BaseModel, HttpUrl
+from app.enums.roles import Role
+from app.error.error_handlers import register_error_handlers
+from app.error.exceptions import NotFoundError
+from app.utils import json_provider
+from app.utils.json_provider import FastJSONProvider
+from app.utils.pyobjectid import PyObjectId
+
+OID = ObjectId("64b7f0c2a1b2c3d4e5f60718")
+
+
+class Color(Enum):
+    RED = "red"
+
+
+class Item(BaseModel):
+    id: PyObjectId
+    link: HttpUrl
+
+
+def _payload():
+    return {
+        "oid": OID,
+        "pyoid": PyObjectId(str(OID)),
+        "url": HttpUrl("https://example.com/x"),
+        "when": datetime(2025, 5, 1, 13, 45, tzinfo=timezone.utc),
+        "day": date(2025, 5, 1),
+        "role": Role.TEACHER,
+        "color": Color.RED,
+        "tags": {"a"},
+        "item": Item(id=PyObjectId(str(OID)), link="https://example.com"),
+        "nested": [{"oid": OID}],
+    }
+
+
+EXPECTED = {
+    "oid": str(OID),
+    "pyoid": str(OID),
+    "url": "https://example.com/x",
+    "when": "2025-05-01T13:45:00+00:00",
+    "day": "2025-05-01",
+    "role": "teacher",
+    "color": "red",
+    "tags": ["a"],
+    "item": {"id": str(OID), "link": "https://example.com/"},
+    "nested": [{"oid": str(OID)}],
+}
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    register_error_handlers(app)
+    return app
+
+
+def test_jsonify_handles_bson_and_pydantic_types(app):
+    with app.app_context():
+        response = jsonify(_payload())
+    assert json.loads(response.get_data()) == EXPECTED
+
+
+def test_unknown_types_still_raise(app):
+    with pytest.raises(TypeError):
+        app.json.dumps({"x": object()})
+
+
+def test_error_details_need_no_preconversion(app):
+    @app.route("/missing")
+    def missing():
+        raise NotFoundError(message="User not found", details={"user_id": OID})
+
+    body = app.test_client().get("/missing").json
+    assert body["details"]["user_id"] == str(OID)
+
+
+def test_stdlib_fallback_matches():
+    original = sys.modules.get("orjson")
+    sys.modules["orjson"] = None
+    try:
+        fallback = importlib.reload(json_provider)
+        assert fallback.orjson is None
+        assert json.loads(fallback.dumps_bytes(_payload())) == EXPECTED
+    finally:
+        sys.modules["orjson"] = original
+        importlib.reload(json_provider)
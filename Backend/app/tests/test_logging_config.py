@@ -0,0 +1,75 @@
+import json
+import logging
+import pytest
+from flask import Flask
+from app.logging_config import (
+    DeferredQueueHandler,
+    LoggingPipeline,
+    REQUEST_ID_HEADER,
+    init_logging,
+    logging_pipeline,
+    parse_logger_levels,
+)
+
+
+@pytest.fixture
+def pipeline():
+    pipeline = LoggingPipeline()
+    root = logging.getLogger()
+    level = root.level
+    yield pipeline
+    pipeline.stop()
+    root.removeHandler(pipeline._queue_handler)
+    root.setLevel(level)
+    logging.getLogger("noisy").setLevel(logging.NOTSET)
+
+
+def _lines(capsys):
+    return [json.loads(line) for line in capsys.readouterr().err.splitlines() if line.startswith("{")]
+
+
+def test_json_lines_with_extra_fields(pipeline, capsys):
+    pipeline.configure({"LOG_LEVEL": "INFO", "LOG_LEVELS": "noisy=ERROR"})
+    logging.getLogger("app.test").info("hello %s", "world", extra={"user_id": 7})
+    logging.getLogger("noisy").warning("dropped")
+    pipeline.stop()
+    [entry] = _lines(capsys)
+    assert entry["message"] == "hello world"
+    assert entry["user_id"] == 7 and entry["logger"] == "app.test" and entry["request_id"] == "-"
+
+
+def test_prepare_freezes_message_but_defers_formatting():
+    handler = DeferredQueueHandler(None)
+    args = {"n": 1}
+    record = logging.LogRecord("x", logging.INFO, "", 0, "value %(n)s", (args,), None)
+    prepared = handler.prepare(record)
+    args["n"] = 2
+    assert prepared.msg == "value 1" and prepared.args is None
+    assert not hasattr(prepared, "message") or prepared.message == "value 1"
+
+
+def test_request_id_is_propagated_and_echoed(capsys):
+    app = Flask(__name__)
+    app.config.update(LOG_LEVEL="INFO")
+
+    @app.route("/ping")
+    def ping():
+        logging.getLogger("app.test").info("in request")
+        return "ok"
+
+    try:
+        init_logging(app)
+        client = app.test_client()
+        given = client.get("/ping", headers={REQUEST_ID_HEADER: "abc-123"})
+        generated = client.get("/ping", headers={REQUEST_ID_HEADER: "bad id!"})
+        logging_pipeline.stop()
+    finally:
+        logging.getLogger().removeHandler(logging_pipeline._queue_handler)
+    assert given.headers[REQUEST_ID_HEADER] == "abc-123"
+    assert generated.headers[REQUEST_ID_HEADER] not in ("bad id!", "-")
+    ids = [entry["request_id"] for entry in _lines(capsys) if entry["message"] == "in request"]
+    assert ids == ["abc-123", generated.headers[REQUEST_ID_HEADER]]
+
+
+def test_parse_logger_levels():
+    assert parse_logger_levels("pymongo=warning, app.error=INFO,junk") == {"pymongo": "WARNING", "app.error": "INFO"}
@@ -0,0 +1,101 @@
+import logging
+import warnings
+import pytest
+from pydantic import BaseModel
+from app.error.exceptions import ValidationError as AppValidationError
+from app.utils.model_utils import ConversionStrategy, create_model_utils, _list_adapter
+
+
+class Item(BaseModel):
+    name: str
+    qty: int
+
+
+def test_to_model_list_validates_in_one_batch():
+    utils = create_model_utils()
+    models = utils.to_model_list([{"name": "a", "qty": 1}, {"name": "b", "qty": "2"}], Item)
+    assert [(m.name, m.qty) for m in models] == [("a", 1), ("b", 2)]
+    assert _list_adapter(Item) is _list_adapter(Item)
+
+
+def test_raise_on_invalid_reports_the_failing_item():
+    utils = create_model_utils()
+    with pytest.raises(AppValidationError) as exc:
+        utils.to_model_list([{"name": "a", "qty": 1}, {"name": "b", "qty": "x"}], Item)
+    assert "qty" in exc.value.details["raw_errors"][0]["loc"]
+
+
+@pytest.mark.parametrize("strategy", [ConversionStrategy.SKIP_INVALID, ConversionStrategy.LOG_AND_SKIP])
+def test_skip_strategies_isolate_bad_items_and_keep_order(strategy):
+    utils = create_model_utils(strategy=strategy)
+    data = [{"name": "a", "qty": 1}, {"name": "b"}, "not a dict", {"name": "c", "qty": 3}]
+    assert [m.name for m in utils.to_model_list(data, Item)] == ["a", "c"]
+
+
+def test_no_debug_dump_when_debug_is_off(monkeypatch, caplog):
+    dumped = []
+    monkeypatch.setattr(Item, "model_dump", lambda self, **kw: dumped.append(self) or {})
+    with caplog.at_level(logging.INFO, logger="app.utils.model_utils"):
+        create_model_utils().to_model({"name": "a", "qty": 1}, Item)
+    assert dumped == []
+    assert not caplog.records
+
+
+class Info(BaseModel):
+    code: str
+    items: list[Item] = []
+
+
+class Doc(BaseModel):
+    id: str | None = None
+    info: Info | None = None
+    model_config = {"populate_by_name": True}
+
+
+def _doc():
+    return {"info": {"code": "c1", "items": [{"name": "a", "qty": 1}]}}
+
+
+def test_trusted_builds_nested_models_without_validating(monkeypatch):
+    monkeypatch.setattr(Doc, "model_validate", classmethod(lambda cls, data: pytest.fail("validated")))
+    utils = create_model_utils(strategy=ConversionStrategy.TRUSTED)
+    doc = utils.to_model(_doc(), Doc)
+    assert isinstance(doc.info, Info) and isinstance(doc.info.items[0], Item)
+    assert doc.info.items[0].qty == 1
+    # garbage in, garbage out: trusted reads never reject
+    assert utils.to_model_list([{"info": {"code": 5}}], Doc)[0].info.code == 5
+
+
+def test_trusted_sampling_logs_schema_drift(caplog):
+    utils = create_model_utils(strategy=ConversionStrategy.TRUSTED, drift_sample_rate=1.0)
+    with caplog.at_level(logging.WARNING, logger="app.utils.model_utils"):
+        utils.to_model(_doc(), Doc)
+        assert not caplog.records
+        utils.to_model({"info": {"items": []}}, Doc)
+    assert "Schema drift" in caplog.records[0].getMessage()
+
+
+def test_reconfigure_applies_to_converters():
+    utils = create_model_utils(strategy=ConversionStrategy.TRUSTED)
+    utils.reconfigure(drift_sample_rate=0.5)
+    assert utils._converter.config.drift_sample_rate == 0.5
+    assert utils._objectid_validator.config.drift_sample_rate == 0.5
+
+
+def test_trusted_response_models_keep_stored_types():
+    from datetime import datetime
+    from bson import ObjectId
+    from app.models.classes import ClassesModel
+    stored = {
+        "_id": ObjectId(),
+        "created_by": ObjectId(),
+        "created_at": datetime(2025, 1, 2),
+        "class_info": {"course_code": "c", "course_title": "t", "lecturer": "l", "phone_number": "1", "link_telegram": "https://t.me/x"},
+    }
+    utils = create_model_utils(strategy=ConversionStrategy.TRUSTED)
+    model = utils.convert_to_response_model(stored, ClassesModel)
+    assert model.created_at == datetime(2025, 1, 2)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert model.model_dump()["class_info"]["link_telegram"] == model.class_info.link_telegram
+        assert model.model_dump(mode="json")["class_info"]["link_telegram"] == "https://t.me/x"
@@ -0,0 +1,44 @@
+import os
+import pytest
+from flask import Flask
+from app.database.client import MongoClientManager
+
+
+@pytest.fixture
+def manager():
+    app = Flask(__name__)
+    app.config.update(
+        DATABASE_URI="mongodb://localhost:27017",
+        MONGO_DB_NAME="test_db",
+        MONGO_MAX_POOL_SIZE=25,
+        MONGO_SERVER_SELECTION_TIMEOUT_MS=None,
+    )
+    manager = MongoClientManager()
+    manager.init_app(app)
+    yield manager
+    manager.close()
+
+
+def test_options_come_from_config(manager):
+    assert manager.client.options.pool_options.max_pool_size == 25
+    assert manager.get_db().name == "test_db"
+    assert "serverSelectionTimeoutMS" not in manager.pool_stats()["options"]
+
+
+def test_client_is_reused_within_a_process(manager):
+    assert manager.client is manager.client
+
+
+def test_client_is_rebuilt_after_fork(manager):
+    parent_client = manager.client
+    pid = os.fork()
+    if pid == 0:
+        os._exit(0 if manager._client is None and manager.client is not parent_client else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+    assert manager.client is parent_client
+
+
+def test_uninitialized_manager_raises():
+    with pytest.raises(RuntimeError):
+        MongoClientManager().client
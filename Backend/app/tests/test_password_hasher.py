@@ -0,0 +1,70 @@
+import pytest
+from unittest.mock import MagicMock
+from mongomock import MongoClient
+from app.auth.password_hasher import PasswordHasher
+from app.error.exceptions import RateLimitError, UnauthorizedError
+from app.repositories.user_repository import UserRepositoryImpl
+from app.repositories.user_stats_repository import UserStatsRepository
+from app.services.user_service import MongoUserService
+
+FAST = "pbkdf2:sha256:1000"
+
+
+def test_hash_and_verify_inline():
+    hasher = PasswordHasher(method=FAST, workers=0)
+    pwhash = hasher.hash("secret")
+    assert pwhash.startswith(FAST + "$")
+    assert hasher.verify(pwhash, "secret")
+    assert not hasher.verify(pwhash, "wrong")
+    assert not hasher.verify(None, "secret")
+
+
+def test_process_pool_hashes_batches():
+    hasher = PasswordHasher(method=FAST, workers=2)
+    try:
+        hashes = hasher.hash_many(["a", "b", "c"])
+        assert [hasher.verify(h, p) for h, p in zip(hashes, "abc")] == [True, True, True]
+    finally:
+        hasher.shutdown()
+
+
+def test_needs_rehash_tracks_method():
+    old = PasswordHasher(method="pbkdf2:sha256:1000", workers=0)
+    new = PasswordHasher(method="pbkdf2:sha256:2000", workers=0)
+    pwhash = old.hash("secret")
+    assert not old.needs_rehash(pwhash)
+    assert new.needs_rehash(pwhash)
+
+
+def test_capacity_exhausted_raises():
+    hasher = PasswordHasher(method=FAST, workers=0, max_pending=1, queue_timeout=0.01)
+    hasher._slots.acquire()
+    with pytest.raises(RateLimitError):
+        hasher.hash("secret")
+    assert hasher.rehash_in_background("secret", MagicMock()) is False
+
+
+@pytest.fixture
+def mock_db():
+    return MongoClient()["test_db"]
+
+
+def _service(db, method):
+    user_repo = UserRepositoryImpl(db, stats=UserStatsRepository(db))
+    return MongoUserService(db, user_repo, search_index=MagicMock(), password_hasher=PasswordHasher(method=method, workers=0))
+
+
+def test_authenticate_verifies_and_upgrades_hash(mock_db):
+    old_hash = PasswordHasher(method=FAST, workers=0).hash("secret")
+    mock_db.users.insert_one({"username": "alice", "password": old_hash, "role": "student"})
+    service = _service(mock_db, "pbkdf2:sha256:2000")
+
+    with pytest.raises(UnauthorizedError):
+        service.authenticate("alice", "wrong")
+    with pytest.raises(UnauthorizedError):
+        service.authenticate("nobody", "secret")
+
+    user = service.authenticate("alice", "secret")
+    assert user.username == "alice" and user.password is None
+    stored = mock_db.users.find_one({"username": "alice"})["password"]
+    assert stored.startswith("pbkdf2:sha256:2000$")
@@ -0,0 +1,36 @@
+import pytest
+from mongomock import MongoClient
+from app.error.exceptions import ValidationError
+from app.models.classes import ClassesModel
+from app.models.user import UserModel
+from app.repositories.user_repository import UserRepositoryImpl
+from app.utils.projection import parse_fields, to_projection
+
+
+def test_parse_fields_accepts_names_and_aliases():
+    assert parse_fields(None, UserModel) is None
+    assert parse_fields(" ", UserModel) is None
+    assert parse_fields("username, _id", UserModel) == {"id", "username"}
+    assert parse_fields("email", UserModel) == {"id", "email"}
+
+
+@pytest.mark.parametrize("raw", ["password", "username,nope"])
+def test_parse_fields_rejects_unknown_and_secret_fields(raw):
+    with pytest.raises(ValidationError):
+        parse_fields(raw, UserModel)
+
+
+def test_to_projection_uses_stored_names():
+    assert to_projection(None, UserModel) == {"password": 0}
+    assert to_projection(None, ClassesModel) is None
+    assert to_projection(frozenset({"id", "class_info"}), ClassesModel) == {"_id": 1, "class_info": 1}
+
+
+def test_iter_all_users_fetches_only_selected_fields():
+    db = MongoClient()["test_db"]
+    db.users.insert_one({"username": "alice", "email": "a@x.io", "password": "hash", "role": "teacher"})
+    fields = parse_fields("username", UserModel)
+    [user] = list(UserRepositoryImpl(db).iter_all_users(fields=fields))
+    assert user.email is None and user.password is None
+    dumped = user.model_dump(include=fields, exclude={"password"}, by_alias=True)
+    assert set(dumped) == {"_id", "username"}
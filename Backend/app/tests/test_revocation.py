@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta, timezone
+import jwt
+import pytest
+from flask import Flask
+from mongomock import MongoClient
+from app.auth.jwt_utils import create_access_token, decode_access_token, role_required, verified_token_cache
+from app.auth.revocation import TokenRevocationList, token_id
+
+
+@pytest.fixture
+def collection():
+    return MongoClient()["test_db"]["revoked_tokens"]
+
+
+def _expires(minutes=30):
+    return datetime.now(timezone.utc) + timedelta(minutes=minutes)
+
+
+def test_tokens_carry_unique_jti():
+    first = decode_access_token(create_access_token({"id": "1", "role": "admin"}))
+    second = decode_access_token(create_access_token({"id": "1", "role": "admin"}))
+    assert first["jti"] and first["jti"] != second["jti"]
+
+
+def test_token_id_falls_back_to_digest():
+    assert token_id("abc", {"jti": "j1"}) == "j1"
+    assert len(token_id("abc", {})) == 64
+
+
+def test_revocation_applies_locally_at_once(collection):
+    revocations = TokenRevocationList(lambda: collection, poll_interval=60)
+    revocations.revoke("j1", _expires(), user_id="u1")
+    assert revocations.is_revoked("j1")
+    assert collection.count_documents({"jti": "j1"}) == 1
+
+
+def test_other_workers_pick_up_revocations_on_next_poll(collection, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("app.auth.revocation.time.monotonic", lambda: clock[0])
+    worker_a = TokenRevocationList(lambda: collection, poll_interval=5)
+    worker_b = TokenRevocationList(lambda: collection, poll_interval=5)
+    assert not worker_b.is_revoked("j1")
+
+    worker_a.revoke("j1", _expires())
+    assert not worker_b.is_revoked("j1")  # inside the poll interval
+    clock[0] += 5
+    assert worker_b.is_revoked("j1")
+    assert worker_b.stats()["polls"] == 2
+
+
+def test_expired_revocations_are_dropped(collection):
+    revocations = TokenRevocationList(lambda: collection)
+    collection.insert_one({"jti": "old", "expires_at": datetime.utcnow() - timedelta(minutes=1), "revoked_at": datetime.utcnow()})
+    revocations.refresh()
+    assert revocations.stats()["entries"] == 0
+
+
+def test_poll_failure_keeps_last_known_list():
+    def broken():
+        raise RuntimeError("db down")
+    revocations = TokenRevocationList(broken)
+    revocations._revoked["j1"] = _expires().timestamp()
+    assert revocations.is_revoked("j1")
+    assert revocations.stats()["poll_failures"] == 1
+
+
+def test_role_required_rejects_revoked_token(collection, monkeypatch):
+    revocations = TokenRevocationList(lambda: collection)
+    monkeypatch.setattr("app.auth.jwt_utils.token_revocations", revocations)
+    verified_token_cache.clear()
+    app = Flask(__name__)
+
+    @app.route("/admin")
+    @role_required(["admin"])
+    def admin_only():
+        return {"ok": True}
+
+    token = create_access_token({"id": "1", "role": "admin"})
+    headers = {"Authorization": f"Bearer {token}"}
+    assert app.test_client().get("/admin", headers=headers).status_code == 200
+    claims = jwt.decode(token, options={"verify_signature": False})
+    revocations.revoke(claims["jti"], _expires())
+    response = app.test_client().get("/admin", headers=headers)
+    assert response.status_code == 401 and response.json["msg"] == "Token revoked"
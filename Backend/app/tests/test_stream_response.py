@@ -0,0 +1,65 @@
+import json
+import pytest
+from flask import Flask
+from mongomock import MongoClient
+from app.repositories.user_repository import UserRepositoryImpl
+from app.utils.response_utils import Response, NDJSON_MIMETYPE
+
+
+def _items(n):
+    for i in range(n):
+        yield {"i": i, "name": f"user{i}"}
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+
+    @app.route("/items/<int:n>")
+    def items(n):
+        return Response.stream_response(_items(n), message="Fetched", empty_message="Nothing")
+
+    @app.route("/broken")
+    def broken():
+        def failing():
+            raise RuntimeError("cursor failed")
+            yield
+        return Response.stream_response(failing())
+
+    return app.test_client()
+
+
+def test_default_mode_keeps_the_envelope(client):
+    response = client.get("/items/3000")
+    assert response.mimetype == "application/json" and response.is_streamed
+    body = json.loads(response.get_data())
+    assert body["success"] is True and body["message"] == "Fetched"
+    assert [item["i"] for item in body["data"]] == list(range(3000))
+
+
+def test_empty_stream_uses_empty_message(client):
+    assert json.loads(client.get("/items/0").get_data()) == {"success": True, "message": "Nothing", "data": []}
+
+
+def test_ndjson_mode(client):
+    response = client.get("/items/3", headers={"Accept": NDJSON_MIMETYPE})
+    assert response.mimetype == NDJSON_MIMETYPE
+    lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line)["i"] for line in lines] == [0, 1, 2]
+
+
+def test_wildcard_accept_gets_json(client):
+    assert client.get("/items/1", headers={"Accept": "*/*"}).mimetype == "application/json"
+
+
+def test_errors_before_first_item_surface_before_streaming(client):
+    response = client.get("/broken")
+    assert response.status_code == 500
+
+
+def test_iter_all_users_skips_password():
+    db = MongoClient()["test_db"]
+    db.users.insert_many([{"username": f"u{i}", "password": "hash", "role": "student"} for i in range(3)])
+    users = list(UserRepositoryImpl(db).iter_all_users(batch_size=2))
+    assert [user.username for user in users] == ["u0", "u1", "u2"]
+    assert all(user.password is None for user in users)
@@ -0,0 +1,62 @@
+from datetime import timedelta
+import pytest
+from flask import Flask, g
+from mongomock import MongoClient
+from app.auth.revocation import TokenRevocationList
+from app.auth.jwt_utils import create_access_token, role_required, verified_token_cache
+from app.auth.token_cache import VerifiedTokenCache
+
+
+@pytest.fixture
+def client(monkeypatch):
+    verified_token_cache.clear()
+    revoked = MongoClient()["test_db"]["revoked_tokens"]
+    monkeypatch.setattr("app.auth.jwt_utils.token_revocations", TokenRevocationList(lambda: revoked))
+    app = Flask(__name__)
+
+    @app.route("/admin")
+    @role_required(["admin"])
+    def admin_only():
+        return {"user": g.user}
+
+    return app.test_client()
+
+
+def _auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_role_required_serves_repeat_tokens_from_cache(client):
+    token = create_access_token({"id": "1", "role": "admin", "username": "root"})
+    before = verified_token_cache.stats()["hits"]
+    assert client.get("/admin", headers=_auth(token)).json["user"]["username"] == "root"
+    assert client.get("/admin", headers=_auth(token)).status_code == 200
+    assert verified_token_cache.stats()["hits"] == before + 1
+
+
+def test_cached_token_still_checks_role(client):
+    token = create_access_token({"id": "2", "role": "student"})
+    assert client.get("/admin", headers=_auth(token)).status_code == 403
+    assert client.get("/admin", headers=_auth(token)).status_code == 403
+
+
+def test_tampered_and_expired_tokens_are_rejected(client):
+    token = create_access_token({"id": "1", "role": "admin"})
+    assert client.get("/admin", headers=_auth(token[:-2] + "xx")).status_code == 401
+    expired = create_access_token({"id": "1", "role": "admin"}, expire_delta=timedelta(seconds=-1))
+    assert client.get("/admin", headers=_auth(expired)).status_code == 401
+
+
+def test_entries_expire_at_exp_and_lru_is_bounded(monkeypatch):
+    cache = VerifiedTokenCache(max_entries=2)
+    monkeypatch.setattr("app.auth.token_cache.time.time", lambda: 100.0)
+    cache.put("a", {"exp": 150})
+    cache.put("b", {"exp": 150})
+    cache.get("a")
+    cache.put("c", {"exp": 150})
+    assert cache.get("b") is None and cache.get("a") == {"exp": 150}
+    cache.put("d", {"exp": 90})
+    assert cache.get("d") is None
+    cache.put("no-exp", {"role": "admin"})
+    assert cache.get("no-exp") is None
+    assert cache.stats()["evictions"] >= 1
@@ -0,0 +1,79 @@
+import io
+import json
+import pytest
+from unittest.mock import MagicMock
+from mongomock import MongoClient
+from app.error.exceptions import BadRequestError
+from app.services.user_import_service import UserImportService, detect_format, iter_import_rows
+
+
+@pytest.fixture
+def mock_db():
+    db = MongoClient()["test_db"]
+    db.users.create_index("username", unique=True, sparse=True, name="username_unique")
+    db.users.create_index("email", unique=True, sparse=True, name="email_unique")
+    return db
+
+
+@pytest.fixture
+def importer(mock_db):
+    # mongomock cannot run pymongo 4.13 bulk_write, so the derived writes are mocked.
+    return UserImportService(mock_db, MagicMock(), MagicMock(), chunk_size=2)
+
+
+def _csv(*lines):
+    return io.BytesIO("\n".join(lines).encode())
+
+
+def test_detect_format():
+    assert detect_format("text/csv; charset=utf-8") == "csv"
+    assert detect_format("application/x-ndjson") == "jsonl"
+    assert detect_format("application/json", "CSV") == "csv"
+    with pytest.raises(BadRequestError):
+        detect_format("application/json")
+
+
+def test_csv_rows_blank_cells_become_none():
+    rows = list(iter_import_rows(_csv("username,email,password,role", "a,,pw,student"), "csv"))
+    assert rows == [(1, {"username": "a", "email": None, "password": "pw", "role": "student"})]
+
+
+def test_import_csv_across_chunks(importer, mock_db):
+    report = importer.import_stream(_csv(
+        "username,email,password,role",
+        "s1,s1@x.io,pw,student",
+        "t1,,pw,teacher",
+        "a1,,pw,admin",
+    ), "csv")
+    assert (report["total"], report["inserted"], report["failed"]) == (3, 3, 0)
+    assert mock_db.users.count_documents({}) == 3
+    assert mock_db.student.count_documents({}) == 1 and mock_db.teacher.count_documents({}) == 1
+    assert all(doc["password"] != "pw" for doc in mock_db.users.find())
+    assert "email" not in mock_db.users.find_one({"username": "t1"})
+    importer._stats.record_many.assert_called()
+
+
+def test_import_reports_invalid_and_duplicate_rows(importer, mock_db):
+    mock_db.users.insert_one({"username": "taken"})
+    body = "\n".join([
+        json.dumps({"username": "ok", "password": "pw", "role": "student"}),
+        json.dumps({"username": "nopass", "role": "student"}),
+        "{not json",
+        "",
+        json.dumps({"username": "taken", "password": "pw", "role": "student"}),
+        json.dumps({"username": "ok", "password": "pw", "role": "teacher"}),
+    ]).encode()
+    report = importer.import_stream(io.BytesIO(body), "jsonl")
+    assert report["inserted"] == 1 and report["failed"] == 4
+    errors = {error["row"]: error for error in report["errors"]}
+    assert errors[2]["field"] == "password"
+    assert errors[3]["error"].startswith("Invalid JSON")
+    assert errors[5]["error"] == "Username already exists"
+    assert errors[6]["field"] == "username"
+    assert mock_db.student.count_documents({}) == 1 and mock_db.teacher.count_documents({}) == 0
+
+
+def test_error_report_is_capped(mock_db):
+    importer = UserImportService(mock_db, MagicMock(), MagicMock(), max_errors=1)
+    report = importer.import_stream(_csv("username,password,role", "a,pw,ghost", "b,pw,ghost"), "csv")
+    assert report["failed"] == 2 and len(report["errors"]) == 1 and report["errors_truncated"]
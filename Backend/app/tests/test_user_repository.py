@@ -0,0 +1,122 @@
+import pytest
+from datetime import datetime, timedelta
+from mongomock import MongoClient
+from app.repositories.user_repository import UserRepositoryImpl
+from app.utils.cursor import encode_cursor, decode_cursor
+from app.utils.objectid import ObjectId  # type: ignore
+from app.error.exceptions import BadRequestError
+
+
+@pytest.fixture
+def mock_db():
+    client = MongoClient()
+    return client["test_db"]
+
+
+@pytest.fixture
+def user_repo(mock_db):
+    base = datetime(2025, 1, 1)
+    mock_db.users.insert_many([
+        {"username": f"user{i:02d}", "email": f"user{i:02d}@example.com", "role": "student", "created_at": base + timedelta(days=i)}
+        for i in range(25)
+    ])
+    repo = UserRepositoryImpl(mock_db)
+    for user in mock_db.users.find():
+        repo.search_index.index_user(user)
+    return repo
+
+
+def test_cursor_round_trip():
+    values = {"created_at": datetime(2025, 1, 1, 12, 30), "_id": ObjectId()}
+    decoded = decode_cursor(encode_cursor(values))
+    assert decoded["_id"] == values["_id"]
+    assert decoded["created_at"].replace(tzinfo=None) == values["created_at"]
+
+
+def test_decode_cursor_rejects_garbage():
+    with pytest.raises(BadRequestError):
+        decode_cursor("not-a-cursor")
+
+
+def test_search_user_walks_every_page_once(user_repo):
+    seen = []
+    cursor = None
+    while True:
+        page = user_repo.search_user("user", 10, cursor)
+        seen.extend(user.username for user in page["users"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == 25
+    assert seen == sorted(seen, reverse=True)
+
+
+def test_search_user_last_page_has_no_cursor(user_repo):
+    page = user_repo.search_user("user1", 10)
+    assert len(page["users"]) == 10
+    assert page["next_cursor"] is None
+
+
+@pytest.fixture
+def indexed_repo(user_repo, mock_db):
+    mock_db.users.insert_many([
+        {"username": "alice", "email": "alice@school.edu", "role": "teacher", "created_at": datetime(2025, 3, 1)},
+        {"username": "malice", "email": "m@school.edu", "role": "student", "created_at": datetime(2025, 3, 2)},
+        {"username": "Bob.Alison", "email": "bob@school.edu", "role": "student", "created_at": datetime(2025, 3, 3)},
+    ])
+    for user in mock_db.users.find({"created_at": {"$gte": datetime(2025, 3, 1)}}):
+        user_repo.search_index.index_user(user)
+    return user_repo
+
+
+def test_search_index_ranks_exact_then_prefix_then_substring(indexed_repo):
+    page = indexed_repo.search_user("ALICE", 10)
+    assert [user.username for user in page["users"]] == ["alice", "malice"]
+
+    page = indexed_repo.search_user("ali", 10)
+    usernames = [user.username for user in page["users"]]
+    assert usernames[0] == "alice"
+    assert set(usernames) == {"alice", "malice", "Bob.Alison"}
+
+
+def test_search_index_short_query_matches_word_prefix(indexed_repo):
+    page = indexed_repo.search_user("bo", 10)
+    assert [user.username for user in page["users"]] == ["Bob.Alison"]
+
+
+def test_search_query_is_not_a_regex(indexed_repo):
+    page = indexed_repo.search_user(".*", 10)
+    assert page["users"] == []
+
+
+def test_find_user_detail_reads_only_the_role_collection(mock_db):
+    user_id = mock_db.users.insert_one({"username": "t1", "role": "teacher", "created_at": datetime(2025, 1, 1)}).inserted_id
+    mock_db.teacher.insert_one({"_id": user_id, "phone_number": "012", "teacher_info": {"subjects": ["Math"]}})
+    repo = UserRepositoryImpl(mock_db)
+
+    detail = repo.find_user_detail(str(user_id))
+
+    assert detail["role"] == "teacher"
+    assert detail["data"]["teacher_info"]["subjects"] == ["Math"]
+
+
+def test_search_user_hydrates_role_documents(indexed_repo, mock_db):
+    alice = mock_db.users.find_one({"username": "alice"})
+    mock_db.teacher.insert_one({"_id": alice["_id"], "teacher_info": {"subjects": ["Art"]}})
+
+    page = indexed_repo.search_user("alice", 10)
+    by_name = {user.username: user for user in page["users"]}
+
+    assert by_name["alice"].model_extra["teacher"]["teacher_info"]["subjects"] == ["Art"]
+    assert "student" not in by_name["malice"].model_extra
+
+
+def test_search_index_is_built_once_when_empty(mock_db, monkeypatch):
+    index = UserRepositoryImpl(mock_db).search_index
+    monkeypatch.setattr(index, "rebuild", lambda batch_size=1000: 1)
+    assert index.rebuild_if_empty() is None  # no users yet
+    user = {"_id": mock_db.users.insert_one({"username": "alice"}).inserted_id, "username": "alice"}
+    assert index.rebuild_if_empty() == 1
+    index.index_user(user)
+    assert index.rebuild_if_empty() is None
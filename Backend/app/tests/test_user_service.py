@@ -0,0 +1,64 @@
+import pytest
+from unittest.mock import MagicMock
+from mongomock import MongoClient
+from pymongo.errors import DuplicateKeyError, OperationFailure
+from app.error.exceptions import BadRequestError, InternalServerError
+from app.repositories.user_repository import UserRepositoryImpl
+from app.repositories.user_stats_repository import UserStatsRepository
+from app.services.user_service import MongoUserService
+
+
+@pytest.fixture
+def mock_db():
+    db = MongoClient()["test_db"]
+    db.users.create_index("username", unique=True, sparse=True, name="username_unique")
+    db.users.create_index("email", unique=True, sparse=True, name="email_unique")
+    return db
+
+
+@pytest.fixture
+def service(mock_db):
+    user_repo = UserRepositoryImpl(mock_db, stats=UserStatsRepository(mock_db))
+    return MongoUserService(mock_db, user_repo, search_index=MagicMock())
+
+
+def test_create_student_writes_user_and_role_document(service, mock_db):
+    user = service.create_user({"username": "alice", "email": "a@x.io", "password": "pw", "role": "student"})
+    assert mock_db.users.count_documents({}) == 1
+    assert mock_db.student.find_one({"_id": mock_db.users.find_one()["_id"]}) is not None
+    assert user.username == "alice"
+
+
+def test_create_admin_has_no_role_document(service, mock_db):
+    service.create_user({"username": "root", "email": "r@x.io", "password": "pw", "role": "admin"})
+    assert mock_db.users.count_documents({}) == 1
+
+
+def test_duplicate_username_maps_to_bad_request(service, mock_db):
+    service.create_user({"username": "alice", "password": "pw", "role": "teacher"})
+    with pytest.raises(BadRequestError) as exc:
+        service.create_user({"username": "alice", "password": "pw", "role": "teacher"})
+    assert exc.value.message == "Username already exists"
+    assert mock_db.teacher.count_documents({}) == 1
+
+
+def test_duplicate_key_pattern_selects_email_message():
+    error = DuplicateKeyError("E11000", 11000, {"keyPattern": {"email": 1}, "keyValue": {"email": "a@x.io"}})
+    mapped = MongoUserService._duplicate_user_error(error, {"email": "a@x.io"})
+    assert mapped.message == "Email already exists"
+
+
+def test_role_insert_failure_removes_user(service, mock_db, monkeypatch):
+    monkeypatch.setattr(service._role_collections["student"], "insert_one", MagicMock(side_effect=RuntimeError("boom")))
+    with pytest.raises(InternalServerError):
+        service.create_user({"username": "bob", "password": "pw", "role": "student"})
+    assert mock_db.users.count_documents({}) == 0
+
+
+def test_standalone_server_falls_back_once(service, mock_db, monkeypatch):
+    start_session = MagicMock(side_effect=OperationFailure("Transaction numbers are only allowed on a replica set member or mongos", 20))
+    monkeypatch.setattr(mock_db.client, "start_session", start_session)
+    service.create_user({"username": "u1", "password": "pw", "role": "student"})
+    service.create_user({"username": "u2", "password": "pw", "role": "student"})
+    assert start_session.call_count == 1
+    assert mock_db.users.count_documents({}) == 2
@@ -0,0 +1,73 @@
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock
+from mongomock import MongoClient
+from app.repositories.user_repository import UserRepositoryImpl
+from app.repositories.user_stats_repository import UserStatsRepository, to_utc_day
+from app.services.user_service import MongoUserService
+
+
+@pytest.fixture
+def mock_db():
+    client = MongoClient()
+    return client["test_db"]
+
+
+@pytest.fixture
+def user_repo(mock_db):
+    stats = UserStatsRepository(mock_db)
+    for day, role in [(1, "student"), (1, "student"), (1, "teacher"), (2, "student"), (10, "admin")]:
+        stats.record_created(role, datetime(2025, 5, day, 13, 45))
+    return UserRepositoryImpl(mock_db, stats=stats)
+
+
+def test_to_utc_day_truncates():
+    assert to_utc_day(datetime(2025, 5, 1, 23, 59)) == datetime(2025, 5, 1)
+
+
+def test_count_users_by_role_reads_rollup(user_repo):
+    assert user_repo.count_users_by_role() == {"student": 3, "teacher": 1, "admin": 1}
+
+
+def test_growth_stats_from_rollup(user_repo):
+    stats = user_repo.find_user_growth_stats("2025-05-01", "2025-05-02")
+    assert stats == [
+        {"date": "2025-05-01", "count": 3, "percentage": 75.0},
+        {"date": "2025-05-02", "count": 1, "percentage": 25.0},
+    ]
+
+
+def test_growth_by_role_comparison_from_rollup(user_repo):
+    stats = user_repo.find_users_growth_stats_by_role_with_comparison("2025-05-01", "2025-05-01", "2025-05-02", "2025-05-10")
+    by_role = {entry["role"]: entry for entry in stats}
+    assert by_role["student"]["current"] == 2 and by_role["student"]["previous"] == 1
+    assert by_role["admin"]["current"] == 0 and by_role["admin"]["previous"] == 1
+
+
+def test_delete_user_decrements_rollup(mock_db, user_repo):
+    user_id = mock_db.users.insert_one({"username": "gone", "role": "teacher", "created_at": datetime(2025, 5, 1, 8)}).inserted_id
+    service = MongoUserService(mock_db, user_repo, search_index=MagicMock())
+
+    service.delete_user(str(user_id))
+
+    assert user_repo.count_users_by_role()["teacher"] == 0
+
+
+def test_counts_for_many_periods_in_one_call(user_repo):
+    periods = [("2025-05-01", "2025-05-01"), ("2025-05-02", "2025-05-09"), ("2025-05-01", "2025-05-31"), ("2025-06-01", "2025-06-30")]
+    result = {entry["role"]: entry["counts"] for entry in user_repo.find_user_counts_by_role_for_periods(periods)}
+    assert result == {
+        "student": [2, 1, 3, 0],
+        "teacher": [1, 0, 1, 0],
+        "admin": [0, 0, 1, 0],
+    }
+
+
+def test_rollup_is_built_once_when_empty(mock_db, monkeypatch):
+    stats = UserStatsRepository(mock_db)
+    monkeypatch.setattr(stats, "rebuild", lambda: 1)
+    assert stats.rebuild_if_empty() is None  # no users yet
+    mock_db.users.insert_one({"username": "t", "role": "teacher", "created_at": datetime(2025, 5, 1)})
+    assert stats.rebuild_if_empty() == 1
+    stats.record_created("teacher", datetime(2025, 5, 1))
+    assert stats.rebuild_if_empty() is None
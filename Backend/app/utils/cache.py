@@ -0,0 +1,135 @@
+import copy
+import inspect
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from flask import current_app, has_app_context  # type: ignore
+
+_MISSING = object()
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        frozen = tuple(_freeze(v) for v in value)
+        return tuple(sorted(frozen, key=repr)) if isinstance(value, (set, frozenset)) else frozen
+    return value
+
+
+class TTLCache:
+    """Thread-safe in-process cache with per-entry expiry and per-namespace counters.
+
+    Keys are ``(namespace, ...)`` tuples so a whole namespace can be invalidated.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple, Tuple[float, Any]] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, namespace: str, counter: str) -> None:
+        stats = self._stats.setdefault(namespace, {"hits": 0, "misses": 0, "invalidations": 0})
+        stats[counter] += 1
+
+    def get(self, key: Tuple) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._count(key[0], "hits")
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self._count(key[0], "misses")
+        return _MISSING
+
+    def set(self, key: Tuple, value: Any, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._evict(time.monotonic())
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def _evict(self, now: float) -> None:
+        expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        while len(self._entries) >= self.max_entries:
+            del self._entries[next(iter(self._entries))]
+
+    def invalidate(self, namespace: Optional[str] = None) -> None:
+        with self._lock:
+            if namespace is None:
+                for name in {key[0] for key in self._entries}:
+                    self._count(name, "invalidations")
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == namespace]:
+                del self._entries[key]
+            self._count(namespace, "invalidations")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            namespaces = {}
+            for namespace, counters in self._stats.items():
+                lookups = counters["hits"] + counters["misses"]
+                namespaces[namespace] = {
+                    **counters,
+                    "hit_ratio": round(counters["hits"] / lookups, 4) if lookups else 0.0,
+                }
+            return {"entries": len(self._entries), "max_entries": self.max_entries, "namespaces": namespaces}
+
+
+analytics_cache = TTLCache()
+
+
+def _ttl_from_config(config_key: str, default: float) -> float:
+    if has_app_context():
+        return float(current_app.config.get(config_key, default))
+    return default
+
+
+def cached(namespace: str, ttl_config_key: str, default_ttl: float = 60, cache: TTLCache = analytics_cache) -> Callable:
+    """Cache a method's result under ``(namespace, method, normalized arguments)``.
+
+    ``self`` is left out of the key: repositories are application singletons.
+    The TTL is read from ``ttl_config_key`` on every miss so it can be tuned in
+    Config. Cached values are deep-copied on the way out. Coroutine methods
+    (the async repositories) are cached the same way.
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        def cache_key(self, args, kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = tuple((name, _freeze(value)) for name, value in bound.arguments.items() if name != "self")
+            return (namespace, func.__qualname__, arguments)
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                key = cache_key(self, args, kwargs)
+                value = cache.get(key)
+                if value is _MISSING:
+                    value = await func(self, *args, **kwargs)
+                    cache.set(key, value, _ttl_from_config(ttl_config_key, default_ttl))
+                return copy.deepcopy(value)
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            key = cache_key(self, args, kwargs)
+            value = cache.get(key)
+            if value is _MISSING:
+                value = func(self, *args, **kwargs)
+                cache.set(key, value, _ttl_from_config(ttl_config_key, default_ttl))
+            return copy.deepcopy(value)
+
+        return wrapper
+    return decorator
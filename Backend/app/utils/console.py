@@ -1,3 +0,0 @@
-from rich.console import Console # type: ignore
-
-console = Console()
\ No newline at end of file
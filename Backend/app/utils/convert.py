@@ -1,30 +1,98 @@
-from typing import Any
-from bson import ObjectId
-from pydantic import HttpUrl
 from datetime import datetime
+from typing import Any, Dict, List, Type
+from bson import ObjectId
+from pydantic import AnyUrl
+from pydantic_core import Url
+
+
+_DICT = object()
+_LIST = object()
+_MISSING = object()
+_SKIP = None
+
+
+def _object_id_str(oid: ObjectId) -> str:
+    # Same text as str(oid), without ObjectId.__str__'s hexlify/decode round trip.
+    return oid.binary.hex()
 
 
+# Exact-type dispatch; subclasses (e.g. PyObjectId) are resolved once and cached.
+_HANDLERS: Dict[Type, Any] = {
+    str: _SKIP,
+    int: _SKIP,
+    float: _SKIP,
+    bool: _SKIP,
+    type(None): _SKIP,
+    dict: _DICT,
+    list: _LIST,
+    ObjectId: _object_id_str,
+    AnyUrl: str,
+    Url: str,
+    datetime: datetime.isoformat,
+}
 
-def convert_objectid_to_str(data: Any) -> Any:
-    if isinstance(data, dict):
-        return {k: convert_objectid_to_str(v) for k, v in data.items()}
-    elif isinstance(data, list):
-        return [convert_objectid_to_str(i) for i in data]
-    elif isinstance(data, ObjectId):
-        return str(data)
-    elif isinstance(data, HttpUrl):
-        return str(data)
-    elif isinstance(data, datetime):
-        return data.isoformat()
-    else:
+
+def _handler(cls: Type) -> Any:
+    try:
+        return _HANDLERS[cls]
+    except KeyError:
+        pass
+    handler = _SKIP
+    for base, candidate in list(_HANDLERS.items()):
+        if candidate is not _SKIP and issubclass(cls, base):
+            handler = candidate
+            break
+    _HANDLERS[cls] = handler
+    return handler
+
+
+def to_json_compatible(data: Any, in_place: bool = False) -> Any:
+    """Stringify ObjectId/PyObjectId and HttpUrl and ISO-format datetimes anywhere in ``data``.
+
+    Walks dicts and lists iteratively (no recursion limit). By default containers are
+    copied only on the path to a converted value; untouched subtrees, and ``data``
+    itself when nothing needed converting, are returned as-is. ``in_place=True``
+    rewrites the containers directly and never copies.
+    """
+    handler = _handler(type(data))
+    if handler is _SKIP:
         return data
-def convert_serializable(obj):
-    if isinstance(obj, dict):
-        return {k: convert_serializable(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_serializable(i) for i in obj]
-    elif isinstance(obj, (ObjectId, HttpUrl)):
-        return str(obj)
-    elif isinstance(obj, datetime):
-        return obj.isoformat()
-    return obj
\ No newline at end of file
+    if handler is not _DICT and handler is not _LIST:
+        return handler(data)
+
+    get = _HANDLERS.get
+    # A frame is [source, items, copy, parent frame, key in parent]; lists beat
+    # attribute access on the hot path.
+    root = [data, iter(data.items()) if handler is _DICT else enumerate(data), None, None, None]
+    stack: List[List[Any]] = [root]
+    while stack:
+        frame = stack[-1]
+        source, items, copy = frame[0], frame[1], frame[2]
+        for key, value in items:
+            handler = get(type(value), _MISSING)
+            if handler is _SKIP:
+                continue
+            if handler is _MISSING:
+                handler = _handler(type(value))
+                if handler is _SKIP:
+                    continue
+            if handler is _DICT:
+                stack.append([value, iter(value.items()), None, frame, key])
+                break
+            if handler is _LIST:
+                stack.append([value, enumerate(value), None, frame, key])
+                break
+            if in_place:
+                source[key] = handler(value)
+            else:
+                if copy is None:
+                    copy = frame[2] = source.copy()
+                copy[key] = handler(value)
+        else:
+            stack.pop()
+            parent = frame[3]
+            if copy is not None and parent is not None:
+                if parent[2] is None:
+                    parent[2] = parent[0].copy()
+                parent[2][frame[4]] = copy
+    return data if root[2] is None else root[2]
@@ -0,0 +1,32 @@
+import base64
+import binascii
+from typing import Any, Dict
+from bson import json_util  # type: ignore
+from app.error.exceptions import BadRequestError
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """Pack the sort key values of the last returned row into an opaque token."""
+    raw = json_util.dumps(values).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Dict[str, Any]:
+    """Inverse of ``encode_cursor``; raises BadRequestError for tampered tokens."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json_util.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError, binascii.Error) as e:
+        raise BadRequestError(
+            message="Invalid pagination cursor",
+            user_message="The pagination cursor is invalid. Please restart the search.",
+            cause=e,
+            details={"cursor": token},
+        )
+    if not isinstance(values, dict):
+        raise BadRequestError(
+            message="Invalid pagination cursor",
+            user_message="The pagination cursor is invalid. Please restart the search.",
+            details={"cursor": token},
+        )
+    return values
@@ -0,0 +1,44 @@
+from collections import defaultdict
+import threading
+from typing import Any, Callable, Dict, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+USER_CREATED = "user.created"
+USER_UPDATED = "user.updated"
+USER_DELETED = "user.deleted"
+USERS_IMPORTED = "users.imported"
+
+Handler = Callable[..., None]
+
+
+class EventBus:
+    """In-process publish/subscribe. Handlers run synchronously in the emitting
+    thread; a failing handler is logged and never breaks the write that emitted."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._handlers: Dict[str, List[Handler]] = defaultdict(list)
+
+    def subscribe(self, event: str, handler: Handler) -> None:
+        with self._lock:
+            if handler not in self._handlers[event]:
+                self._handlers[event].append(handler)
+
+    def unsubscribe(self, event: str, handler: Handler) -> None:
+        with self._lock:
+            if handler in self._handlers[event]:
+                self._handlers[event].remove(handler)
+
+    def emit(self, event: str, **payload: Any) -> None:
+        with self._lock:
+            handlers = list(self._handlers.get(event, ()))
+        for handler in handlers:
+            try:
+                handler(**payload)
+            except Exception:
+                logger.exception("Event handler for %s failed", event)
+
+
+events = EventBus()
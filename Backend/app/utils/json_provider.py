@@ -0,0 +1,95 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, Type
+from uuid import UUID
+from bson import ObjectId  # type: ignore
+from flask.json.provider import JSONProvider  # type: ignore
+from pydantic import AnyUrl, BaseModel  # type: ignore
+from pydantic_core import Url  # type: ignore
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # optional: falls back to the stdlib encoder
+    orjson = None
+
+
+def _model(obj: BaseModel) -> Any:
+    return obj.model_dump(mode="json", by_alias=True)
+
+
+# Exact-type dispatch first, isinstance scan only for subclasses not seen yet.
+_ENCODERS: Dict[Type, Callable[[Any], Any]] = {
+    ObjectId: str,
+    AnyUrl: str,
+    Url: str,
+    datetime: lambda value: value.isoformat(),
+    date: lambda value: value.isoformat(),
+    Decimal: str,
+    UUID: str,
+    set: list,
+    frozenset: list,
+    tuple: list,
+}
+
+
+def _encoder_for(cls: Type) -> Callable[[Any], Any]:
+    encoder = _ENCODERS.get(cls)
+    if encoder is not None:
+        return encoder
+    if issubclass(cls, Enum):
+        encoder = lambda value: value.value  # noqa: E731
+    elif issubclass(cls, BaseModel):
+        encoder = _model
+    else:
+        encoder = next((enc for base, enc in list(_ENCODERS.items()) if issubclass(cls, base)), None)
+        if encoder is None:
+            raise TypeError(f"Object of type {cls.__name__} is not JSON serializable")
+    _ENCODERS[cls] = encoder
+    return encoder
+
+
+def default(obj: Any) -> Any:
+    """Encoder hook for types neither orjson nor the stdlib handle natively
+    (ObjectId/PyObjectId, HttpUrl, Decimal, sets, pydantic models, ...)."""
+    return _encoder_for(type(obj))(obj)
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps_bytes(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=default, option=_ORJSON_OPTIONS)
+
+    def loads(data: Any) -> Any:
+        return orjson.loads(data)
+else:
+    _stdlib_encoder = json.JSONEncoder(default=default, ensure_ascii=False, separators=(",", ":"))
+
+    def dumps_bytes(obj: Any) -> bytes:
+        return _stdlib_encoder.encode(obj).encode("utf-8")
+
+    def loads(data: Any) -> Any:
+        return json.loads(data)
+
+
+class FastJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson when installed, stdlib json otherwise.
+
+    ObjectId, HttpUrl, datetimes (ISO 8601), enums and pydantic models serialize
+    natively, so payloads no longer need a conversion pass before ``jsonify``.
+    Keys keep insertion order; output is compact.
+    """
+
+    mimetype = "application/json"
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj) + b"\n", mimetype=self.mimetype)
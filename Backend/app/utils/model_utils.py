@@ -1,10 +1,12 @@
-from typing import Optional, List, Type, TypeVar, Union, Dict, Any, Set, AbstractSet
+from typing import Optional, List, Tuple, Type, TypeVar, Union, Dict, Any, Set, AbstractSet, get_args, get_origin
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum
-from app.utils.convert import convert_objectid_to_str
+from functools import lru_cache
+import random
+from app.utils.convert import to_json_compatible
 from app.utils.objectid import ObjectId  # type: ignore
-from pydantic import BaseModel, ValidationError  # type: ignore
+from pydantic import AnyUrl, BaseModel, TypeAdapter, ValidationError  # type: ignore
 import logging
 
 from app.error.exceptions import (
@@ -24,6 +26,8 @@ class ConversionStrategy(Enum):
     SKIP_INVALID = "skip_invalid"
     RAISE_ON_INVALID = "raise_on_invalid"
     LOG_AND_SKIP = "log_and_skip"
+    # Documents read back from our own collections: built without validation.
+    TRUSTED = "trusted"
 
 
 @dataclass(frozen=True)
@@ -32,8 +36,110 @@ class ModelUtilsConfig:
     protected_fields: AbstractSet[str] = DEFAULT_PROTECTED_FIELDS
     conversion_strategy: ConversionStrategy = ConversionStrategy.RAISE_ON_INVALID
     log_conversion_failures: bool = True
+    # TRUSTED only: fraction of reads that are also validated to catch schema drift.
+    drift_sample_rate: float = 0.0
 
 
+@lru_cache(maxsize=None)
+def _list_adapter(model_class: Type[T]) -> TypeAdapter:
+    """One compiled ``list[model_class]`` validator per model, built on first use."""
+    return TypeAdapter(List[model_class])
+
+
+def _nested_model(annotation: Any) -> Optional[Tuple[Type[BaseModel], bool]]:
+    """``(Model, is_list)`` for ``Model``, ``Model | None`` and ``List[Model] | None`` annotations."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    origin = get_origin(annotation)
+    if origin in (list, List):
+        args = get_args(annotation)
+        if args and isinstance(args[0], type) and issubclass(args[0], BaseModel):
+            return args[0], True
+        return None
+    for arg in get_args(annotation) if origin is not None else ():
+        found = _nested_model(arg)
+        if found:
+            return found
+    return None
+
+
+@lru_cache(maxsize=None)
+def _nested_fields(model_class: Type[BaseModel]) -> Tuple[Tuple[str, str, Type[BaseModel], bool], ...]:
+    plan = []
+    for name, field in model_class.model_fields.items():
+        found = _nested_model(field.annotation)
+        if found:
+            plan.append((name, field.alias or name, found[0], found[1]))
+    return tuple(plan)
+
+
+def _url_type(annotation: Any) -> Optional[Type[AnyUrl]]:
+    """The URL class of ``HttpUrl`` and ``HttpUrl | None`` style annotations."""
+    if isinstance(annotation, type) and issubclass(annotation, AnyUrl):
+        return annotation
+    for arg in get_args(annotation) if get_origin(annotation) is not list else ():
+        found = _url_type(arg)
+        if found:
+            return found
+    return None
+
+
+@lru_cache(maxsize=None)
+def _url_fields(model_class: Type[BaseModel]) -> Tuple[Tuple[str, str, Type[AnyUrl]], ...]:
+    plan = []
+    for name, field in model_class.model_fields.items():
+        found = _url_type(field.annotation)
+        if found:
+            plan.append((name, field.alias or name, found))
+    return tuple(plan)
+
+
+def construct_trusted(model_class: Type[T], data: Dict[str, Any]) -> T:
+    """``model_construct`` that also builds nested models (e.g. ``StudentInfoModel``,
+    ``ClassInfoModel``) instead of leaving them as dicts, and turns URLs stored as
+    strings back into their URL type so dumps don't warn. No validation runs;
+    only use it for documents this app wrote itself."""
+    values = data
+    for name, alias, sub_model, is_list in _nested_fields(model_class):
+        key = alias if alias in data else name
+        value = data.get(key)
+        if is_list and isinstance(value, list):
+            value = [construct_trusted(sub_model, item) if isinstance(item, dict) else item for item in value]
+        elif isinstance(value, dict):
+            value = construct_trusted(sub_model, value)
+        else:
+            continue
+        if values is data:
+            values = dict(data)
+        values[key] = value
+    for name, alias, url_class in _url_fields(model_class):
+        key = alias if alias in data else name
+        value = data.get(key)
+        if not isinstance(value, str):
+            continue
+        try:
+            value = url_class(value)
+        except ValueError:
+            continue  # left as stored; drift sampling reports it
+        if values is data:
+            values = dict(data)
+        values[key] = value
+    return model_class.model_construct(**values)
+
+
+def _sample_for_drift(data: Dict[str, Any], model_class: Type[BaseModel], rate: float) -> None:
+    if rate <= 0 or random.random() >= rate:
+        return
+    try:
+        model_class.model_validate(data)
+    except ValidationError as e:
+        logger.warning(
+            "Schema drift: stored %s document fails validation (%d errors)",
+            model_class.__name__,
+            e.error_count(),
+            extra={"errors": e.errors(include_input=False, include_url=False)},
+        )
+
 
 #* Abstract classes for model utils
 class ModelConverter(ABC):
@@ -75,12 +181,14 @@ class ModelConverterImp(ModelConverter):
         self.config = config
 
     def convert(self, data: Dict[str, Any], model_class: Type[T]) -> Optional[T]:
-        logger.debug("Attempting conversion", extra={"data": data, "model_class": model_class.__name__})
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Converting to %s", model_class.__name__, extra={"data": data})
         strategy = self.config.conversion_strategy
+        if strategy == ConversionStrategy.TRUSTED:
+            _sample_for_drift(data, model_class, self.config.drift_sample_rate)
+            return construct_trusted(model_class, data)
         try:
-            model = model_class(**data)
-            logger.debug("Conversion successful", extra={"model": model.dict()})
-            return model
+            return model_class(**data)
         except ValidationError as e:
             app_exc = AppValidationError(
                 message=f"Pydantic validation failed for {model_class.__name__}",
@@ -91,7 +199,7 @@ class ModelConverterImp(ModelConverter):
             if strategy == ConversionStrategy.RAISE_ON_INVALID:
                 raise app_exc
             elif strategy == ConversionStrategy.LOG_AND_SKIP:
-                logger.warning(str(app_exc), extra=app_exc.to_dict())
+                logger.warning("%s", app_exc, extra={"error": app_exc.to_dict()})
                 return None
         except Exception as e:
             app_exc = InternalServerError(
@@ -102,7 +210,7 @@ class ModelConverterImp(ModelConverter):
             if strategy == ConversionStrategy.RAISE_ON_INVALID:
                 raise app_exc
             elif strategy == ConversionStrategy.LOG_AND_SKIP:
-                logger.error(str(app_exc), extra=app_exc.to_dict())
+                logger.error("%s", app_exc, extra={"error": app_exc.to_dict()})
                 return None
         return None
 
@@ -143,8 +251,11 @@ class ObjectIdValidator:
         
     def convert_to_response_model(self, data: Dict[str, Any], model_class: Type[T]) -> Optional[T]:
         strategy = self.config.conversion_strategy
+        if strategy == ConversionStrategy.TRUSTED and isinstance(data, dict):
+            _sample_for_drift(data, model_class, self.config.drift_sample_rate)
+            return construct_trusted(model_class, data)
         try:
-            data_str = convert_objectid_to_str(data)
+            data_str = to_json_compatible(data)
             return model_class(**data_str)
         except ValidationError as e:
             app_exc = AppValidationError(
@@ -156,7 +267,7 @@ class ObjectIdValidator:
             if strategy == ConversionStrategy.RAISE_ON_INVALID:
                 raise app_exc
             elif strategy == ConversionStrategy.LOG_AND_SKIP:
-                logger.warning(str(app_exc), extra=app_exc.to_dict())
+                logger.warning("%s", app_exc, extra={"error": app_exc.to_dict()})
                 return None
         except Exception as e:
             app_exc = InternalServerError(
@@ -167,7 +278,7 @@ class ObjectIdValidator:
             if strategy == ConversionStrategy.RAISE_ON_INVALID:
                 raise app_exc
             elif strategy == ConversionStrategy.LOG_AND_SKIP:
-                logger.error(str(app_exc), extra=app_exc.to_dict())
+                logger.error("%s", app_exc, extra={"error": app_exc.to_dict()})
                 return None
         return None
 
@@ -187,19 +298,25 @@ class ModelUtils:
         self.config = config or ModelUtilsConfig()
         self._converter = ModelConverterImp(self.config)
         self._objectid_validator = ObjectIdValidator(self.config)
+
+    def reconfigure(self, **changes: Any) -> None:
+        """Swap in a copy of the config with ``changes`` applied (e.g. ``drift_sample_rate``)."""
+        self.config = replace(self.config, **changes)
+        self._converter.config = self.config
+        self._objectid_validator.config = self.config
     
     
     def to_model(self, data: Dict[str, Any], model_class: Type[T]) -> Optional[T]:
         if not self._is_valid_input_dict(data):
             strategy = self.config.conversion_strategy
-            if strategy == ConversionStrategy.RAISE_ON_INVALID:
+            if strategy in (ConversionStrategy.RAISE_ON_INVALID, ConversionStrategy.TRUSTED):
                 raise AppValidationError(
                     message=f"Invalid input data for {model_class.__name__}",
                     details={"received_value": data, "expected_type": "dict"}
                 )
             elif strategy == ConversionStrategy.LOG_AND_SKIP:
                 logger.warning(
-                    f"Invalid input for {model_class.__name__} | received: {type(data).__name__}, expected: dict"
+                    "Invalid input for %s | received: %s, expected: dict", model_class.__name__, type(data).__name__
                 )
                 return None
             elif strategy == ConversionStrategy.SKIP_INVALID:
@@ -216,7 +333,7 @@ class ModelUtils:
             msg = f"Invalid input data for {model_class.__name__}: Expected list, got {type(data_list).__name__}"
             if self.config.conversion_strategy == ConversionStrategy.SKIP_INVALID:
                 return [] 
-            if self.config.conversion_strategy == ConversionStrategy.RAISE_ON_INVALID:
+            if self.config.conversion_strategy in (ConversionStrategy.RAISE_ON_INVALID, ConversionStrategy.TRUSTED):
                 raise AppValidationError(message=msg, details={"received_value": data_list})
             if self.config.conversion_strategy == ConversionStrategy.LOG_AND_SKIP:
                 logger.warning(msg)
@@ -224,10 +341,42 @@ class ModelUtils:
 
         if not data_list:
             return []
+        if self.config.conversion_strategy == ConversionStrategy.TRUSTED:
+            return [self.to_model(data, model_class) for data in data_list]
 
+        adapter = _list_adapter(model_class)
+        try:
+            models = adapter.validate_python(data_list)
+        except ValidationError as e:
+            failed = sorted({err["loc"][0] for err in e.errors() if err["loc"]})
+            return self._to_model_list_isolated(data_list, model_class, failed)
+        except Exception:
+            return self._to_model_list_isolated(data_list, model_class, None)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Validated %d %s documents", len(models), model_class.__name__)
+        return models
+
+    def _to_model_list_isolated(
+        self,
+        data_list: List[Dict[str, Any]],
+        model_class: Type[T],
+        failed: Optional[List[int]],
+    ) -> List[T]:
+        """Fallback after a failed batch: the failing items go through ``to_model`` one by one
+        (raising, logging or skipping per strategy), the rest are batch-validated again.
+        ``failed=None`` means the culprits are unknown and every item is isolated."""
+        if failed is None:
+            models = (self.to_model(data, model_class) for data in data_list)
+            return [model for model in models if model is not None]
+        if self.config.conversion_strategy == ConversionStrategy.RAISE_ON_INVALID:
+            self.to_model(data_list[failed[0]], model_class)
+        failed_set = set(failed)
+        valid = iter(_list_adapter(model_class).validate_python(
+            [data for index, data in enumerate(data_list) if index not in failed_set]
+        ))
         result: List[T] = []
-        for data in data_list:
-            model = self.to_model(data, model_class)
+        for index in range(len(data_list)):
+            model = self.to_model(data_list[index], model_class) if index in failed_set else next(valid)
             if model is not None:
                 result.append(model)
         return result
@@ -242,7 +391,7 @@ class ModelUtils:
     def prepare_safe_update(self, update_data: Dict[str, Any]) -> Dict[str, Any]:
         if not isinstance(update_data, dict):
             msg = f"Expected dict, got {type(update_data).__name__}"
-            if self.config.conversion_strategy == ConversionStrategy.RAISE_ON_INVALID:
+            if self.config.conversion_strategy in (ConversionStrategy.RAISE_ON_INVALID, ConversionStrategy.TRUSTED):
                 raise AppTypeError(
                     message=msg,
                     details={"received_value": update_data, "expected_type": "dict"}
@@ -272,14 +421,19 @@ class ModelUtils:
 # Factory function for common usage patterns
 def create_model_utils(
     protected_fields: Optional[Set[str]] = None,
-    strategy: ConversionStrategy = ConversionStrategy.RAISE_ON_INVALID
+    strategy: ConversionStrategy = ConversionStrategy.RAISE_ON_INVALID,
+    drift_sample_rate: float = 0.0,
 ) -> ModelUtils:
     config = ModelUtilsConfig(
         protected_fields=protected_fields or ModelUtilsConfig.DEFAULT_PROTECTED_FIELDS,
-        conversion_strategy=strategy
+        conversion_strategy=strategy,
+        drift_sample_rate=drift_sample_rate,
     )
     return ModelUtils(config)
 
 
 # Default instance for backward compatibility
 default_model_utils = create_model_utils()
+
+# Read paths over our own collections; create_app turns on drift sampling in debug.
+trusted_model_utils = create_model_utils(strategy=ConversionStrategy.TRUSTED)
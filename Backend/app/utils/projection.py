@@ -0,0 +1,49 @@
+from functools import lru_cache
+from typing import AbstractSet, Dict, FrozenSet, Optional, Type
+from pydantic import BaseModel  # type: ignore
+from app.error.exceptions import ValidationError
+
+# Never selectable and always projected out.
+SECRET_FIELDS: FrozenSet[str] = frozenset({"password"})
+
+
+@lru_cache(maxsize=None)
+def selectable_fields(model: Type[BaseModel], exclude: FrozenSet[str] = SECRET_FIELDS) -> Dict[str, str]:
+    """Map every accepted spelling (field name and alias) to the model's field name."""
+    names: Dict[str, str] = {}
+    for name, info in model.model_fields.items():
+        if name in exclude:
+            continue
+        names[name] = name
+        if info.alias:
+            names[info.alias] = name
+    return names
+
+
+def parse_fields(raw: Optional[str], model: Type[BaseModel], exclude: FrozenSet[str] = SECRET_FIELDS) -> Optional[FrozenSet[str]]:
+    """Parse a ``fields=a,b,c`` query value into model field names; ``None`` means every field.
+    The id is always returned. Unknown or secret fields raise a ValidationError.
+    """
+    if raw is None or not raw.strip():
+        return None
+    allowed = selectable_fields(model, exclude)
+    requested = [part.strip() for part in raw.split(",") if part.strip()]
+    unknown = sorted({name for name in requested if name not in allowed})
+    if unknown:
+        raise ValidationError(
+            message=f"Unknown fields for {model.__name__}: {', '.join(unknown)}",
+            user_message="The fields parameter contains unknown fields.",
+            details={"unknown": unknown, "allowed": sorted(set(allowed.values()))},
+        )
+    selected = {allowed[name] for name in requested}
+    if "id" in model.model_fields:
+        selected.add("id")
+    return frozenset(selected)
+
+
+def to_projection(fields: Optional[AbstractSet[str]], model: Type[BaseModel], exclude: FrozenSet[str] = SECRET_FIELDS) -> Optional[Dict[str, int]]:
+    """Translate parsed field names into a Mongo projection using the stored (alias) names."""
+    if fields is None:
+        hidden = {name: 0 for name in exclude if name in model.model_fields}
+        return hidden or None
+    return {model.model_fields[name].alias or name: 1 for name in fields}
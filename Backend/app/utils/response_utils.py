@@ -1,8 +1,32 @@
-from flask import jsonify
+from flask import jsonify, current_app, request, stream_with_context
 from enum import Enum
-from typing import Optional, Union, Dict, Any
+from typing import Optional, Union, Dict, Any, Iterable, Iterator
 from flask.wrappers import Response as FlaskResponse
 
+JSON_MIMETYPE = "application/json"
+NDJSON_MIMETYPE = "application/x-ndjson"
+STREAM_CHUNK_BYTES = 64 * 1024
+_EMPTY = object()
+
+
+def wants_ndjson() -> bool:
+    """True when the client prefers NDJSON over JSON (``Accept: application/x-ndjson``)."""
+    accept = request.accept_mimetypes
+    return accept.quality(NDJSON_MIMETYPE) > accept.quality(JSON_MIMETYPE)
+
+
+def _buffered(parts: Iterable[str], chunk_bytes: int = STREAM_CHUNK_BYTES) -> Iterator[str]:
+    # One WSGI write per ~64 KiB instead of one per document.
+    buffer, size = [], 0
+    for part in parts:
+        buffer.append(part)
+        size += len(part)
+        if size >= chunk_bytes:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer)
+
 
 
 
@@ -35,6 +59,52 @@ class Response:
         resp.status_code = status_code
         return resp
 
+    @staticmethod
+    def stream_response(
+        items: Iterable[Any],
+        message: str = "",
+        status_code: int = 200,
+        empty_message: Optional[str] = None
+    ) -> FlaskResponse:
+        """
+        Stream a list payload without materializing it.
+        Default output is the same envelope as success_response with ``data`` written
+        as a chunked JSON array; clients sending ``Accept: application/x-ndjson`` get
+        one JSON document per line instead.
+        The first item is fetched before the response starts so query errors still
+        produce a normal error response.
+        :param items: Iterable of JSON-serializable items (e.g. a generator over a cursor)
+        :param message: Optional message string
+        :param status_code: HTTP status code (default 200)
+        :param empty_message: Message to use instead when there are no items
+        :return: Flask streaming Response
+        """
+        iterator = iter(items)
+        first = next(iterator, _EMPTY)
+        if first is _EMPTY and empty_message:
+            message = empty_message
+        dumps = current_app.json.dumps
+
+        def rest() -> Iterator[Any]:
+            if first is not _EMPTY:
+                yield first
+                yield from iterator
+
+        if wants_ndjson():
+            parts = (dumps(item) + "\n" for item in rest())
+            mimetype = NDJSON_MIMETYPE
+        else:
+            def envelope() -> Iterator[str]:
+                yield '{"success": true, "message": ' + dumps(message) + ', "data": ['
+                for index, item in enumerate(rest()):
+                    yield ("," if index else "") + dumps(item)
+                yield "]}"
+            parts = envelope()
+            mimetype = JSON_MIMETYPE
+        resp = FlaskResponse(stream_with_context(_buffered(parts)), status=status_code, mimetype=mimetype)
+        resp.headers["X-Accel-Buffering"] = "no"
+        return resp
+
     @staticmethod
     def error_response(
         message: str = "An error occurred",
@@ -0,0 +1,4 @@
+from app.asgi import create_asgi_app
+
+# uvicorn asgi:app --workers N   (or gunicorn asgi:app -k uvicorn.workers.UvicornWorker)
+app = create_asgi_app()
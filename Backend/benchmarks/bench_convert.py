@@ -0,0 +1,70 @@
+"""Micro-benchmark: the old recursive converter vs ``to_json_compatible``.
+
+Run from ``Backend/`` with the app's required env set (e.g. GOOGLE_CLIENT_ID,
+GOOGLE_CLIENT_SECRET):  python benchmarks/bench_convert.py
+"""
+import os
+import sys
+import timeit
+from datetime import datetime
+from bson import ObjectId
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.utils.convert import to_json_compatible  # noqa: E402
+
+
+def legacy_convert(data):
+    # The pre-rewrite implementation: rebuilds every container, recursively.
+    if isinstance(data, dict):
+        return {k: legacy_convert(v) for k, v in data.items()}
+    if isinstance(data, list):
+        return [legacy_convert(v) for v in data]
+    if isinstance(data, ObjectId):
+        return str(data)
+    if isinstance(data, datetime):
+        return data.isoformat()
+    return data
+
+
+def class_doc(i):
+    return {
+        "_id": ObjectId(),
+        "name": f"class {i}",
+        "owner_id": ObjectId(),
+        "students_enrolled": [ObjectId() for _ in range(30)],
+        "schedule": [{"day": d, "start": "08:00", "end": "09:30", "room": "A1"} for d in range(5)],
+        "created_at": datetime.utcnow(),
+    }
+
+
+def clean_doc(i):
+    return {"name": f"class {i}", "schedule": [{"day": d, "start": "08:00", "end": "09:30"} for d in range(5)]}
+
+
+def main(number=20):
+    cases = {
+        "mongo docs (1000)": lambda: [class_doc(i) for i in range(1000)],
+        "already clean (1000)": lambda: [clean_doc(i) for i in range(1000)],
+    }
+    for name, build in cases.items():
+        data = build()
+        print(name)
+        for label, fn in (
+            ("legacy recursive", lambda: legacy_convert(data)),
+            ("to_json_compatible", lambda: to_json_compatible(data)),
+        ):
+            best = min(timeit.repeat(fn, number=number, repeat=5)) / number
+            print(f"  {label:<22}{best * 1000:8.3f} ms")
+        # in-place consumes its input, so each run needs a fresh copy; best of 5 like timeit
+        best = float("inf")
+        for _ in range(5):
+            copies = [build() for _ in range(number)]
+            start = timeit.default_timer()
+            for copy in copies:
+                to_json_compatible(copy, in_place=True)
+            best = min(best, (timeit.default_timer() - start) / number)
+        print(f"  {'in_place=True':<22}{best * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
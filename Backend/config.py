@@ -4,14 +4,64 @@ from dotenv import load_dotenv # type: ignore
 from typing import Optional
 load_dotenv() 
 
+def _optional_int(name: str) -> Optional[int]:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else None
+
 class Config:
     DEBUG: bool = os.getenv("DEBUG", "True").lower() == "true"
     SECRET_KEY: str = os.getenv("SECRET_KEY", "default-secret")
     DATABASE_URI: str = os.getenv("DATABASE_URI", "mongodb://localhost:27017")
+    MONGO_DB_NAME: str = os.getenv("MONGO_DB_NAME", "TesTingDB")
+    # Pool options; unset values fall back to pymongo's defaults.
+    MONGO_MAX_POOL_SIZE: Optional[int] = _optional_int("MONGO_MAX_POOL_SIZE")
+    MONGO_MIN_POOL_SIZE: Optional[int] = _optional_int("MONGO_MIN_POOL_SIZE")
+    MONGO_MAX_IDLE_TIME_MS: Optional[int] = _optional_int("MONGO_MAX_IDLE_TIME_MS")
+    MONGO_MAX_CONNECTING: Optional[int] = _optional_int("MONGO_MAX_CONNECTING")
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = _optional_int("MONGO_WAIT_QUEUE_TIMEOUT_MS")
+    MONGO_CONNECT_TIMEOUT_MS: Optional[int] = _optional_int("MONGO_CONNECT_TIMEOUT_MS")
+    MONGO_SOCKET_TIMEOUT_MS: Optional[int] = _optional_int("MONGO_SOCKET_TIMEOUT_MS")
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: Optional[int] = _optional_int("MONGO_SERVER_SELECTION_TIMEOUT_MS")
+    MONGO_COMPRESSORS: Optional[str] = os.getenv("MONGO_COMPRESSORS")
+    # Admin analytics cache TTLs in seconds; 0 disables caching for that endpoint.
+    CACHE_TTL_COUNT_BY_ROLE: int = int(os.getenv("CACHE_TTL_COUNT_BY_ROLE", "60"))
+    CACHE_TTL_GROWTH_STATS: int = int(os.getenv("CACHE_TTL_GROWTH_STATS", "300"))
+    CACHE_TTL_GROWTH_BY_ROLE: int = int(os.getenv("CACHE_TTL_GROWTH_BY_ROLE", "300"))
+    # Bulk user import: rows per insert chunk, and row errors listed before the report is truncated.
+    USER_IMPORT_CHUNK_SIZE: int = int(os.getenv("USER_IMPORT_CHUNK_SIZE", "1000"))
+    USER_IMPORT_MAX_ERRORS: int = int(os.getenv("USER_IMPORT_MAX_ERRORS", "1000"))
+    # Password hashing: werkzeug method string (e.g. "scrypt:32768:8:1", "pbkdf2:sha256:600000").
+    # Changing it upgrades stored hashes on the next successful login.
+    PASSWORD_HASH_METHOD: str = os.getenv("PASSWORD_HASH_METHOD", "scrypt")
+    PASSWORD_HASH_SALT_LENGTH: int = int(os.getenv("PASSWORD_HASH_SALT_LENGTH", "16"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "8"))
+    PASSWORD_HASH_QUEUE_TIMEOUT: float = float(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT", "5"))
+    TOKEN_CACHE_MAX_ENTRIES: int = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+    # Seconds between polls of revoked_tokens per worker, and the overlap that absorbs clock skew.
+    TOKEN_REVOCATION_POLL_INTERVAL: float = float(os.getenv("TOKEN_REVOCATION_POLL_INTERVAL", "5"))
+    TOKEN_REVOCATION_POLL_OVERLAP: float = float(os.getenv("TOKEN_REVOCATION_POLL_OVERLAP", "5"))
+    # Cursor batch size for streamed list endpoints.
+    STREAM_BATCH_SIZE: int = int(os.getenv("STREAM_BATCH_SIZE", "500"))
+    # Debug only: fraction of trusted (unvalidated) reads that are validated to catch schema drift.
+    MODEL_DRIFT_SAMPLE_RATE: float = float(os.getenv("MODEL_DRIFT_SAMPLE_RATE", "0.01"))
+    # Upper bound on students x classes pairs per bulk enroll/unenroll request.
+    ENROLLMENT_BULK_MAX_ITEMS: int = int(os.getenv("ENROLLMENT_BULK_MAX_ITEMS", "5000"))
+    # Root level, per-logger overrides ("pymongo=WARNING,app.error=INFO") and output format (json|text).
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_LEVELS: str = os.getenv("LOG_LEVELS", "pymongo=WARNING,werkzeug=INFO")
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json")
+    # Handled-error logging: LOW/MEDIUM errors are sampled per error code ("CODE=rate,..."),
+    # and every code is capped per minute; details are truncated to the given length.
+    ERROR_LOG_SAMPLE_RATES: str = os.getenv("ERROR_LOG_SAMPLE_RATES", "NOTFOUNDERROR_ERROR=0.05,UNAUTHORIZEDERROR_ERROR=0.05")
+    ERROR_LOG_DEFAULT_SAMPLE_RATE: float = float(os.getenv("ERROR_LOG_DEFAULT_SAMPLE_RATE", "1"))
+    ERROR_LOG_MAX_PER_MINUTE: int = int(os.getenv("ERROR_LOG_MAX_PER_MINUTE", "60"))
+    ERROR_LOG_MAX_DETAIL_CHARS: int = int(os.getenv("ERROR_LOG_MAX_DETAIL_CHARS", "2048"))
     GOOGLE_CLIENT_ID: Optional[str] = os.getenv("GOOGLE_CLIENT_ID")
     GOOGLE_CLIENT_SECRET: Optional[str] = os.getenv("GOOGLE_CLIENT_SECRET")
     GOOGLE_DISCOVERY_URL = "https://accounts.google.com/.well-known/openid-configuration"
     TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
     DEBUG_TB_INTERCEPT_REDIRECTS = False    
+    MONGO_AUTO_INDEX: bool = os.getenv("MONGO_AUTO_INDEX", "True").lower() == "true"
     if GOOGLE_CLIENT_ID is None or GOOGLE_CLIENT_SECRET is None:
         raise ValueError("Google Client ID and Secret must be set in environment variables.")
\ No newline at end of file
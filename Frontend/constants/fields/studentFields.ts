@@ -28,12 +28,6 @@ export const studentFields: Field[] = [
     showSaveCancelControls: false,
   },
   { label: "Grade", key: "student_info.grade", type: "number" },
-  {
-    label: "Class IDs",
-    key: "student_info.class_ids",
-    isArray: true,
-    type: "string",
-  },
   { label: "Major", key: "student_info.major", type: "string" },
   {
     label: "Birth Date",
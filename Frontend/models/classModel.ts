@@ -55,12 +55,12 @@ export class ClassModel {
   _id?: string;
   class_info?: ClassInfoModel;
   created_by?: string;
-  students_enrolled: string[] = [];
+  // Maintained by the server from the enrollments collection; never sent back.
+  readonly enrolled_count: number = 0;
   max_students: number = 30;
 
   constructor(data: Partial<ClassModel> = {}) {
     Object.assign(this, {
-      students_enrolled: [],
       max_students: 30,
       ...data,
     });
@@ -81,7 +81,6 @@ export class ClassModel {
       _id: this._id,
       class_info: this.class_info?.toDict(),
       created_by: this.created_by,
-      students_enrolled: this.students_enrolled,
       max_students: this.max_students,
     };
   }
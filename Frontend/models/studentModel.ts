@@ -22,7 +22,6 @@ export class StudentModel implements Student {
     this.student_info = {
       student_id: data.student_info?.student_id ?? "",
       grade: data.student_info?.grade,
-      class_ids: data.student_info?.class_ids ?? [],
       major: data.student_info?.major,
       birth_date: data.student_info?.birth_date,
       batch: data.student_info?.batch,
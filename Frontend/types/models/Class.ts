@@ -18,7 +18,7 @@ export interface ClassModel {
   _id?: string;
   class_id: string;
   class_info: ClassInfo;
-  students_enrolled: string[];
+  enrolled_count: number;
   max_students?: number;
   created_at: string;
   update_history: string[];
@@ -2,7 +2,6 @@ import type { AttendanceStatus } from "~/types/models/Attendance";
 export interface StudentInfo {
   student_id: string;
   grade?: string;
-  class_ids: string[];
   major?: string;
   birth_date?: string;
   batch?: string;